@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GeoService distance calculations.
+
+Compares the per-point path (one awaited geopy geodesic per shop) against the
+vectorized batch API in both accuracy modes, and reports the maximum error of
+each batch mode relative to geopy.
+
+Usage:
+    python benchmarks/geo_distance.py --count 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.utils.geo import GeoService, DistanceMode
+
+
+def generate_points(count: int, center_lat: float, center_lon: float, spread_deg: float):
+    """
+    Generate random points around a center
+    """
+    rng = random.Random(42)
+    lats = [center_lat + rng.uniform(-spread_deg, spread_deg) for _ in range(count)]
+    lons = [center_lon + rng.uniform(-spread_deg, spread_deg) for _ in range(count)]
+    return lats, lons
+
+
+async def per_point(ref_lat: float, ref_lon: float, lats, lons) -> np.ndarray:
+    """
+    Current path: one awaited geodesic calculation per point
+    """
+    distances = []
+    for lat, lon in zip(lats, lons):
+        distances.append(await GeoService.calculate_distance(ref_lat, ref_lon, lat, lon))
+    return np.asarray(distances)
+
+
+def timed(func, *args, repeat: int = 3):
+    """
+    Return (best time in seconds, result) over several runs
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GeoService distance calculations")
+    parser.add_argument("--count", type=int, default=20000, help="Number of shops")
+    parser.add_argument("--lat", type=float, default=28.6139, help="Reference latitude")
+    parser.add_argument("--lon", type=float, default=77.2090, help="Reference longitude")
+    parser.add_argument("--spread", type=float, default=0.5, help="Spread of shops in degrees")
+    args = parser.parse_args()
+
+    lats, lons = generate_points(args.count, args.lat, args.lon, args.spread)
+
+    baseline_time, baseline = timed(
+        lambda: asyncio.run(per_point(args.lat, args.lon, lats, lons)), repeat=1
+    )
+    print(f"{'mode':<24}{'time (ms)':>12}{'speedup':>10}{'max error (m)':>16}")
+    print(f"{'per-point geodesic':<24}{baseline_time * 1000:>12.1f}{1.0:>10.1f}{0.0:>16.4f}")
+
+    for mode in (DistanceMode.GEODESIC, DistanceMode.SPHERICAL):
+        elapsed, distances = timed(
+            GeoService.batch_distances, args.lat, args.lon, lats, lons, mode
+        )
+        max_error_m = float(np.max(np.abs(distances - baseline))) * 1000
+        print(
+            f"{'batch ' + mode.value:<24}{elapsed * 1000:>12.1f}"
+            f"{baseline_time / elapsed:>10.1f}{max_error_m:>16.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,32 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import firebase_admin
 from firebase_admin import credentials, auth
 from fastapi import HTTPException, status
 from typing import Dict, Any, Optional
 from ..config.settings import get_settings
+from ..utils.cache import TTLCache
 
 settings = get_settings()
 
+# Firebase Admin SDK calls are blocking, so they run in this bounded pool
+# instead of on the event loop. The SDK keeps Google's public certificates
+# in an in-process HTTP cache that honours their Cache-Control max-age, and
+# reusing the one app keeps that cache warm across requests.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.FIREBASE_VERIFY_MAX_WORKERS,
+    thread_name_prefix="firebase"
+)
+
+# Claims of recently verified tokens, keyed by token SHA-256 digest
+verified_token_cache = TTLCache(
+    max_entries=settings.FIREBASE_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.FIREBASE_TOKEN_CACHE_TTL_SECONDS
+)
+
 # Initialize Firebase Admin SDK if credentials are provided
 firebase_app = None
 if settings.FIREBASE_CREDENTIALS:
@@ -18,6 +39,9 @@ if settings.FIREBASE_CREDENTIALS:
 async def verify_firebase_token(id_token: str) -> Dict[str, Any]:
     """
     Verify Firebase ID token and return user data
+    
+    Tokens verified within the last FIREBASE_TOKEN_CACHE_TTL_SECONDS, and not
+    expired since, are answered from cache without checking the signature.
     """
     if not firebase_app:
         raise HTTPException(
@@ -25,14 +49,23 @@ async def verify_firebase_token(id_token: str) -> Dict[str, Any]:
             detail="Firebase not initialized"
         )
     
+    key = hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+    decoded_token = verified_token_cache.get(key)
+    if decoded_token is not None:
+        return dict(decoded_token)
+    
     try:
-        decoded_token = auth.verify_id_token(id_token, firebase_app)
-        return decoded_token
+        decoded_token = await _run_blocking(auth.verify_id_token, id_token, firebase_app)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid Firebase token: {str(e)}"
         )
+    
+    # Never serve a token from cache past its expiry
+    ttl = min(settings.FIREBASE_TOKEN_CACHE_TTL_SECONDS, decoded_token.get("exp", 0) - time.time())
+    verified_token_cache.set(key, dict(decoded_token), ttl_seconds=ttl)
+    return decoded_token
 
 async def get_firebase_user(uid: str) -> Optional[Dict[str, Any]]:
     """
@@ -45,7 +78,7 @@ async def get_firebase_user(uid: str) -> Optional[Dict[str, Any]]:
         )
     
     try:
-        user = auth.get_user(uid, firebase_app)
+        user = await _run_blocking(auth.get_user, uid, firebase_app)
         return {
             "uid": user.uid,
             "email": user.email,
@@ -61,3 +94,10 @@ async def get_firebase_user(uid: str) -> Optional[Dict[str, Any]]:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error getting Firebase user: {str(e)}"
         )
+
+async def _run_blocking(func, *args):
+    """
+    Run a blocking Firebase Admin SDK call in the Firebase thread pool
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args))
@@ -1,18 +1,40 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from ..config.settings import get_settings
+from ..utils.cache import TTLCache
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+# Claims of recently verified access tokens, keyed by token SHA-256 digest
+verified_token_cache = TTLCache(
+    max_entries=settings.JWT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JWT_CACHE_TTL_SECONDS
+)
+
+def create_access_token(
+    data: Dict[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    role: Optional[str] = None,
+    shop_id: Optional[int] = None
+) -> str:
     """
     Create a JWT access token
+    
+    role and shop_id are signed into the token as claims, so services can
+    authorize requests by role from the token alone. shop_id is as of
+    issue; services check it against the current shop before acting on it.
     """
     to_encode = data.copy()
+    if role is not None:
+        to_encode["role"] = role
+    if shop_id is not None:
+        to_encode["shop_id"] = shop_id
     
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -35,20 +57,47 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     )
     
     try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        payload = decode_access_token(token)
     except jwt.PyJWTError:
         raise credentials_exception
     
-    # Here you would typically fetch the user from the database
-    # For now, we'll just return the user_id
-    return {"user_id": user_id}
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    
+    # Role and shop are signed claims, so no database lookup is needed
+    return {
+        "user_id": user_id,
+        "role": payload.get("role"),
+        "shop_id": payload.get("shop_id")
+    }
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT access token and return its claims
+    
+    Tokens verified within the last JWT_CACHE_TTL_SECONDS, and not expired
+    since, are answered from cache without checking the signature again.
+    Raises jwt.PyJWTError if the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = verified_token_cache.get(key)
+    if payload is not None:
+        return payload
+    
+    payload = jwt.decode(
+        token, 
+        settings.JWT_SECRET_KEY, 
+        algorithms=[settings.JWT_ALGORITHM]
+    )
+    
+    # Never serve a token from cache past its expiry
+    ttl = settings.JWT_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    verified_token_cache.set(key, payload, ttl_seconds=ttl)
+    
+    return payload
 
 async def get_current_active_user(current_user = Depends(get_current_user)):
     """
@@ -38,15 +38,86 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    JWT_CACHE_MAX_ENTRIES: int = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+    JWT_CACHE_TTL_SECONDS: float = float(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
     
     # Firebase settings
     FIREBASE_CREDENTIALS: str = os.getenv("FIREBASE_CREDENTIALS", "")
+    FIREBASE_VERIFY_MAX_WORKERS: int = int(os.getenv("FIREBASE_VERIFY_MAX_WORKERS", "4"))
+    FIREBASE_TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("FIREBASE_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    FIREBASE_TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("FIREBASE_TOKEN_CACHE_TTL_SECONDS", "30"))
     
     # AWS S3 settings
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "hyperlocal-marketplace")
+    S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")  # S3-compatible server such as MinIO; empty for AWS
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+    S3_MULTIPART_PART_SIZE: int = int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024)))
+    S3_MULTIPART_MAX_SIZE: int = int(os.getenv("S3_MULTIPART_MAX_SIZE", str(100 * 1024 * 1024)))
+    
+    # Nearby-shop cache settings
+    NEARBY_CACHE_CELL_PRECISION: int = int(os.getenv("NEARBY_CACHE_CELL_PRECISION", "6"))  # ~1.2 x 0.6 km cells
+    NEARBY_CACHE_MAX_ENTRIES: int = int(os.getenv("NEARBY_CACHE_MAX_ENTRIES", "4096"))
+    NEARBY_CACHE_TTL_SECONDS: float = float(os.getenv("NEARBY_CACHE_TTL_SECONDS", "30"))
+    NEARBY_CACHE_VERSION_PRECISION: int = int(os.getenv("NEARBY_CACHE_VERSION_PRECISION", "4"))  # ~39 x 20 km version cells
+    NEARBY_CACHE_MAX_VERSION_CELLS: int = int(os.getenv("NEARBY_CACHE_MAX_VERSION_CELLS", "64"))
+    
+    # Catalog search index settings
+    CATALOG_INDEX_REFRESH_SECONDS: float = float(os.getenv("CATALOG_INDEX_REFRESH_SECONDS", "300"))
+    AUTOCOMPLETE_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTOCOMPLETE_CACHE_MAX_ENTRIES", "10000"))
+    AUTOCOMPLETE_CACHE_TTL_SECONDS: float = float(os.getenv("AUTOCOMPLETE_CACHE_TTL_SECONDS", "300"))
+    
+    # Catalog item loader cache settings
+    CATALOG_LOADER_CACHE_MAX_ENTRIES: int = int(os.getenv("CATALOG_LOADER_CACHE_MAX_ENTRIES", "20000"))
+    CATALOG_LOADER_CACHE_TTL_SECONDS: float = float(os.getenv("CATALOG_LOADER_CACHE_TTL_SECONDS", "60"))
+    
+    # Location-filtered shop search settings
+    SEARCH_TEXT_WEIGHT: float = float(os.getenv("SEARCH_TEXT_WEIGHT", "0.5"))  # Share of text relevance in the blended score
+    SEARCH_PLANNER_SAMPLE_SIZE: int = int(os.getenv("SEARCH_PLANNER_SAMPLE_SIZE", "1000"))
+    SEARCH_PLANNER_CACHE_TTL_SECONDS: float = float(os.getenv("SEARCH_PLANNER_CACHE_TTL_SECONDS", "60"))
+    MYSQL_FT_MIN_TOKEN_SIZE: int = int(os.getenv("MYSQL_FT_MIN_TOKEN_SIZE", "3"))  # Must match innodb_ft_min_token_size
+    
+    # Seller shop lookup cache settings
+    SHOP_LOOKUP_CACHE_MAX_ENTRIES: int = int(os.getenv("SHOP_LOOKUP_CACHE_MAX_ENTRIES", "10000"))
+    SHOP_LOOKUP_CACHE_TTL_SECONDS: float = float(os.getenv("SHOP_LOOKUP_CACHE_TTL_SECONDS", "30"))
+    
+    # Bulk inventory upsert settings
+    INVENTORY_BULK_CHUNK_SIZE: int = int(os.getenv("INVENTORY_BULK_CHUNK_SIZE", "500"))
+    INVENTORY_BULK_MAX_ROWS: int = int(os.getenv("INVENTORY_BULK_MAX_ROWS", "5000"))
+    INVENTORY_IMPORT_MAX_ERRORS: int = int(os.getenv("INVENTORY_IMPORT_MAX_ERRORS", "100"))
+    
+    # Stock reservation settings
+    RESERVATION_TTL_SECONDS: int = int(os.getenv("RESERVATION_TTL_SECONDS", "900"))
+    RESERVATION_MAX_ITEMS: int = int(os.getenv("RESERVATION_MAX_ITEMS", "100"))
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "30"))
+    RESERVATION_SWEEP_BATCH_SIZE: int = int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "500"))
+    
+    # Admin audit log writer settings
+    AUDIT_LOG_SPILL_DIR: str = os.getenv("AUDIT_LOG_SPILL_DIR", "spool/admin_audit")
+    AUDIT_LOG_BATCH_SIZE: int = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "200"))
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_SECONDS", "1"))
+    AUDIT_LOG_MAX_PENDING: int = int(os.getenv("AUDIT_LOG_MAX_PENDING", "10000"))
+    AUDIT_LOG_SUBMIT_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_LOG_SUBMIT_TIMEOUT_SECONDS", "1"))
+    
+    # Admin log retention settings
+    ADMIN_LOG_RETENTION_DAYS: int = int(os.getenv("ADMIN_LOG_RETENTION_DAYS", "365"))
+    ADMIN_LOG_ARCHIVE_DIR: str = os.getenv("ADMIN_LOG_ARCHIVE_DIR", "archive/admin_logs")
+    ADMIN_LOG_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ADMIN_LOG_ARCHIVE_BATCH_SIZE", "5000"))
+    ADMIN_LOG_RETENTION_INTERVAL_SECONDS: float = float(os.getenv("ADMIN_LOG_RETENTION_INTERVAL_SECONDS", "21600"))
+    ADMIN_LOG_FUTURE_PARTITIONS: int = int(os.getenv("ADMIN_LOG_FUTURE_PARTITIONS", "3"))  # Monthly partitions kept ahead on MySQL
+    
+    # Admin log export settings
+    ADMIN_LOG_EXPORT_BATCH_SIZE: int = int(os.getenv("ADMIN_LOG_EXPORT_BATCH_SIZE", "1000"))
+    
+    # Entity count settings
+    ENTITY_COUNT_SLOTS: int = int(os.getenv("ENTITY_COUNT_SLOTS", "16"))  # Counter rows per table that creates and deletes spread over
+    ENTITY_COUNT_CACHE_TTL_SECONDS: float = float(os.getenv("ENTITY_COUNT_CACHE_TTL_SECONDS", "30"))
+    ENTITY_COUNT_RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("ENTITY_COUNT_RECONCILE_INTERVAL_SECONDS", "3600"))
+    
+    # Pagination settings
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: float = float(os.getenv("PAGINATION_COUNT_CACHE_TTL_SECONDS", "60"))
     
     # CORS settings
     CORS_ORIGINS: list = ["*"]
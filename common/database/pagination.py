@@ -0,0 +1,135 @@
+import enum
+from typing import Any, List, NamedTuple, Optional
+
+from sqlalchemy import func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import Select
+
+from common.config.settings import get_settings
+from common.utils.cache import TTLCache
+
+settings = get_settings()
+
+
+class TotalMode(str, enum.Enum):
+    """
+    How the total of a paginated listing is computed
+    """
+    EXACT = "exact"          # COUNT(*) over the filtered query
+    ESTIMATED = "estimated"  # Table statistics, or a recently cached count when filtered
+    NONE = "none"            # No total; callers rely on has_more
+
+
+class Page(NamedTuple):
+    """
+    A page of results with whether more follow and the total, if computed
+    """
+    items: List[Any]
+    has_more: bool
+    total: Optional[int]
+    total_exact: bool
+
+
+# Recently computed counts of filtered queries, keyed by SQL and parameters
+_count_cache = TTLCache(max_entries=1024, ttl_seconds=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS)
+
+# Recently read table row estimates, keyed by table name
+_estimate_cache = TTLCache(max_entries=64, ttl_seconds=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    skip: int = 0,
+    limit: int = 20,
+    total_mode: TotalMode = TotalMode.EXACT,
+    table_name: Optional[str] = None
+) -> Page:
+    """
+    Get a page of an ORM query, fetching limit + 1 rows to know whether more follow
+
+    The total is only counted when needed: on the last page it is known from
+    the rows fetched, so no COUNT query runs. Otherwise total_mode decides.
+    ESTIMATED reads table statistics for unfiltered queries on table_name and
+    reuses a recent exact count for filtered ones.
+    """
+    result = await db.execute(stmt.offset(skip).limit(limit + 1))
+    items = list(result.scalars().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if not has_more and (items or skip == 0):
+        return Page(items, False, skip + len(items), True)
+
+    if total_mode == TotalMode.NONE:
+        return Page(items, has_more, None, False)
+
+    if total_mode == TotalMode.ESTIMATED:
+        if table_name and stmt.whereclause is None:
+            estimate = await estimate_table_rows(db, table_name)
+            if estimate is not None:
+                # Statistics may lag; never report fewer rows than already seen
+                minimum = skip + len(items) + (1 if has_more else 0)
+                return Page(items, has_more, max(estimate, minimum), False)
+
+        return Page(items, has_more, await cached_count(db, stmt), False)
+
+    return Page(items, has_more, await count(db, stmt), True)
+
+
+async def count(db: AsyncSession, stmt: Select) -> int:
+    """
+    Count the rows of a query exactly
+    """
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    result = await db.execute(count_stmt)
+    return result.scalar()
+
+
+async def cached_count(db: AsyncSession, stmt: Select) -> int:
+    """
+    Count the rows of a query, reusing a count of the same query from the last minute
+    """
+    compiled = stmt.compile(db.get_bind())
+    key = (str(compiled), tuple(sorted(compiled.params.items())))
+
+    total = _count_cache.get(key)
+    if total is None:
+        total = await count(db, stmt)
+        _count_cache.set(key, total)
+
+    return total
+
+
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Get an approximate row count of a table without scanning it
+
+    MySQL reports InnoDB's sampled TABLE_ROWS statistic. SQLite has no
+    maintained row count, so the largest rowid is used, which overcounts by
+    the number of deleted rows. Returns None for other databases.
+    """
+    estimate = _estimate_cache.get(table_name)
+    if estimate is not None:
+        return estimate
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        result = await db.execute(
+            text("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name
+            """),
+            {"table_name": table_name}
+        )
+    elif dialect == "sqlite":
+        result = await db.execute(
+            select(func.max(literal_column("rowid"))).select_from(table(table_name))
+        )
+    else:
+        return None
+
+    estimate = result.scalar() or 0
+    _estimate_cache.set(table_name, estimate)
+    return estimate
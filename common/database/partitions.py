@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from typing import List, Union
+
+# Name of the catch-all partition holding rows past the last monthly partition
+MAX_PARTITION = "pmax"
+
+
+def month_start(moment: Union[date, datetime]) -> date:
+    """
+    Get the first day of the month containing a date
+    """
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Get the first day of the month a number of months after a month's first day
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    Get the name of the monthly partition holding a month, e.g. p202610
+    """
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date:
+    """
+    Get the month a monthly partition name stands for
+    """
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def monthly_partitions(first_month: date, last_month: date) -> List[str]:
+    """
+    Get MySQL RANGE partition definitions on TO_DAYS(created_at), one per
+    month from first_month to last_month
+    """
+    definitions = []
+    month = first_month
+    while month <= last_month:
+        definitions.append(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN "
+            f"(TO_DAYS('{add_months(month, 1).isoformat()}'))"
+        )
+        month = add_months(month, 1)
+
+    return definitions
@@ -67,6 +67,18 @@ class ValidationException(AppException):
         )
 
 
+class ConflictException(AppException):
+    """
+    Exception raised when a request conflicts with the current state of a resource
+    """
+    def __init__(self, detail: str = "Conflict"):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+            code="conflict"
+        )
+
+
 class DatabaseException(AppException):
     """
     Exception raised when a database operation fails
@@ -0,0 +1,48 @@
+import logging
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Session.info key of the callbacks to run when the session commits
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run a callback once the session's transaction commits
+
+    Use it for in-process state mirroring the database, such as indexes and
+    caches, so that state never shows changes that are rolled back. The
+    callback is dropped if the transaction rolls back instead; rolling back
+    a savepoint keeps it. It runs inside commit(), after the database has
+    committed, so it must not use the session; errors are logged, not raised.
+    """
+    session = db.sync_session
+    if _CALLBACKS_KEY not in session.info:
+        event.listen(session, "after_commit", _run_callbacks)
+        event.listen(session, "after_soft_rollback", _drop_callbacks)
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+def _run_callbacks(session) -> None:
+    """
+    Run the callbacks of a session whose transaction committed
+    """
+    callbacks = session.info.get(_CALLBACKS_KEY, [])
+    session.info[_CALLBACKS_KEY] = []
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.exception("Error running after-commit callback")
+
+
+def _drop_callbacks(session, previous_transaction) -> None:
+    """
+    Drop the callbacks of a session whose outermost transaction rolled back
+    """
+    if previous_transaction.parent is None:
+        session.info[_CALLBACKS_KEY] = []
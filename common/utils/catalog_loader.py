@@ -0,0 +1,95 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from ..config.settings import get_settings
+
+settings = get_settings()
+
+# Most IDs bound into one IN (...) list
+_BATCH_SIZE = 500
+
+# Cached for catalog item IDs that do not exist, so they are not looked up again
+_MISSING = object()
+
+_CATALOG_ITEMS_QUERY = text("""
+    SELECT
+        ci.id, ci.name, ci.description, ci.brand, ci.model, ci.image_url,
+        c.name AS category
+    FROM catalog_items ci
+    LEFT JOIN categories c ON c.id = ci.category_id
+    WHERE ci.id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+
+class CatalogItemLoader:
+    """
+    Batched, cached lookup of catalog item summaries by ID
+
+    Services that list inventory resolve the catalog items of a whole page
+    with one load_many call: IDs already cached are served from memory and
+    the rest are read with a single query, instead of one lookup per row.
+    Entries expire after the cache TTL, which bounds how long a catalog edit
+    made by another process can go unseen.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def load_many(
+        self,
+        db: AsyncSession,
+        item_ids: Iterable[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get catalog item summaries by ID; IDs that do not exist are left out
+        """
+        found: Dict[int, Dict[str, Any]] = {}
+        missing: List[int] = []
+
+        for item_id in dict.fromkeys(item_ids):
+            item = self._cache.get(item_id)
+            if item is None:
+                missing.append(item_id)
+            elif item is not _MISSING:
+                found[item_id] = item
+
+        for start in range(0, len(missing), _BATCH_SIZE):
+            batch = missing[start:start + _BATCH_SIZE]
+            result = await db.execute(_CATALOG_ITEMS_QUERY, {"ids": batch})
+            loaded = {row["id"]: dict(row) for row in result.mappings().all()}
+
+            for item_id in batch:
+                item = loaded.get(item_id)
+                self._cache.set(item_id, _MISSING if item is None else item)
+                if item is not None:
+                    found[item_id] = item
+
+        return found
+
+    async def load(self, db: AsyncSession, item_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a catalog item summary by ID
+        """
+        items = await self.load_many(db, [item_id])
+        return items.get(item_id)
+
+    def invalidate(self, item_id: int) -> None:
+        """
+        Drop a cached catalog item, e.g. after it was changed
+        """
+        self._cache.delete(item_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        """
+        return self._cache.stats()
+
+
+# Shared catalog item loader
+catalog_item_loader = CatalogItemLoader(
+    max_entries=settings.CATALOG_LOADER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CATALOG_LOADER_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,29 @@
+import base64
+import json
+from typing import Any, Dict
+
+from ..exceptions.http_exceptions import ValidationException
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Encode keyset pagination values as an opaque cursor string
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValidationException("Invalid pagination cursor")
+    
+    if not isinstance(values, dict):
+        raise ValidationException("Invalid pagination cursor")
+    
+    return values
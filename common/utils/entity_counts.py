@@ -0,0 +1,128 @@
+import random
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from ..config.settings import get_settings
+from ..exceptions.http_exceptions import ValidationException
+
+settings = get_settings()
+
+# Tables whose row counts are kept in entity_counts
+COUNTED_TABLES = ("users", "shops", "catalog_items")
+
+# Slot that reconciliation corrects; creates and deletes use the others
+_RECONCILE_SLOT = 0
+
+_MYSQL_ADD = text("""
+    INSERT INTO entity_counts (entity, slot, count)
+    VALUES (:entity, :slot, :delta)
+    ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+""")
+
+_ADD = text("""
+    INSERT INTO entity_counts (entity, slot, count)
+    VALUES (:entity, :slot, :delta)
+    ON CONFLICT (entity, slot) DO UPDATE SET count = count + excluded.count
+""")
+
+_COUNTS_QUERY = text("SELECT entity, SUM(count) AS count FROM entity_counts GROUP BY entity")
+
+# The exact and the kept count of each table, read by one statement so both
+# see the same snapshot. Table names come from COUNTED_TABLES only.
+_RECONCILE_QUERIES = {
+    table_name: text(f"""
+        SELECT
+            (SELECT COUNT(*) FROM {table_name}) AS exact_count,
+            (SELECT COALESCE(SUM(count), 0) FROM entity_counts WHERE entity = :entity) AS kept_count
+    """)
+    for table_name in COUNTED_TABLES
+}
+
+# Recently read counts of every counted table
+entity_count_cache = TTLCache(max_entries=1, ttl_seconds=settings.ENTITY_COUNT_CACHE_TTL_SECONDS)
+
+
+def _check_table(table_name: str) -> None:
+    """
+    Raise ValidationException unless counts are kept for a table
+    """
+    if table_name not in COUNTED_TABLES:
+        raise ValidationException(f"Row counts are not kept for {table_name}")
+
+
+async def _add(db: AsyncSession, table_name: str, slot: int, delta: int) -> None:
+    """
+    Add delta to a slot of a table's count, creating the slot if needed
+    """
+    statement = _ADD
+    if db.get_bind().dialect.name == "mysql":
+        statement = _MYSQL_ADD
+
+    await db.execute(statement, {"entity": table_name, "slot": slot, "delta": delta})
+
+
+async def adjust_count(db: AsyncSession, table_name: str, delta: int) -> None:
+    """
+    Add delta to a table's row count in the current transaction
+
+    Call it in the transaction that creates or deletes the rows, so the
+    count changes if and only if the rows do.
+    """
+    _check_table(table_name)
+    if delta:
+        await _add(db, table_name, random.randint(1, settings.ENTITY_COUNT_SLOTS), delta)
+
+
+async def get_counts(db: AsyncSession) -> Dict[str, int]:
+    """
+    Get the kept row count of every counted table, reusing recent reads
+
+    Reads the counters only, never the counted tables, so counts may trail
+    writes by up to ENTITY_COUNT_CACHE_TTL_SECONDS.
+    """
+    counts = entity_count_cache.get("all")
+    if counts is None:
+        result = await db.execute(_COUNTS_QUERY)
+        kept = {row["entity"]: int(row["count"]) for row in result.mappings().all()}
+        counts = {table_name: kept.get(table_name, 0) for table_name in COUNTED_TABLES}
+        entity_count_cache.set("all", counts)
+
+    return counts
+
+
+async def get_count(db: AsyncSession, table_name: str) -> int:
+    """
+    Get the kept row count of a table; see get_counts
+    """
+    _check_table(table_name)
+    return (await get_counts(db))[table_name]
+
+
+async def reconcile_counts(db: AsyncSession) -> Dict[str, int]:
+    """
+    Count every counted table exactly and correct its kept count
+
+    Each table is reconciled in its own transaction, which first locks the
+    reconcile slot so concurrent reconciliations run one after another, and
+    then reads the exact and kept counts from one snapshot. The difference
+    is added to the reconcile slot rather than set, so creates and deletes
+    committed meanwhile are kept.
+
+    Returns each table's drift, the exact count minus the kept count.
+    """
+    drift: Dict[str, int] = {}
+    for table_name in COUNTED_TABLES:
+        await _add(db, table_name, _RECONCILE_SLOT, 0)
+        result = await db.execute(_RECONCILE_QUERIES[table_name], {"entity": table_name})
+        row = result.mappings().one()
+
+        drift[table_name] = int(row["exact_count"]) - int(row["kept_count"])
+        if drift[table_name]:
+            await _add(db, table_name, _RECONCILE_SLOT, drift[table_name])
+        await db.commit()
+
+    entity_count_cache.clear()
+    return drift
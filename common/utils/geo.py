@@ -1,6 +1,29 @@
+import enum
 import math
-from typing import Optional, List, Tuple
-from geopy.distance import geodesic
+from typing import Optional, List, Tuple, Sequence
+
+import numpy as np
+from geopy.distance import geodesic, EARTH_RADIUS, ELLIPSOIDS
+
+
+class DistanceMode(str, enum.Enum):
+    """
+    Accuracy mode for batch distance calculations
+    """
+    SPHERICAL = "spherical"  # Haversine on the mean earth radius (~0.5% error)
+    GEODESIC = "geodesic"    # Vincenty on the WGS-84 ellipsoid (sub-millimetre)
+
+
+# WGS-84 ellipsoid parameters in kilometers
+_WGS84_A, _WGS84_B, _WGS84_F = ELLIPSOIDS["WGS-84"]
+
+# Vincenty iteration limits
+_VINCENTY_TOLERANCE = 1e-12
+_VINCENTY_MAX_ITERATIONS = 200
+
+# Bounding boxes are computed on a sphere; pad them to cover the ellipsoid too
+_BOX_PADDING = 1.01
+
 
 class GeoService:
     """
@@ -8,9 +31,9 @@ class GeoService:
     """
     @staticmethod
     async def calculate_distance(
-        lat1: float, 
-        lon1: float, 
-        lat2: float, 
+        lat1: float,
+        lon1: float,
+        lat2: float,
         lon2: float
     ) -> float:
         """
@@ -18,62 +41,271 @@ class GeoService:
         """
         point1 = (lat1, lon1)
         point2 = (lat2, lon2)
-        
+
         # Calculate distance using geodesic
         distance = geodesic(point1, point2).kilometers
         return distance
-    
+
+    @staticmethod
+    def bounding_boxes(
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> List[Tuple[float, float, float, float]]:
+        """
+        Get (min_lat, max_lat, min_lon, max_lon) boxes enclosing a circle
+
+        Returns two boxes when the circle crosses the antimeridian and a full
+        longitude band when it contains a pole. Boxes are padded slightly so
+        they also enclose the circle on the WGS-84 ellipsoid.
+        """
+        angular = radius_km * _BOX_PADDING / EARTH_RADIUS
+        delta_lat = math.degrees(angular)
+        min_lat = latitude - delta_lat
+        max_lat = latitude + delta_lat
+
+        if min_lat <= -90.0 or max_lat >= 90.0 or angular >= math.pi / 2:
+            return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+        delta_lon = math.degrees(
+            math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(latitude))))
+        )
+        min_lon = longitude - delta_lon
+        max_lon = longitude + delta_lon
+
+        if min_lon < -180.0:
+            return [
+                (min_lat, max_lat, min_lon + 360.0, 180.0),
+                (min_lat, max_lat, -180.0, max_lon)
+            ]
+        if max_lon > 180.0:
+            return [
+                (min_lat, max_lat, min_lon, 180.0),
+                (min_lat, max_lat, -180.0, max_lon - 360.0)
+            ]
+
+        return [(min_lat, max_lat, min_lon, max_lon)]
+
+    @staticmethod
+    def inscribed_box(
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Get a (min_lat, max_lat, min_lon, max_lon) box lying entirely inside a circle
+
+        Every point of the box is closer than radius_km to the center, so it can
+        be used to skip rows already known to be nearer than a given distance.
+        Returns None where no simple box fits (near the poles or antimeridian).
+        """
+        half_side = radius_km / math.sqrt(2) / _BOX_PADDING
+        delta_lat = math.degrees(half_side / EARTH_RADIUS)
+        min_lat = latitude - delta_lat
+        max_lat = latitude + delta_lat
+
+        if min_lat <= -89.0 or max_lat >= 89.0:
+            return None
+
+        # Size the longitude span at the box latitude nearest the equator,
+        # where a degree of longitude is longest, so the box stays inside
+        nearest_equator_lat = 0.0 if min_lat < 0.0 < max_lat else min(abs(min_lat), abs(max_lat))
+        delta_lon = delta_lat / math.cos(math.radians(nearest_equator_lat))
+        min_lon = longitude - delta_lon
+        max_lon = longitude + delta_lon
+
+        if min_lon < -180.0 or max_lon > 180.0:
+            return None
+
+        return (min_lat, max_lat, min_lon, max_lon)
+
+    @staticmethod
+    def batch_distances(
+        reference_lat: float,
+        reference_lon: float,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        mode: DistanceMode = DistanceMode.GEODESIC
+    ) -> np.ndarray:
+        """
+        Calculate distances in kilometers from a reference point to many points at once
+
+        SPHERICAL uses the haversine formula, GEODESIC uses Vincenty's inverse
+        formula on the WGS-84 ellipsoid. Both are evaluated over whole arrays,
+        so the cost per point is a handful of NumPy operations instead of a
+        geopy object per point.
+        """
+        lats = np.asarray(latitudes, dtype=np.float64)
+        lons = np.asarray(longitudes, dtype=np.float64)
+
+        if lats.size == 0:
+            return np.empty(0, dtype=np.float64)
+
+        if mode == DistanceMode.SPHERICAL:
+            return GeoService._haversine(reference_lat, reference_lon, lats, lons)
+
+        return GeoService._vincenty(reference_lat, reference_lon, lats, lons)
+
+    @staticmethod
+    def _haversine(
+        reference_lat: float,
+        reference_lon: float,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized great-circle distance on a sphere of the mean earth radius
+        """
+        phi1 = math.radians(reference_lat)
+        phi2 = np.radians(lats)
+        d_phi = phi2 - phi1
+        d_lambda = np.radians(lons - reference_lon)
+
+        h = np.sin(d_phi / 2.0) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2.0) ** 2
+        return 2.0 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+    @staticmethod
+    def _vincenty(
+        reference_lat: float,
+        reference_lon: float,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized Vincenty inverse solution on the WGS-84 ellipsoid
+
+        Nearly antipodal points, where the iteration does not converge, fall
+        back to geopy's geodesic for those points only.
+        """
+        a, b, f = _WGS84_A, _WGS84_B, _WGS84_F
+
+        L = np.radians(lons - reference_lon)
+        U1 = math.atan((1.0 - f) * math.tan(math.radians(reference_lat)))
+        U2 = np.arctan((1.0 - f) * np.tan(np.radians(lats)))
+        sin_u1, cos_u1 = math.sin(U1), math.cos(U1)
+        sin_u2, cos_u2 = np.sin(U2), np.cos(U2)
+
+        lam = L.copy()
+        converged = np.zeros(lam.shape, dtype=bool)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for _ in range(_VINCENTY_MAX_ITERATIONS):
+                sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+                sin_sigma = np.sqrt(
+                    (cos_u2 * sin_lam) ** 2
+                    + (cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam) ** 2
+                )
+                cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+                sigma = np.arctan2(sin_sigma, cos_sigma)
+
+                # Coincident points have sin_sigma == 0
+                sin_alpha = np.where(
+                    sin_sigma == 0.0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma
+                )
+                cos_sq_alpha = 1.0 - sin_alpha ** 2
+
+                # Points on the equator have cos_sq_alpha == 0
+                cos_2sigma_m = np.where(
+                    cos_sq_alpha == 0.0,
+                    0.0,
+                    cos_sigma - 2.0 * sin_u1 * sin_u2 / cos_sq_alpha
+                )
+                C = f / 16.0 * cos_sq_alpha * (4.0 + f * (4.0 - 3.0 * cos_sq_alpha))
+
+                lam_prev = lam
+                lam = L + (1.0 - C) * f * sin_alpha * (
+                    sigma + C * sin_sigma * (
+                        cos_2sigma_m + C * cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2)
+                    )
+                )
+
+                converged = np.abs(lam - lam_prev) < _VINCENTY_TOLERANCE
+                if converged.all():
+                    break
+
+            u_sq = cos_sq_alpha * (a ** 2 - b ** 2) / b ** 2
+            A = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+            B = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+            delta_sigma = B * sin_sigma * (
+                cos_2sigma_m + B / 4.0 * (
+                    cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2)
+                    - B / 6.0 * cos_2sigma_m * (-3.0 + 4.0 * sin_sigma ** 2)
+                    * (-3.0 + 4.0 * cos_2sigma_m ** 2)
+                )
+            )
+            distances = b * A * (sigma - delta_sigma)
+
+        # Fall back to geopy for points where Vincenty failed to converge
+        for index in np.flatnonzero(~converged | ~np.isfinite(distances)):
+            distances[index] = geodesic(
+                (reference_lat, reference_lon),
+                (float(lats[index]), float(lons[index]))
+            ).kilometers
+
+        return distances
+
     @staticmethod
     async def sort_by_distance(
         reference_lat: float,
         reference_lon: float,
-        locations: List[dict]
+        locations: List[dict],
+        mode: DistanceMode = DistanceMode.GEODESIC
     ) -> List[dict]:
         """
         Sort locations by distance from reference point
-        
+
         Each location dict must have 'latitude' and 'longitude' keys
         Returns locations with added 'distance' key
         """
-        for location in locations:
-            distance = await GeoService.calculate_distance(
-                reference_lat,
-                reference_lon,
-                location['latitude'],
-                location['longitude']
-            )
+        if not locations:
+            return []
+
+        distances = GeoService.batch_distances(
+            reference_lat,
+            reference_lon,
+            [location['latitude'] for location in locations],
+            [location['longitude'] for location in locations],
+            mode=mode
+        )
+
+        for location, distance in zip(locations, distances.tolist()):
             location['distance'] = round(distance, 2)
-        
+
         # Sort by distance
         sorted_locations = sorted(locations, key=lambda x: x['distance'])
         return sorted_locations
-    
+
     @staticmethod
     async def filter_by_radius(
         reference_lat: float,
         reference_lon: float,
         locations: List[dict],
-        radius_km: float
+        radius_km: float,
+        mode: DistanceMode = DistanceMode.GEODESIC
     ) -> List[dict]:
         """
         Filter locations within specified radius in kilometers
-        
+
         Each location dict must have 'latitude' and 'longitude' keys
         Returns filtered locations with added 'distance' key
         """
+        if not locations:
+            return []
+
+        distances = GeoService.batch_distances(
+            reference_lat,
+            reference_lon,
+            [location['latitude'] for location in locations],
+            [location['longitude'] for location in locations],
+            mode=mode
+        )
+
         result = []
-        for location in locations:
-            distance = await GeoService.calculate_distance(
-                reference_lat,
-                reference_lon,
-                location['latitude'],
-                location['longitude']
-            )
-            
-            if distance <= radius_km:
-                location['distance'] = round(distance, 2)
-                result.append(location)
-        
+        for index in np.flatnonzero(distances <= radius_km).tolist():
+            location = locations[index]
+            location['distance'] = round(float(distances[index]), 2)
+            result.append(location)
+
         # Sort by distance
         sorted_result = sorted(result, key=lambda x: x['distance'])
         return sorted_result
@@ -0,0 +1,186 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import geohash
+from .cache import TTLCache
+from .geo import GeoService, DistanceMode
+from ..config.settings import get_settings
+
+settings = get_settings()
+
+# Query radii are rounded up to one of these buckets (km)
+RADIUS_BUCKETS_KM = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+# Padding applied to the area a cached entry covers
+_COVERAGE_PADDING = 1.01
+
+_VERSIONS_QUERY = text(
+    "SELECT cell, version FROM shop_cell_versions WHERE cell IN :cells"
+).bindparams(bindparam("cells", expanding=True))
+
+_MYSQL_BUMP = text("""
+    INSERT INTO shop_cell_versions (cell, version) VALUES (:cell, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1
+""")
+
+_BUMP = text("""
+    INSERT INTO shop_cell_versions (cell, version) VALUES (:cell, 1)
+    ON CONFLICT (cell) DO UPDATE SET version = version + 1
+""")
+
+
+class GeoCell(NamedTuple):
+    """
+    Cache slot for queries from one geohash cell with one radius bucket
+    """
+    cell: str
+    radius_bucket_km: float
+    center_lat: float
+    center_lon: float
+    coverage_km: float  # Radius around the center holding every candidate
+    version_cells: Tuple[str, ...]  # Version cells covering that area
+
+
+class GeoCellCache:
+    """
+    Cache of candidate shops keyed by geohash cell and radius bucket
+
+    A query point is quantized to its geohash cell and its radius rounded up
+    to a bucket. The cached candidates are all shops within the bucket radius
+    plus the cell's half-diagonal of the cell center, which is a superset of
+    the shops near any point of the cell, so callers only apply their own
+    exact distance filter on top.
+
+    Entries are kept with the versions of the coarser version cells covering
+    their area (see bump_cell_versions). Callers read the current versions
+    before each get and pass them in; an entry whose versions differ is
+    stale and dropped. Shop writes by any process therefore show up once
+    they commit, and the TTL only bounds memory use.
+    """
+    def __init__(
+        self,
+        precision: int,
+        max_entries: int,
+        ttl_seconds: float,
+        version_precision: int,
+        max_version_cells: int
+    ):
+        self.precision = precision
+        self.version_precision = version_precision
+        self.max_version_cells = max_version_cells
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.stale = 0
+
+    def cell_for(self, latitude: float, longitude: float, radius_km: float) -> Optional[GeoCell]:
+        """
+        Get the cache slot for a query, or None if the radius is too large to
+        cache or its area spans more than max_version_cells version cells
+        """
+        bucket = next((bucket for bucket in RADIUS_BUCKETS_KM if radius_km <= bucket), None)
+        if bucket is None:
+            return None
+
+        cell = geohash.encode(latitude, longitude, self.precision)
+        min_lat, max_lat, min_lon, max_lon = geohash.bounds(cell)
+        center_lat = (min_lat + max_lat) / 2
+        center_lon = (min_lon + max_lon) / 2
+
+        # Half-diagonal: distance from the center to the farthest corner
+        half_diagonal = float(GeoService.batch_distances(
+            center_lat,
+            center_lon,
+            [min_lat, min_lat, max_lat, max_lat],
+            [min_lon, max_lon, min_lon, max_lon],
+            mode=DistanceMode.SPHERICAL
+        ).max()) * _COVERAGE_PADDING
+        coverage_km = bucket + half_diagonal
+
+        version_cells = geohash.cells_for_boxes(
+            GeoService.bounding_boxes(center_lat, center_lon, coverage_km),
+            self.version_precision,
+            self.max_version_cells
+        )
+        if version_cells is None:
+            return None
+
+        return GeoCell(cell, bucket, center_lat, center_lon, coverage_km, tuple(version_cells))
+
+    def get(self, slot: GeoCell, versions: Dict[str, int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached candidate shops for a slot, or None if missing or cached
+        under other versions of its version cells
+        """
+        key = (slot.cell, slot.radius_bucket_km)
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        if entry[0] != versions:
+            self._cache.delete(key)
+            self.stale += 1
+            return None
+
+        return entry[1]
+
+    def set(self, slot: GeoCell, versions: Dict[str, int], shops: List[Dict[str, Any]]) -> None:
+        """
+        Cache candidate shops for a slot, read after its cells' versions
+        """
+        self._cache.set((slot.cell, slot.radius_bucket_km), (versions, shops))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        """
+        height, width = geohash.cell_size(self.precision)
+        return {
+            **self._cache.stats(),
+            "cell_precision": self.precision,
+            "cell_size_deg": {"latitude": height, "longitude": width},
+            "radius_buckets_km": list(RADIUS_BUCKETS_KM),
+            "version_precision": self.version_precision,
+            "stale": self.stale
+        }
+
+
+async def read_cell_versions(db: AsyncSession, cells: Iterable[str]) -> Dict[str, int]:
+    """
+    Get the current versions of version cells; cells never bumped are at 0
+    """
+    cells = sorted(set(cells))
+    result = await db.execute(_VERSIONS_QUERY, {"cells": cells})
+    versions = dict.fromkeys(cells, 0)
+    versions.update({cell: int(version) for cell, version in result.all()})
+    return versions
+
+
+async def bump_cell_versions(db: AsyncSession, points: Iterable[Tuple[float, float]]) -> None:
+    """
+    Bump the version cells of (latitude, longitude) points a shop write touched
+
+    Call it in the transaction of the write, with the shop's old and new
+    location, for every shop create, change and delete, so cached nearby
+    results around them are refreshed once it commits.
+    """
+    statement = _BUMP
+    if db.get_bind().dialect.name == "mysql":
+        statement = _MYSQL_BUMP
+
+    cells = sorted({
+        geohash.encode(latitude, longitude, settings.NEARBY_CACHE_VERSION_PRECISION)
+        for latitude, longitude in points
+    })
+    for cell in cells:
+        await db.execute(statement, {"cell": cell})
+
+
+# Process-wide cache of nearby-shop candidates
+shop_cell_cache = GeoCellCache(
+    precision=settings.NEARBY_CACHE_CELL_PRECISION,
+    max_entries=settings.NEARBY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.NEARBY_CACHE_TTL_SECONDS,
+    version_precision=settings.NEARBY_CACHE_VERSION_PRECISION,
+    max_version_cells=settings.NEARBY_CACHE_MAX_VERSION_CELLS
+)
@@ -0,0 +1,155 @@
+import math
+from typing import List, Optional, Tuple
+
+# Geohash base32 alphabet (no a, i, l, o)
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision stored on rows; queries use shorter prefixes of it
+GEOHASH_PRECISION = 12
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate as a geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def bounds(cell: str) -> Tuple[float, float, float, float]:
+    """
+    Get the (min_lat, max_lat, min_lon, max_lon) box of a geohash cell
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in cell:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Get (height, width) of a geohash cell in degrees
+    """
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def cover(
+    boxes: List[Tuple[float, float, float, float]],
+    max_cells: int = 16
+) -> List[str]:
+    """
+    Get the geohash cells covering a list of (min_lat, max_lat, min_lon, max_lon) boxes
+
+    Uses the finest precision whose covering needs at most max_cells cells, so a
+    query touches only cells around the search area.
+    """
+    best: List[str] = []
+
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        cells = cells_for_boxes(boxes, precision, max_cells)
+        if cells is None:
+            break
+        best = cells
+
+    # Even a single-character covering is too large: the whole world
+    return best or list(_BASE32)
+
+
+def prefix_range(cell: str) -> Tuple[str, Optional[str]]:
+    """
+    Get the [lower, upper) string range of all geohashes starting with cell
+
+    The upper bound is the next cell of the same or a shorter length, which
+    sorts after the range under binary and case-insensitive collations
+    alike, as digits sort before letters in both. It is None for cells at
+    the end of the alphabet, whose range has no upper bound.
+    """
+    prefix = cell.rstrip(_BASE32[-1])
+    if not prefix:
+        return cell, None
+    return cell, prefix[:-1] + _BASE32[_BASE32.index(prefix[-1]) + 1]
+
+
+def cells_for_boxes(
+    boxes: List[Tuple[float, float, float, float]],
+    precision: int,
+    max_cells: int
+) -> Optional[List[str]]:
+    """
+    Enumerate cells of a precision intersecting the boxes, or None if more than max_cells
+    """
+    height, width = cell_size(precision)
+    cells = set()
+
+    for min_lat, max_lat, min_lon, max_lon in boxes:
+        row_start = math.floor((max(min_lat, -90.0) + 90.0) / height)
+        row_end = math.floor((min(max_lat, 90.0) + 90.0) / height)
+        col_start = math.floor((max(min_lon, -180.0) + 180.0) / width)
+        col_end = math.floor((min(max_lon, 180.0) + 180.0) / width)
+
+        # Clamp edges that land exactly on +90 / +180
+        row_end = min(row_end, int(round(180.0 / height)) - 1)
+        col_end = min(col_end, int(round(360.0 / width)) - 1)
+
+        if (row_end - row_start + 1) * (col_end - col_start + 1) > max_cells:
+            return None
+
+        for row in range(row_start, row_end + 1):
+            for col in range(col_start, col_end + 1):
+                cells.add(encode(
+                    -90.0 + (row + 0.5) * height,
+                    -180.0 + (col + 0.5) * width,
+                    precision
+                ))
+
+        if len(cells) > max_cells:
+            return None
+
+    return sorted(cells)
@@ -1,30 +1,73 @@
+import asyncio
+import math
+import threading
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException, status
-from typing import Optional
+from typing import Any, Dict, Iterable, List
 from ..config.settings import get_settings
 
 settings = get_settings()
 
+# Most keys S3 accepts in one DeleteObjects request
+_DELETE_BATCH_SIZE = 1000
+
+# Fewest bytes in any multipart upload part but the last, and most parts
+_MIN_PART_SIZE = 5 * 1024 * 1024
+_MAX_PARTS = 10000
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Get the process-wide S3 client, creating it on first use
+
+    boto3 clients are thread-safe, so one client and its connection pool are
+    shared by every request instead of opening new connections per call.
+    Setting S3_ENDPOINT_URL points it at an S3-compatible server such as
+    MinIO or moto.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+                    region_name=settings.AWS_REGION,
+                    endpoint_url=settings.S3_ENDPOINT_URL or None,
+                    config=Config(
+                        signature_version='s3v4',
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={'mode': 'standard'},
+                        s3={'addressing_style': 'path' if settings.S3_ENDPOINT_URL else 'auto'}
+                    )
+                )
+    return _client
+
+
 class S3Service:
     """
     Service for interacting with AWS S3
+    
+    Every boto3 call blocks on credentials or network, so each runs in a
+    worker thread and never on the event loop.
     """
-    def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        self.bucket_name = settings.AWS_BUCKET_NAME
+    def __init__(self, client=None):
+        self.s3_client = client or get_s3_client()
+        self.bucket_name = settings.S3_BUCKET_NAME
     
     async def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
         """
         Generate a presigned URL for uploading a file to S3
         """
         try:
-            response = self.s3_client.generate_presigned_url(
+            response = await asyncio.to_thread(
+                self.s3_client.generate_presigned_url,
                 'put_object',
                 Params={
                     'Bucket': self.bucket_name,
@@ -34,7 +77,7 @@ class S3Service:
                 ExpiresIn=expiration
             )
             return response
-        except ClientError as e:
+        except (BotoCoreError, ClientError) as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error generating presigned URL: {str(e)}"
@@ -44,6 +87,9 @@ class S3Service:
         """
         Get the URL for an object in S3
         """
+        if settings.S3_ENDPOINT_URL:
+            return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{object_name}"
+        
         return f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{object_name}"
     
     async def delete_object(self, object_name: str) -> bool:
@@ -51,13 +97,163 @@ class S3Service:
         Delete an object from S3
         """
         try:
-            self.s3_client.delete_object(
+            await asyncio.to_thread(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_name,
                 Key=object_name
             )
             return True
-        except ClientError as e:
+        except (BotoCoreError, ClientError) as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error deleting object: {str(e)}"
             )
+    
+    async def delete_objects(self, object_names: Iterable[str]) -> List[Dict[str, str]]:
+        """
+        Delete objects from S3 with one DeleteObjects request per 1000 keys
+        
+        Returns the keys S3 could not delete with their error messages;
+        missing keys count as deleted.
+        """
+        object_names = list(dict.fromkeys(object_names))
+        errors: List[Dict[str, str]] = []
+        
+        try:
+            for start in range(0, len(object_names), _DELETE_BATCH_SIZE):
+                batch = object_names[start:start + _DELETE_BATCH_SIZE]
+                response = await asyncio.to_thread(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': object_name} for object_name in batch],
+                        'Quiet': True
+                    }
+                )
+                errors.extend(
+                    {'key': error['Key'], 'error': error.get('Message', error.get('Code', ''))}
+                    for error in response.get('Errors', [])
+                )
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error deleting objects: {str(e)}"
+            )
+        
+        return errors
+    
+    async def create_multipart_upload(
+        self,
+        object_name: str,
+        size: int,
+        content_type: str = 'application/octet-stream',
+        expiration: int = 3600
+    ) -> Dict[str, Any]:
+        """
+        Start a multipart upload and presign a PUT URL for each of its parts
+        
+        Parts are S3_MULTIPART_PART_SIZE bytes, or larger if the file would
+        need more than 10000 parts; the last part holds the rest. The client
+        uploads each part to its URL, keeps the ETag response headers, and
+        finishes with complete_multipart_upload.
+        """
+        part_size = max(settings.S3_MULTIPART_PART_SIZE, _MIN_PART_SIZE, math.ceil(size / _MAX_PARTS))
+        part_count = max(1, math.ceil(size / part_size))
+        
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.create_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=object_name,
+                ContentType=content_type
+            )
+            upload_id = response['UploadId']
+        
+            # Presigning is local signing, so all parts share one thread hop
+            parts = await asyncio.to_thread(
+                self._presign_parts, object_name, upload_id, part_count, expiration
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error starting multipart upload: {str(e)}"
+            )
+        
+        return {
+            'upload_id': upload_id,
+            'object_name': object_name,
+            'part_size': part_size,
+            'parts': parts
+        }
+    
+    def _presign_parts(
+        self,
+        object_name: str,
+        upload_id: str,
+        part_count: int,
+        expiration: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Presign an upload_part URL for each part of a multipart upload
+        """
+        return [
+            {
+                'part_number': part_number,
+                'url': self.s3_client.generate_presigned_url(
+                    'upload_part',
+                    Params={
+                        'Bucket': self.bucket_name,
+                        'Key': object_name,
+                        'UploadId': upload_id,
+                        'PartNumber': part_number
+                    },
+                    ExpiresIn=expiration
+                )
+            }
+            for part_number in range(1, part_count + 1)
+        ]
+    
+    async def complete_multipart_upload(
+        self,
+        object_name: str,
+        upload_id: str,
+        parts: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Assemble the uploaded parts, given as part_number and etag, into the object
+        """
+        try:
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={
+                    'Parts': [
+                        {'PartNumber': part['part_number'], 'ETag': part['etag']}
+                        for part in sorted(parts, key=lambda part: part['part_number'])
+                    ]
+                }
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error completing multipart upload: {str(e)}"
+            )
+    
+    async def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        """
+        Abort a multipart upload and free the parts uploaded so far
+        """
+        try:
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error aborting multipart upload: {str(e)}"
+            )
@@ -0,0 +1,236 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Most shop or catalog item IDs bound into one IN (...) list
+_BATCH_SIZE = 500
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_SHOPS_QUERY = text(
+    "SELECT id, name, description FROM shops WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+_SHOP_PRODUCTS_QUERY = text("""
+    SELECT DISTINCT si.shop_id, ci.name, ci.brand, c.name AS category
+    FROM shop_inventory si
+    JOIN catalog_items ci ON ci.id = si.catalog_item_id
+    LEFT JOIN categories c ON c.id = ci.category_id
+    WHERE si.shop_id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+_CATALOG_ITEMS_QUERY = text("""
+    SELECT ci.name, ci.brand, c.name AS category
+    FROM catalog_items ci
+    LEFT JOIN categories c ON c.id = ci.category_id
+    WHERE ci.id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+_DOCUMENT_QUERY = "SELECT product_text FROM shop_search_documents WHERE shop_id = :shop_id"
+
+_DELETE_DOCUMENTS = text(
+    "DELETE FROM shop_search_documents WHERE shop_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+_SET_SHOP_TEXT = text("""
+    UPDATE shop_search_documents
+    SET shop_text = :shop_text, updated_at = CURRENT_TIMESTAMP
+    WHERE shop_id = :shop_id
+""")
+
+_SET_PRODUCT_TEXT = text("""
+    UPDATE shop_search_documents
+    SET product_text = :product_text, updated_at = CURRENT_TIMESTAMP
+    WHERE shop_id = :shop_id
+""")
+
+_SHOPS_WITH_CATALOG_ITEMS_QUERY = text(
+    "SELECT DISTINCT shop_id FROM shop_inventory WHERE catalog_item_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+_SHOPS_WITH_CATEGORY_QUERY = text("""
+    SELECT DISTINCT si.shop_id
+    FROM shop_inventory si
+    JOIN catalog_items ci ON ci.id = si.catalog_item_id
+    WHERE ci.category_id = :category_id
+""")
+
+_MYSQL_UPSERT = text("""
+    INSERT INTO shop_search_documents (shop_id, shop_text, product_text, updated_at)
+    VALUES (:shop_id, :shop_text, :product_text, CURRENT_TIMESTAMP)
+    ON DUPLICATE KEY UPDATE
+        shop_text = VALUES(shop_text),
+        product_text = VALUES(product_text),
+        updated_at = VALUES(updated_at)
+""")
+
+_UPSERT = text("""
+    INSERT INTO shop_search_documents (shop_id, shop_text, product_text, updated_at)
+    VALUES (:shop_id, :shop_text, :product_text, CURRENT_TIMESTAMP)
+    ON CONFLICT (shop_id) DO UPDATE SET
+        shop_text = excluded.shop_text,
+        product_text = excluded.product_text,
+        updated_at = excluded.updated_at
+""")
+
+
+def terms(*phrases: Optional[str]) -> str:
+    """
+    Join the distinct lowercase words of phrases, in first-seen order
+
+    Search matches words, so each word is stored once however many products
+    share it; this keeps documents of large shops small.
+    """
+    words: Dict[str, None] = {}
+    for phrase in phrases:
+        if phrase:
+            words.update(dict.fromkeys(_TOKEN_PATTERN.findall(phrase.lower())))
+
+    return " ".join(words)
+
+
+def build_documents(
+    shops: Iterable[Any],
+    products: Iterable[Any]
+) -> List[Dict[str, Any]]:
+    """
+    Build search documents from (id, name, description) shop rows and
+    (shop_id, name, brand, category) product rows
+    """
+    phrases: Dict[int, List[Optional[str]]] = {}
+    for shop_id, name, brand, category in products:
+        phrases.setdefault(shop_id, []).extend((name, brand, category))
+
+    return [
+        {
+            "shop_id": shop_id,
+            "shop_text": terms(name, description),
+            "product_text": terms(*phrases.get(shop_id, ()))
+        }
+        for shop_id, name, description in shops
+    ]
+
+
+async def refresh_shop_documents(db: AsyncSession, shop_ids: Iterable[int]) -> int:
+    """
+    Rebuild the search documents of shops from their shop and inventory rows
+
+    Documents of shops that no longer exist are deleted. Returns the number
+    of documents written.
+    """
+    shop_ids = sorted(set(shop_ids))
+    written = 0
+
+    for start in range(0, len(shop_ids), _BATCH_SIZE):
+        batch = shop_ids[start:start + _BATCH_SIZE]
+        shops = (await db.execute(_SHOPS_QUERY, {"ids": batch})).all()
+        products = (await db.execute(_SHOP_PRODUCTS_QUERY, {"ids": batch})).all()
+        documents = build_documents(shops, products)
+
+        removed = set(batch) - {document["shop_id"] for document in documents}
+        if removed:
+            await db.execute(_DELETE_DOCUMENTS, {"ids": sorted(removed)})
+        if documents:
+            await db.execute(_upsert_statement(db), documents)
+        written += len(documents)
+
+    return written
+
+
+async def add_shop_products(
+    db: AsyncSession,
+    shop_id: int,
+    catalog_item_ids: Iterable[int]
+) -> None:
+    """
+    Add the words of newly stocked catalog items to a shop's search document
+
+    Only the new items are read, so stocking an item costs the same however
+    large the shop is. Removing items needs refresh_shop_documents, since
+    other products may share their words.
+    """
+    catalog_item_ids = sorted(set(catalog_item_ids))
+    if not catalog_item_ids:
+        return
+
+    # Lock the document on MySQL so concurrent additions do not overwrite each other
+    query = _DOCUMENT_QUERY
+    if db.get_bind().dialect.name == "mysql":
+        query += " FOR UPDATE"
+    product_text = (await db.execute(text(query), {"shop_id": shop_id})).scalar()
+    if product_text is None:
+        await refresh_shop_documents(db, [shop_id])
+        return
+
+    phrases: List[Optional[str]] = [product_text]
+    for start in range(0, len(catalog_item_ids), _BATCH_SIZE):
+        batch = catalog_item_ids[start:start + _BATCH_SIZE]
+        for name, brand, category in (await db.execute(_CATALOG_ITEMS_QUERY, {"ids": batch})).all():
+            phrases.extend((name, brand, category))
+
+    merged = terms(*phrases)
+    if merged != product_text:
+        await db.execute(_SET_PRODUCT_TEXT, {"shop_id": shop_id, "product_text": merged})
+
+
+async def set_shop_text(
+    db: AsyncSession,
+    shop_id: int,
+    name: str,
+    description: Optional[str]
+) -> None:
+    """
+    Update the shop name and description words of a shop's search document
+    """
+    result = await db.execute(
+        _SET_SHOP_TEXT,
+        {"shop_id": shop_id, "shop_text": terms(name, description)}
+    )
+    if result.rowcount == 0:
+        await refresh_shop_documents(db, [shop_id])
+
+
+async def remove_shop_documents(db: AsyncSession, shop_ids: Iterable[int]) -> None:
+    """
+    Delete the search documents of shops
+    """
+    shop_ids = sorted(set(shop_ids))
+    for start in range(0, len(shop_ids), _BATCH_SIZE):
+        await db.execute(_DELETE_DOCUMENTS, {"ids": shop_ids[start:start + _BATCH_SIZE]})
+
+
+async def refresh_documents_for_catalog_items(
+    db: AsyncSession,
+    catalog_item_ids: Iterable[int]
+) -> int:
+    """
+    Rebuild the search documents of every shop stocking any of the catalog items
+    """
+    catalog_item_ids = sorted(set(catalog_item_ids))
+    shop_ids: List[int] = []
+    for start in range(0, len(catalog_item_ids), _BATCH_SIZE):
+        batch = catalog_item_ids[start:start + _BATCH_SIZE]
+        result = await db.execute(_SHOPS_WITH_CATALOG_ITEMS_QUERY, {"ids": batch})
+        shop_ids.extend(result.scalars().all())
+
+    return await refresh_shop_documents(db, shop_ids)
+
+
+async def refresh_documents_for_category(db: AsyncSession, category_id: int) -> int:
+    """
+    Rebuild the search documents of every shop stocking an item of the category
+    """
+    result = await db.execute(_SHOPS_WITH_CATEGORY_QUERY, {"category_id": category_id})
+    return await refresh_shop_documents(db, result.scalars().all())
+
+
+def _upsert_statement(db: AsyncSession):
+    """
+    Get the dialect's statement inserting or replacing one search document
+    """
+    if db.get_bind().dialect.name == "mysql":
+        return _MYSQL_UPSERT
+
+    return _UPSERT
@@ -0,0 +1,36 @@
+"""Add geohash spatial index to shops
+
+Revision ID: 002_shop_geohash
+Revises: 001_initial
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from common.utils import geohash
+
+# revision identifiers, used by Alembic.
+revision = '002_shop_geohash'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('shops', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index(op.f('ix_shops_geohash'), 'shops', ['geohash'], unique=False)
+
+    # Backfill geohash for existing shops
+    connection = op.get_bind()
+    shops = connection.execute(sa.text("SELECT id, latitude, longitude FROM shops")).fetchall()
+    for shop_id, latitude, longitude in shops:
+        connection.execute(
+            sa.text("UPDATE shops SET geohash = :geohash WHERE id = :id"),
+            {"geohash": geohash.encode(latitude, longitude), "id": shop_id}
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_shops_geohash'), table_name='shops')
+    op.drop_column('shops', 'geohash')
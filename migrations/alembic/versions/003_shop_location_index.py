@@ -0,0 +1,24 @@
+"""Add composite latitude/longitude index to shops
+
+Revision ID: 003_shop_location_index
+Revises: 002_shop_geohash
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_shop_location_index'
+down_revision = '002_shop_geohash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the bounding-box predicate of radius queries
+    op.create_index('ix_shops_latitude_longitude', 'shops', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_shops_latitude_longitude', table_name='shops')
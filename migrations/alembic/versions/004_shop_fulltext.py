@@ -0,0 +1,67 @@
+"""Add full-text index for shop search
+
+Revision ID: 004_shop_fulltext
+Revises: 003_shop_location_index
+Create Date: 2026-10-18 11:00:00.000000
+
+MySQL gets a FULLTEXT index on shops(name, description). SQLite gets an
+external-content FTS5 table, shops_fts, kept in sync with shops by triggers.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_shop_fulltext'
+down_revision = '003_shop_location_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        op.execute("CREATE FULLTEXT INDEX ix_shops_fulltext ON shops (name, description)")
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE shops_fts USING fts5("
+            "name, description, content='shops', content_rowid='id')"
+        )
+        op.execute("""
+            CREATE TRIGGER shops_fts_insert AFTER INSERT ON shops BEGIN
+                INSERT INTO shops_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shops_fts_delete AFTER DELETE ON shops BEGIN
+                INSERT INTO shops_fts(shops_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shops_fts_update AFTER UPDATE OF name, description ON shops BEGIN
+                INSERT INTO shops_fts(shops_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO shops_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+        """)
+
+        # Index existing shops
+        op.execute("INSERT INTO shops_fts(shops_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        op.drop_index('ix_shops_fulltext', table_name='shops')
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_insert")
+        op.execute("DROP TABLE IF EXISTS shops_fts")
@@ -0,0 +1,46 @@
+"""Add unique (shop_id, catalog_item_id) index to shop inventory
+
+Revision ID: 005_shop_inventory_unique
+Revises: 004_shop_fulltext
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_shop_inventory_unique'
+down_revision = '004_shop_fulltext'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the newest row of each (shop_id, catalog_item_id) pair
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute("""
+            DELETE older FROM shop_inventory older
+            JOIN shop_inventory newer
+              ON newer.shop_id = older.shop_id
+             AND newer.catalog_item_id = older.catalog_item_id
+             AND newer.id > older.id
+        """)
+    else:
+        op.execute("""
+            DELETE FROM shop_inventory
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM shop_inventory GROUP BY shop_id, catalog_item_id
+            )
+        """)
+
+    # Target of bulk upserts; also serves lookups by shop
+    op.create_index(
+        'uq_shop_inventory_shop_catalog_item',
+        'shop_inventory',
+        ['shop_id', 'catalog_item_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_shop_inventory_shop_catalog_item', table_name='shop_inventory')
@@ -0,0 +1,45 @@
+"""Add stock reservations
+
+Revision ID: 006_stock_reservations
+Revises: 005_shop_inventory_unique
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_stock_reservations'
+down_revision = '005_shop_inventory_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_reservations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('inventory_item_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='active'),
+        sa.Column('reference', sa.String(length=64), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), 
+                  server_onupdate=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['inventory_item_id'], ['shop_inventory.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_reservations_id'), 'stock_reservations', ['id'], unique=False)
+    op.create_index(op.f('ix_stock_reservations_inventory_item_id'), 'stock_reservations', ['inventory_item_id'], unique=False)
+    op.create_index(op.f('ix_stock_reservations_user_id'), 'stock_reservations', ['user_id'], unique=False)
+    op.create_index('ix_stock_reservations_status_expires_at', 'stock_reservations', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_reservations_status_expires_at', table_name='stock_reservations')
+    op.drop_index(op.f('ix_stock_reservations_user_id'), table_name='stock_reservations')
+    op.drop_index(op.f('ix_stock_reservations_inventory_item_id'), table_name='stock_reservations')
+    op.drop_index(op.f('ix_stock_reservations_id'), table_name='stock_reservations')
+    op.drop_table('stock_reservations')
@@ -0,0 +1,149 @@
+"""Add shop search documents
+
+Revision ID: 007_shop_search_documents
+Revises: 006_stock_reservations
+Create Date: 2026-10-18 14:00:00.000000
+
+Adds shop_search_documents, one row per shop with the words of its name and
+description and of the names, brands and categories of its catalog items,
+and moves shop search's full-text index onto it: a FULLTEXT index on MySQL,
+the shop_search_fts FTS5 table on SQLite. The shops-only full-text index of
+004_shop_fulltext is dropped.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from common.utils.shop_documents import build_documents
+
+# revision identifiers, used by Alembic.
+revision = '007_shop_search_documents'
+down_revision = '006_stock_reservations'
+branch_labels = None
+depends_on = None
+
+# Shops whose documents are built per batch
+_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table(
+        'shop_search_documents',
+        sa.Column('shop_id', sa.Integer(), nullable=False),
+        sa.Column('shop_text', sa.Text(), nullable=False),
+        sa.Column('product_text', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['shop_id'], ['shops.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('shop_id')
+    )
+
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE shop_search_fts USING fts5("
+            "shop_text, product_text, content='shop_search_documents', content_rowid='shop_id')"
+        )
+        op.execute("""
+            CREATE TRIGGER shop_search_fts_insert AFTER INSERT ON shop_search_documents BEGIN
+                INSERT INTO shop_search_fts(rowid, shop_text, product_text)
+                VALUES (new.shop_id, new.shop_text, new.product_text);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shop_search_fts_delete AFTER DELETE ON shop_search_documents BEGIN
+                INSERT INTO shop_search_fts(shop_search_fts, rowid, shop_text, product_text)
+                VALUES ('delete', old.shop_id, old.shop_text, old.product_text);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shop_search_fts_update AFTER UPDATE OF shop_text, product_text ON shop_search_documents BEGIN
+                INSERT INTO shop_search_fts(shop_search_fts, rowid, shop_text, product_text)
+                VALUES ('delete', old.shop_id, old.shop_text, old.product_text);
+                INSERT INTO shop_search_fts(rowid, shop_text, product_text)
+                VALUES (new.shop_id, new.shop_text, new.product_text);
+            END
+        """)
+
+    # Build documents of existing shops
+    connection = op.get_bind()
+    documents_table = sa.table(
+        'shop_search_documents',
+        sa.column('shop_id', sa.Integer()),
+        sa.column('shop_text', sa.Text()),
+        sa.column('product_text', sa.Text())
+    )
+    last_id = 0
+    while True:
+        shops = connection.execute(
+            sa.text("SELECT id, name, description FROM shops WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": _BATCH_SIZE}
+        ).all()
+        if not shops:
+            break
+
+        products = connection.execute(
+            sa.text("""
+            SELECT DISTINCT si.shop_id, ci.name, ci.brand, c.name AS category
+            FROM shop_inventory si
+            JOIN catalog_items ci ON ci.id = si.catalog_item_id
+            LEFT JOIN categories c ON c.id = ci.category_id
+            WHERE si.shop_id > :first_id AND si.shop_id <= :last_id
+            """),
+            {"first_id": last_id, "last_id": shops[-1][0]}
+        ).all()
+        op.bulk_insert(documents_table, build_documents(shops, products))
+        last_id = shops[-1][0]
+
+    # Index documents only once they are all written
+    if dialect == 'mysql':
+        op.execute("CREATE FULLTEXT INDEX ix_shop_search_documents_fulltext ON shop_search_documents (shop_text, product_text)")
+        op.drop_index('ix_shops_fulltext', table_name='shops')
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS shops_fts_insert")
+        op.execute("DROP TABLE IF EXISTS shops_fts")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        op.execute("CREATE FULLTEXT INDEX ix_shops_fulltext ON shops (name, description)")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS shop_search_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS shop_search_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS shop_search_fts_insert")
+        op.execute("DROP TABLE IF EXISTS shop_search_fts")
+
+        op.execute(
+            "CREATE VIRTUAL TABLE shops_fts USING fts5("
+            "name, description, content='shops', content_rowid='id')"
+        )
+        op.execute("""
+            CREATE TRIGGER shops_fts_insert AFTER INSERT ON shops BEGIN
+                INSERT INTO shops_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shops_fts_delete AFTER DELETE ON shops BEGIN
+                INSERT INTO shops_fts(shops_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER shops_fts_update AFTER UPDATE OF name, description ON shops BEGIN
+                INSERT INTO shops_fts(shops_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO shops_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+        """)
+        op.execute("INSERT INTO shops_fts(shops_fts) VALUES ('rebuild')")
+
+    op.drop_table('shop_search_documents')
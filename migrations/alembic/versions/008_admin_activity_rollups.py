@@ -0,0 +1,59 @@
+"""Add admin activity rollups
+
+Revision ID: 008_admin_activity_rollups
+Revises: 007_shop_search_documents
+Create Date: 2026-10-18 17:00:00.000000
+
+Adds admin_activity_rollups, admin log counts per hour and per day, action,
+entity type and admin, and fills it from the existing admin logs.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_admin_activity_rollups'
+down_revision = '007_shop_search_documents'
+branch_labels = None
+depends_on = None
+
+# Granularity and the bucket start format on SQLite and MySQL; SQLite
+# datetimes are stored as text in the format SQLAlchemy writes
+_BUCKETS = (
+    ('hour', '%Y-%m-%d %H:00:00.000000', '%Y-%m-%d %H:00:00'),
+    ('day', '%Y-%m-%d 00:00:00.000000', '%Y-%m-%d 00:00:00'),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'admin_activity_rollups',
+        sa.Column('granularity', sa.String(length=4), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('admin_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'action', 'entity_type', 'admin_id')
+    )
+    
+    # Roll up the existing logs
+    is_sqlite = op.get_bind().dialect.name == 'sqlite'
+    for granularity, sqlite_format, mysql_format in _BUCKETS:
+        if is_sqlite:
+            bucket = f"strftime('{sqlite_format}', created_at)"
+        else:
+            bucket = f"DATE_FORMAT(created_at, '{mysql_format}')"
+        op.execute(
+            sa.text(f"""
+            INSERT INTO admin_activity_rollups
+                (granularity, bucket_start, action, entity_type, admin_id, count)
+            SELECT :granularity, {bucket}, action, entity_type, admin_id, COUNT(*)
+            FROM admin_logs
+            GROUP BY {bucket}, action, entity_type, admin_id
+            """).bindparams(granularity=granularity)
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('admin_activity_rollups')
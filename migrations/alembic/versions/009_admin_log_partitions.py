@@ -0,0 +1,65 @@
+"""Partition admin logs by month
+
+Revision ID: 009_admin_log_partitions
+Revises: 008_admin_activity_rollups
+Create Date: 2026-10-18 18:00:00.000000
+
+Adds a (created_at, admin_id) index to admin_logs. On MySQL the table is
+also partitioned by RANGE on TO_DAYS(created_at), one partition per month
+from the oldest log to ADMIN_LOG_FUTURE_PARTITIONS months ahead plus a
+catch-all pmax, with the primary key widened to (id, created_at) as
+partitioning requires. MySQL does not allow foreign keys on partitioned
+tables, so the admin_id foreign key to users is dropped there and audit
+rows are no longer checked against users. SQLite has no partitioning, so there the log
+retention job archives and deletes old rows instead of dropping partitions.
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from common.config.settings import get_settings
+from common.database.partitions import MAX_PARTITION, add_months, month_start, monthly_partitions
+
+# revision identifiers, used by Alembic.
+revision = '009_admin_log_partitions'
+down_revision = '008_admin_activity_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_admin_logs_created_at_admin_id', 'admin_logs', ['created_at', 'admin_id'], unique=False)
+    
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    
+    oldest = bind.execute(sa.text("SELECT MIN(created_at) FROM admin_logs")).scalar()
+    this_month = month_start(datetime.utcnow())
+    first_month = month_start(oldest) if oldest else this_month
+    last_month = add_months(this_month, get_settings().ADMIN_LOG_FUTURE_PARTITIONS)
+    
+    # Partitioned tables cannot have foreign keys; migration 001 left the
+    # admin_id one unnamed, so look up the name MySQL gave it
+    for foreign_key in sa.inspect(bind).get_foreign_keys('admin_logs'):
+        op.drop_constraint(foreign_key['name'], 'admin_logs', type_='foreignkey')
+    
+    op.execute("ALTER TABLE admin_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)")
+    partitions = monthly_partitions(first_month, last_month)
+    partitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+    op.execute(
+        "ALTER TABLE admin_logs PARTITION BY RANGE (TO_DAYS(created_at)) ("
+        + ", ".join(partitions)
+        + ")"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute("ALTER TABLE admin_logs REMOVE PARTITIONING")
+        op.execute("ALTER TABLE admin_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+        op.create_foreign_key('admin_logs_ibfk_1', 'admin_logs', 'users', ['admin_id'], ['id'])
+    
+    op.drop_index('ix_admin_logs_created_at_admin_id', table_name='admin_logs')
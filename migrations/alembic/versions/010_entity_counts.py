@@ -0,0 +1,43 @@
+"""Add entity counts
+
+Revision ID: 010_entity_counts
+Revises: 009_admin_log_partitions
+Create Date: 2026-10-18 19:00:00.000000
+
+Adds entity_counts, row counts of users, shops and catalog_items kept up to
+date on create and delete, and fills it with the current counts.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_entity_counts'
+down_revision = '009_admin_log_partitions'
+branch_labels = None
+depends_on = None
+
+_COUNTED_TABLES = ('users', 'shops', 'catalog_items')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entity_counts',
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('slot', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('entity', 'slot')
+    )
+    
+    # Count the existing rows into slot 0
+    for table_name in _COUNTED_TABLES:
+        op.execute(
+            sa.text(f"""
+            INSERT INTO entity_counts (entity, slot, count)
+            SELECT :entity, 0, COUNT(*) FROM {table_name}
+            """).bindparams(entity=table_name)
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('entity_counts')
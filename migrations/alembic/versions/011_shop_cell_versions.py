@@ -0,0 +1,32 @@
+"""Add shop cell versions
+
+Revision ID: 011_shop_cell_versions
+Revises: 010_entity_counts
+Create Date: 2026-10-18 20:00:00.000000
+
+Adds shop_cell_versions, per geohash cell change counters that shop writes
+bump and the customer service's nearby-shop cache checks on read. Cells
+without a row are at version 0, so nothing is filled in.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_shop_cell_versions'
+down_revision = '010_entity_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'shop_cell_versions',
+        sa.Column('cell', sa.String(length=12), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('cell')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('shop_cell_versions')
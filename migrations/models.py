@@ -7,7 +7,12 @@ metadata = MetaData()
 from services.user_service.models.user import *
 from services.seller_service.models.shop import *
 from services.seller_service.models.inventory import *
+from services.seller_service.models.reservation import *
+from services.seller_service.models.search_document import *
+from services.seller_service.models.cell_version import *
 from services.customer_service.models.preference import *
 from services.catalog_service.models.category import *
 from services.catalog_service.models.catalog import *
 from services.admin_service.models.admin_log import *
+from services.admin_service.models.activity_rollup import *
+from services.admin_service.models.entity_count import *
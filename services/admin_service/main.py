@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 import uvicorn
+import asyncio
 import sys
 import os
 
@@ -13,9 +14,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.config.settings import get_settings
 from common.exceptions.http_exceptions import AppException, exception_handler
 from common.utils.logging import setup_logger
+from common.auth.jwt import verified_token_cache
+from common.database.session import async_session_factory
+from common.utils.entity_counts import reconcile_counts
 
 # Import routers
 from services.admin_service.routers import users, shops, catalog, logs
+from services.admin_service.services.audit_log_writer import audit_log_writer
+from services.admin_service.services.log_retention import AdminLogRetention
 
 # Get settings
 settings = get_settings()
@@ -51,6 +57,49 @@ app.include_router(shops.router, prefix="/shops", tags=["Shops"])
 app.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
 app.include_router(logs.router, prefix="/logs", tags=["Logs"])
 
+# Admin log retention
+async def archive_old_admin_logs():
+    """
+    Periodically archive and remove admin logs past the retention period
+    """
+    while True:
+        await asyncio.sleep(settings.ADMIN_LOG_RETENTION_INTERVAL_SECONDS)
+        try:
+            async with async_session_factory() as session:
+                summary = await AdminLogRetention(session).run()
+            if summary["archived"]:
+                logger.info(f"Archived {summary['archived']} admin logs to {', '.join(summary['files'])}")
+        except Exception as e:
+            logger.error(f"Error archiving admin logs: {str(e)}")
+
+# Entity count reconciliation
+async def reconcile_entity_counts():
+    """
+    Periodically correct the kept entity counts from exact counts
+    """
+    while True:
+        await asyncio.sleep(settings.ENTITY_COUNT_RECONCILE_INTERVAL_SECONDS)
+        try:
+            async with async_session_factory() as session:
+                drift = await reconcile_counts(session)
+            for table_name, difference in drift.items():
+                if difference:
+                    logger.warning(f"Corrected {table_name} count by {difference}")
+        except Exception as e:
+            logger.error(f"Error reconciling entity counts: {str(e)}")
+
+@app.on_event("startup")
+async def startup():
+    await audit_log_writer.start()
+    app.state.admin_log_archiver = asyncio.create_task(archive_old_admin_logs())
+    app.state.entity_count_reconciler = asyncio.create_task(reconcile_entity_counts())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.admin_log_archiver.cancel()
+    app.state.entity_count_reconciler.cancel()
+    await audit_log_writer.close()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -61,6 +110,14 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Token verification cache metrics endpoint
+@app.get("/token-cache-stats")
+async def get_token_cache_stats():
+    """
+    Get hit/miss counters of the verified token caches
+    """
+    return {"jwt": verified_token_cache.stats()}
+
 # Custom OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
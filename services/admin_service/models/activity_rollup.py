@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import Base
+
+
+class AdminActivityRollup(Base):
+    """
+    Admin log counts per hour or day, action, entity type and admin
+    
+    Kept up to date as admin logs are written, so activity stats read a
+    handful of rollup rows instead of scanning the logs.
+    """
+    __tablename__ = "admin_activity_rollups"
+    
+    # Primary key order serves range scans over one granularity's buckets
+    granularity = Column(String(4), primary_key=True)  # hour, day
+    bucket_start = Column(DateTime, primary_key=True)
+    action = Column(String(100), primary_key=True)
+    entity_type = Column(String(50), primary_key=True)
+    admin_id = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<AdminActivityRollup {self.granularity} {self.bucket_start}: {self.action} on {self.entity_type} by {self.admin_id} x{self.count}>"
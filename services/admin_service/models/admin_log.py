@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, func
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index, func
 import sys
 import os
 
@@ -10,8 +10,18 @@ from common.database.session import Base
 class AdminLog(Base):
     """
     Admin log model for tracking admin actions
+    
+    On MySQL the table is partitioned by month of created_at, and its
+    primary key is (id, created_at) since partitioning needs the partition
+    column in every unique key, and admin_id has no foreign key to users
+    since partitioned tables cannot have foreign keys. Old months are
+    archived and dropped by the log retention job.
     """
     __tablename__ = "admin_logs"
+    __table_args__ = (
+        # Serves newest-first listings and time range filters
+        Index("ix_admin_logs_created_at_admin_id", "created_at", "admin_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     admin_id = Column(Integer, nullable=False, index=True)
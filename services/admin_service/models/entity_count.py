@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, String
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import Base
+
+
+class EntityCount(Base):
+    """
+    Row count of a table, maintained by common.utils.entity_counts
+    
+    A table's count is the sum of its slots. Creates and deletes add to a
+    random slot from 1 up, so concurrent writers rarely wait on the same
+    row; reconciliation corrects drift in slot 0.
+    """
+    __tablename__ = "entity_counts"
+    
+    entity = Column(String(50), primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<EntityCount {self.entity}[{self.slot}]: {self.count}>"
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
@@ -10,11 +11,14 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.database.session import get_db
 from common.auth.jwt import get_current_user
+from common.database.pagination import TotalMode
 from common.exceptions.http_exceptions import ResourceNotFoundException, UnauthorizedException
 
 # Import schemas and services
-from services.admin_service.schemas.admin_log import AdminLogResponse, AdminLogSearchResponse, AdminLogFilter
+from services.admin_service.schemas.admin_log import AdminLogResponse, AdminLogSearchResponse, AdminLogFilter, AdminLogExportFormat
 from services.admin_service.services.admin_log_service import AdminLogService
+from services.admin_service.services.audit_log_writer import audit_log_writer
+from services.admin_service.services.log_export import MEDIA_TYPES, export_logs
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -29,6 +33,7 @@ async def get_logs(
     end_date: Optional[datetime] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    total: TotalMode = Query(TotalMode.EXACT, description="How to compute the total: exact, estimated or none"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -53,19 +58,61 @@ async def get_logs(
     )
     
     log_service = AdminLogService(db)
-    logs, total = await log_service.get_logs(
+    result = await log_service.get_logs(
         log_filter=log_filter,
         skip=offset,
-        limit=page_size
+        limit=page_size,
+        total_mode=total
     )
     
     return {
-        "logs": logs,
-        "total": total,
+        "logs": result.items,
+        "total": result.total,
+        "total_exact": result.total_exact,
+        "has_more": result.has_more,
         "page": page,
         "page_size": page_size
     }
 
+@router.get("/export")
+async def export_admin_logs(
+    admin_id: Optional[int] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    format: AdminLogExportFormat = Query(AdminLogExportFormat.NDJSON, description="Export format: ndjson or csv"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Export every admin log matching the filters, oldest first (admin only)
+    
+    The export is streamed as it is read, a page of logs at a time, each
+    page in its own short transaction, so memory use does not grow with
+    the export's size.
+    """
+    # Check if user is admin
+    if current_user.get("role") != "admin":
+        raise UnauthorizedException("Only admins can access this endpoint")
+    
+    # Create filter
+    log_filter = AdminLogFilter(
+        admin_id=admin_id,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        start_date=start_date,
+        end_date=end_date
+    )
+    
+    filename = f"admin_logs-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{format.value}"
+    return StreamingResponse(
+        export_logs(log_filter, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/recent", response_model=List[AdminLogResponse])
 async def get_recent_logs(
     limit: int = Query(10, ge=1, le=50),
@@ -120,6 +167,19 @@ async def get_system_stats(
         "timestamp": end_date
     }
 
+@router.get("/writer-stats", response_model=Dict[str, Any])
+async def get_writer_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Get counters of the batched audit log writer (admin only)
+    """
+    # Check if user is admin
+    if current_user.get("role") != "admin":
+        raise UnauthorizedException("Only admins can access this endpoint")
+    
+    return audit_log_writer.stats()
+
 @router.get("/{log_id}", response_model=AdminLogResponse)
 async def get_log(
     log_id: int = Path(..., gt=0),
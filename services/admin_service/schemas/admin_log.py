@@ -1,3 +1,4 @@
+import enum
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator, HttpUrl
@@ -49,11 +50,21 @@ class AdminLogFilter(BaseModel):
     end_date: Optional[datetime] = None
 
 
+class AdminLogExportFormat(str, enum.Enum):
+    """
+    File format of an admin log export
+    """
+    NDJSON = "ndjson"  # One JSON object per line
+    CSV = "csv"        # Header row, then one row per log with details as JSON
+
+
 class AdminLogSearchResponse(BaseModel):
     """
     Schema for admin log search response
     """
     logs: List[AdminLogResponse]
-    total: int
+    total: Optional[int] = None  # Not computed when total=none was requested
+    total_exact: bool = True  # False if total is estimated from statistics or a cached count
+    has_more: bool = False
     page: int
     page_size: int
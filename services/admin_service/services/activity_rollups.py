@@ -0,0 +1,169 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.admin_service.models.activity_rollup import AdminActivityRollup
+from services.admin_service.models.admin_log import AdminLog
+
+# Rollup granularities
+HOUR = "hour"
+DAY = "day"
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+
+# An admin log as rolled up: (created_at, action, entity_type, admin_id)
+LogKey = Tuple[datetime, str, str, int]
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """
+    Get the start of the hour or day containing a moment
+    """
+    if granularity == DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_rows(logs: Iterable[LogKey]) -> List[Dict[str, Any]]:
+    """
+    Count logs per hour and per day bucket, action, entity type and admin
+
+    Rows are sorted by primary key, so concurrent writers lock rollup rows
+    in the same order.
+    """
+    counts: Counter = Counter()
+    for created_at, action, entity_type, admin_id in logs:
+        for granularity in (HOUR, DAY):
+            counts[(granularity, bucket_start(created_at, granularity), action, entity_type, int(admin_id))] += 1
+
+    return [
+        {
+            "granularity": granularity,
+            "bucket_start": start,
+            "action": action,
+            "entity_type": entity_type,
+            "admin_id": admin_id,
+            "count": count
+        }
+        for (granularity, start, action, entity_type, admin_id), count in sorted(counts.items())
+    ]
+
+
+async def add_to_rollups(db: AsyncSession, logs: Iterable[LogKey]) -> None:
+    """
+    Add newly written logs to the rollup counts, in the caller's transaction
+    """
+    rows = rollup_rows(logs)
+    if not rows:
+        return
+
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql_insert(AdminActivityRollup).values(rows)
+        stmt = stmt.on_duplicate_key_update(count=AdminActivityRollup.count + stmt.inserted.count)
+    else:
+        stmt = sqlite_insert(AdminActivityRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["granularity", "bucket_start", "action", "entity_type", "admin_id"],
+            set_={"count": AdminActivityRollup.count + stmt.excluded.count}
+        )
+
+    await db.execute(stmt)
+
+
+def _ceil(moment: datetime, granularity: str) -> datetime:
+    """
+    Get the first bucket start at or after a moment
+    """
+    start = bucket_start(moment, granularity)
+    if start < moment:
+        start += _DAY if granularity == DAY else _HOUR
+
+    return start
+
+
+async def get_activity_counts(
+    db: AsyncSession,
+    start_date: datetime,
+    end_date: datetime
+) -> List[Tuple[str, str, int, int]]:
+    """
+    Count logs created from start_date to end_date, inclusive, per action,
+    entity type and admin
+
+    Days wholly inside the range are read from the daily rollups, the
+    whole hours around them from the hourly rollups, and only the partial
+    hours at the two edges from admin_logs, so the cost depends on the
+    range's length in days rather than on how many logs it holds.
+
+    Returns (action, entity_type, admin_id, count) tuples
+    """
+    # Whole hours are [first_hour, last_hour); an hour ending exactly at
+    # end_date is whole, a log at end_date falling in the next bucket
+    first_hour = _ceil(start_date, HOUR)
+    last_hour = bucket_start(end_date, HOUR)
+    if first_hour >= last_hour:
+        return await _count_logs(db, AdminLog.created_at.between(start_date, end_date))
+
+    first_day = _ceil(first_hour, DAY)
+    last_day = bucket_start(last_hour, DAY)
+    if first_day < last_day:
+        buckets = or_(
+            _buckets(DAY, first_day, last_day),
+            _buckets(HOUR, first_hour, first_day),
+            _buckets(HOUR, last_day, last_hour)
+        )
+    else:
+        buckets = _buckets(HOUR, first_hour, last_hour)
+
+    counts: Dict[Tuple[str, str, int], int] = defaultdict(int)
+    result = await db.execute(
+        select(
+            AdminActivityRollup.action,
+            AdminActivityRollup.entity_type,
+            AdminActivityRollup.admin_id,
+            func.sum(AdminActivityRollup.count)
+        )
+        .where(buckets)
+        .group_by(AdminActivityRollup.action, AdminActivityRollup.entity_type, AdminActivityRollup.admin_id)
+    )
+    for action, entity_type, admin_id, count in result:
+        counts[(action, entity_type, admin_id)] += int(count)
+
+    edges = or_(
+        and_(AdminLog.created_at >= start_date, AdminLog.created_at < first_hour),
+        and_(AdminLog.created_at >= last_hour, AdminLog.created_at <= end_date)
+    )
+    for action, entity_type, admin_id, count in await _count_logs(db, edges):
+        counts[(action, entity_type, admin_id)] += count
+
+    return [key + (count,) for key, count in counts.items()]
+
+
+def _buckets(granularity: str, start: datetime, end: datetime):
+    """
+    Condition selecting the rollups of one granularity starting in [start, end)
+    """
+    return and_(
+        AdminActivityRollup.granularity == granularity,
+        AdminActivityRollup.bucket_start >= start,
+        AdminActivityRollup.bucket_start < end
+    )
+
+
+async def _count_logs(db: AsyncSession, condition) -> List[Tuple[str, str, int, int]]:
+    """
+    Count the admin logs matching a condition per action, entity type and admin
+    """
+    result = await db.execute(
+        select(AdminLog.action, AdminLog.entity_type, AdminLog.admin_id, func.count())
+        .where(condition)
+        .group_by(AdminLog.action, AdminLog.entity_type, AdminLog.admin_id)
+    )
+    return [tuple(row) for row in result]
@@ -1,5 +1,7 @@
+from collections import defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func, and_, or_
 from typing import Optional, List, Dict, Any, Tuple
@@ -7,6 +9,10 @@ from datetime import datetime
 
 from services.admin_service.models.admin_log import AdminLog
 from services.admin_service.schemas.admin_log import AdminLogFilter
+from services.admin_service.services.audit_log_writer import audit_log_writer
+from services.admin_service.services.activity_rollups import add_to_rollups, get_activity_counts
+from common.database.pagination import Page, TotalMode, paginate
+from common.utils.entity_counts import get_count
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
@@ -14,6 +20,31 @@ from common.exceptions.http_exceptions import (
 )
 
 
+def filter_logs(query: Select, log_filter: AdminLogFilter) -> Select:
+    """
+    Apply an admin log filter to a query selecting from admin_logs
+    """
+    if log_filter.admin_id:
+        query = query.where(AdminLog.admin_id == log_filter.admin_id)
+    
+    if log_filter.action:
+        query = query.where(AdminLog.action == log_filter.action)
+    
+    if log_filter.entity_type:
+        query = query.where(AdminLog.entity_type == log_filter.entity_type)
+    
+    if log_filter.entity_id:
+        query = query.where(AdminLog.entity_id == log_filter.entity_id)
+    
+    if log_filter.start_date:
+        query = query.where(AdminLog.created_at >= log_filter.start_date)
+    
+    if log_filter.end_date:
+        query = query.where(AdminLog.created_at <= log_filter.end_date)
+    
+    return query
+
+
 class AdminLogService:
     """
     Service for admin log operations
@@ -31,7 +62,33 @@ class AdminLogService:
     ) -> AdminLog:
         """
         Create a new admin log entry
+        
+        While the batched audit log writer runs, the entry is handed to the
+        writer once the current transaction commits, so the request does not
+        wait on the insert and a rolled back action is not logged; the
+        returned log is not stored yet and has no id then. Otherwise the
+        entry is inserted in the current transaction.
         """
+        if audit_log_writer.running:
+            created_at = datetime.utcnow()
+            audit_log_writer.submit_after_commit(
+                self.db,
+                admin_id=admin_id,
+                action=action,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                details=details,
+                created_at=created_at
+            )
+            return AdminLog(
+                admin_id=admin_id,
+                action=action,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                details=details,
+                created_at=created_at
+            )
+        
         # Create new log
         log = AdminLog(
             admin_id=admin_id,
@@ -45,6 +102,7 @@ class AdminLogService:
             self.db.add(log)
             await self.db.flush()
             await self.db.refresh(log)
+            await add_to_rollups(self.db, [(log.created_at, log.action, log.entity_type, log.admin_id)])
             return log
         except IntegrityError as e:
             await self.db.rollback()
@@ -64,51 +122,29 @@ class AdminLogService:
         self,
         log_filter: AdminLogFilter,
         skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[AdminLog], int]:
+        limit: int = 20,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page:
         """
         Get admin logs with filtering
         
-        Returns a tuple of (logs, total_count)
+        Returns a Page of logs; see paginate for how the total is computed
         """
         # Build query
-        query = select(AdminLog)
-        
-        # Apply filters
-        if log_filter.admin_id:
-            query = query.where(AdminLog.admin_id == log_filter.admin_id)
-        
-        if log_filter.action:
-            query = query.where(AdminLog.action == log_filter.action)
-        
-        if log_filter.entity_type:
-            query = query.where(AdminLog.entity_type == log_filter.entity_type)
-        
-        if log_filter.entity_id:
-            query = query.where(AdminLog.entity_id == log_filter.entity_id)
-        
-        if log_filter.start_date:
-            query = query.where(AdminLog.created_at >= log_filter.start_date)
-        
-        if log_filter.end_date:
-            query = query.where(AdminLog.created_at <= log_filter.end_date)
-        
-        # Order by created_at descending
-        query = query.order_by(AdminLog.created_at.desc())
-        
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar()
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-        
-        # Execute query
-        result = await self.db.execute(query)
-        logs = result.scalars().all()
-        
-        return list(logs), total
+        query = filter_logs(select(AdminLog), log_filter)
+        
+        # Order by created_at descending, newest ID first within a timestamp
+        query = query.order_by(AdminLog.created_at.desc(), AdminLog.id.desc())
+        
+        # Get the page, counting only if the total mode needs it
+        return await paginate(
+            self.db,
+            query,
+            skip=skip,
+            limit=limit,
+            total_mode=total_mode,
+            table_name=AdminLog.__tablename__
+        )
     
     async def get_recent_logs(self, limit: int = 10) -> List[AdminLog]:
         """
@@ -123,12 +159,12 @@ class AdminLogService:
     async def get_entity_count(self, table_name: str) -> int:
         """
         Get count of entities in a table
-        """
-        query = f"SELECT COUNT(*) FROM {table_name}"
-        result = await self.db.execute(query)
-        count = result.scalar()
         
-        return count
+        Reads the counts kept in entity_counts, cached briefly, so the table
+        itself is never scanned; raises ValidationException for tables
+        without kept counts.
+        """
+        return await get_count(self.db, table_name)
     
     async def get_activity_stats(
         self,
@@ -138,52 +174,19 @@ class AdminLogService:
         """
         Get activity statistics for a time period
         """
-        # Get action counts
-        action_query = select(
-            AdminLog.action,
-            func.count().label("count")
-        ).where(
-            and_(
-                AdminLog.created_at >= start_date,
-                AdminLog.created_at <= end_date
-            )
-        ).group_by(AdminLog.action)
-        
-        action_result = await self.db.execute(action_query)
-        action_counts = {row[0]: row[1] for row in action_result}
-        
-        # Get entity type counts
-        entity_query = select(
-            AdminLog.entity_type,
-            func.count().label("count")
-        ).where(
-            and_(
-                AdminLog.created_at >= start_date,
-                AdminLog.created_at <= end_date
-            )
-        ).group_by(AdminLog.entity_type)
-        
-        entity_result = await self.db.execute(entity_query)
-        entity_counts = {row[0]: row[1] for row in entity_result}
-        
-        # Get admin counts
-        admin_query = select(
-            AdminLog.admin_id,
-            func.count().label("count")
-        ).where(
-            and_(
-                AdminLog.created_at >= start_date,
-                AdminLog.created_at <= end_date
-            )
-        ).group_by(AdminLog.admin_id)
-        
-        admin_result = await self.db.execute(admin_query)
-        admin_counts = {str(row[0]): row[1] for row in admin_result}
+        # Count per action, entity type and admin, mostly from the rollups
+        action_counts: Dict[str, int] = defaultdict(int)
+        entity_counts: Dict[str, int] = defaultdict(int)
+        admin_counts: Dict[str, int] = defaultdict(int)
+        for action, entity_type, admin_id, count in await get_activity_counts(self.db, start_date, end_date):
+            action_counts[action] += count
+            entity_counts[entity_type] += count
+            admin_counts[str(admin_id)] += count
         
         return {
-            "actions": action_counts,
-            "entities": entity_counts,
-            "admins": admin_counts,
+            "actions": dict(action_counts),
+            "entities": dict(entity_counts),
+            "admins": dict(admin_counts),
             "period": {
                 "start": start_date,
                 "end": end_date
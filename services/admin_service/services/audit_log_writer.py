@@ -0,0 +1,458 @@
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.admin_service.models.admin_log import AdminLog
+from services.admin_service.services.activity_rollups import add_to_rollups
+from common.config.settings import get_settings
+from common.database.session import async_session_factory
+from common.utils.after_commit import run_after_commit
+
+settings = get_settings()
+logger = logging.getLogger("admin_service")
+
+_SPILL_SUFFIX = ".jsonl"
+_CHECKPOINT_SUFFIX = ".offset"
+
+# Entries the database rejects, with the error; not ending in _SPILL_SUFFIX,
+# so starting writers do not adopt it
+_DEAD_LETTER_FILE = "dead-letter.ndjson"
+
+# Errors a retry cannot fix, raised for particular entries rather than
+# because the database is unavailable
+_REJECTED_ENTRY_ERRORS = (IntegrityError, DataError, KeyError, TypeError, ValueError)
+
+
+class AuditLogWriter:
+    """
+    Batched background writer for admin audit log entries
+
+    submit() appends each entry to a spill file, one JSON line, and queues
+    it in memory; a background task bulk-inserts queued entries in batches
+    of up to batch_size, at least every flush_interval seconds, adds them
+    to the activity rollups in the same transaction, and then
+    records how far into the spill file is written in a checkpoint file.
+    Entries not yet inserted when the process stops, cleanly or not, are
+    replayed from the spill file on the next start, so delivery is at
+    least once. When max_pending entries are queued, submit() waits up to
+    submit_timeout seconds for the writer to catch up; entries submitted
+    after that, or by submit_nowait(), are only appended to the spill file
+    and are read back into the queue as it drains.
+
+    Each process spills to its own file, locked while the process runs, so
+    several workers can share the spill directory; a starting writer adopts
+    the files of processes that are gone.
+
+    A batch failing for a reason a retry cannot fix, such as a constraint
+    violation, is retried one entry at a time, and entries that still fail
+    are appended to a dead-letter file in the spill directory, so one bad
+    entry does not hold back the ones after it. Other failures, such as a
+    lost connection, keep the batch queued for the next flush.
+    """
+    def __init__(
+        self,
+        spill_dir: str,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        submit_timeout: float = 1.0
+    ):
+        self.spill_dir = spill_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        self._pending: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self._spill = None
+        self._spill_path: Optional[str] = None
+        self._checkpoint = 0
+        # Spill file offset up to which entries are queued; entries after it
+        # are only in the file
+        self._queued_end = 0
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.failures = 0
+        self.dead_lettered = 0
+
+    @property
+    def running(self) -> bool:
+        """
+        Check whether the background flush task is running
+        """
+        return self._task is not None
+
+    async def start(self) -> None:
+        """
+        Open this process's spill file, adopt unwritten entries of stopped
+        processes, and start the background flush task
+        """
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._spill_path = os.path.join(self.spill_dir, f"audit-{os.getpid()}-{uuid.uuid4().hex[:8]}{_SPILL_SUFFIX}")
+        self._spill = open(self._spill_path, "ab")
+        fcntl.flock(self._spill.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._write_checkpoint(0)
+        self._checkpoint = 0
+        self._queued_end = 0
+
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, f"*{_SPILL_SUFFIX}"))):
+            if path != self._spill_path:
+                self._adopt(path)
+
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(
+        self,
+        admin_id: int,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        details: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Queue an audit log entry, waiting up to submit_timeout seconds while
+        the writer is max_pending behind
+
+        The entry is in the spill file when this returns. created_at
+        defaults to the submit time, not the insert time.
+        """
+        try:
+            async with self._space:
+                await asyncio.wait_for(
+                    self._space.wait_for(lambda: len(self._pending) < self.max_pending),
+                    timeout=self.submit_timeout
+                )
+        except asyncio.TimeoutError:
+            pass  # Left in the spill file until the queue has room
+
+        self.submit_nowait(admin_id, action, entity_type, entity_id, details, created_at)
+
+    def submit_nowait(
+        self,
+        admin_id: int,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        details: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Queue an audit log entry without waiting; see submit
+        """
+        if self._spill is None:
+            logger.error(f"Audit log writer is stopped, dropping admin log entry: {action} {entity_type} {entity_id}")
+            return
+
+        self._append({
+            "admin_id": int(admin_id),
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+            "created_at": (created_at or datetime.utcnow()).isoformat()
+        })
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def submit_after_commit(self, db: AsyncSession, **entry: Any) -> None:
+        """
+        Submit an audit log entry once the session's transaction commits
+
+        The entry is dropped if the transaction rolls back instead, so only
+        committed actions are logged, and the session is never committed
+        here. Takes submit's arguments by keyword.
+        """
+        run_after_commit(db, lambda: self.submit_nowait(**entry))
+
+    async def close(self) -> None:
+        """
+        Stop the flush task after writing every queued entry it can
+
+        Entries that still cannot be written stay in the spill file for the
+        next start.
+        """
+        if self._task is None:
+            return
+
+        # Signalled rather than cancelled: on Python 3.11 wait_for can swallow
+        # a cancellation that arrives as the wakeup fires, leaving it running
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+        while self._pending and await self._flush():
+            pass
+
+        self._spill.close()
+        self._spill = None
+        if not self._pending:
+            os.remove(self._spill_path)
+            os.remove(self._spill_path + _CHECKPOINT_SUFFIX)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get writer counters
+        """
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "written": self.written,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+            "spill_bytes": os.fstat(self._spill.fileno()).st_size if self._spill else 0,
+            "checkpoint": self._checkpoint,
+            "unqueued_bytes": self._spill.tell() - self._queued_end if self._spill else 0
+        }
+
+    async def _run(self) -> None:
+        """
+        Flush batches whenever one fills up or the flush interval passes,
+        until close() is called
+        """
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closing:
+                return
+
+            # Write full batches back to back, then wait again
+            while self._pending and await self._flush():
+                if len(self._pending) < self.batch_size:
+                    break
+
+    async def _flush(self) -> bool:
+        """
+        Insert the oldest batch of queued entries and checkpoint past it
+
+        Returns False, keeping the unwritten part of the batch queued, if
+        the database is unavailable.
+        """
+        batch = [self._pending[index] for index in range(min(self.batch_size, len(self._pending)))]
+
+        try:
+            await self._insert([entry for entry, _ in batch])
+        except _REJECTED_ENTRY_ERRORS as e:
+            logger.warning(f"Writing {len(batch)} admin log entries one at a time after: {str(e)}")
+            return await self._flush_entries(batch)
+        except (SQLAlchemyError, OSError) as e:
+            self.failures += 1
+            logger.error(f"Error writing {len(batch)} admin log entries: {str(e)}")
+            return False
+
+        self.written += len(batch)
+        await self._advance(batch)
+        return True
+
+    async def _flush_entries(self, batch: List[Tuple[Dict[str, Any], int]]) -> bool:
+        """
+        Insert a batch one entry at a time, dead-lettering entries that are rejected
+
+        Returns False, keeping the rest of the batch queued, if the database
+        becomes unavailable partway.
+        """
+        done: List[Tuple[Dict[str, Any], int]] = []
+        try:
+            for queued in batch:
+                try:
+                    await self._insert([queued[0]])
+                    self.written += 1
+                except _REJECTED_ENTRY_ERRORS as e:
+                    await asyncio.to_thread(self._dead_letter, queued[0], e)
+                done.append(queued)
+        except (SQLAlchemyError, OSError) as e:
+            self.failures += 1
+            logger.error(f"Error writing admin log entries: {str(e)}")
+
+        if done:
+            await self._advance(done)
+        return len(done) == len(batch)
+
+    async def _insert(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Insert entries and add them to the activity rollups in one transaction
+        """
+        rows = [self._row(entry) for entry in entries]
+        async with async_session_factory() as session:
+            await session.execute(insert(AdminLog.__table__), rows)
+            await add_to_rollups(
+                session,
+                [(row["created_at"], row["action"], row["entity_type"], row["admin_id"]) for row in rows]
+            )
+            await session.commit()
+
+    def _dead_letter(self, entry: Dict[str, Any], error: Exception) -> None:
+        """
+        Append a rejected entry and its error to the dead-letter file
+        """
+        line = json.dumps({
+            "entry": entry,
+            "error": str(error),
+            "rejected_at": datetime.utcnow().isoformat()
+        }, default=str).encode("utf-8") + b"\n"
+        with open(os.path.join(self.spill_dir, _DEAD_LETTER_FILE), "ab") as dead_letter:
+            dead_letter.write(line)
+            dead_letter.flush()
+            os.fsync(dead_letter.fileno())
+
+        self.dead_lettered += 1
+        logger.error(f"Moved rejected admin log entry to {_DEAD_LETTER_FILE}: {str(error)}")
+
+    async def _advance(self, done: List[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Drop the oldest queued entries, which are written or dead-lettered,
+        and checkpoint past them
+        """
+        for _ in done:
+            self._pending.popleft()
+        self._checkpoint = done[-1][1]
+        if not self._pending:
+            self._queued_end = self._checkpoint
+        self._refill()
+
+        if self._pending:
+            await asyncio.to_thread(self._sync_spill, self._checkpoint)
+        else:
+            # Start the spill file over once everything in it is written. The
+            # checkpoint is reset first, so a crash in between only replays
+            # written entries, and the file is kept if entries arrived meanwhile.
+            await asyncio.to_thread(self._sync_spill, 0)
+            if self._spill.tell() == self._checkpoint:
+                self._spill.truncate(0)
+                self._spill.seek(0)
+                self._checkpoint = 0
+                self._queued_end = 0
+
+        async with self._space:
+            self._space.notify_all()
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """
+        Append an entry to the spill file and, unless max_pending entries
+        are queued or earlier entries are still only in the file, queue it
+        with its end offset
+        """
+        line = json.dumps(entry, default=str).encode("utf-8") + b"\n"
+        queued = len(self._pending) < self.max_pending and self._queued_end == self._spill.tell()
+        self._spill.write(line)
+        self._spill.flush()
+
+        if queued:
+            # Queue what a replay would read, so both paths insert the same values
+            self._queued_end = self._spill.tell()
+            self._pending.append((json.loads(line), self._queued_end))
+
+    def _refill(self) -> None:
+        """
+        Queue entries that are only in the spill file, up to max_pending
+        """
+        if len(self._pending) >= self.max_pending or self._queued_end == self._spill.tell():
+            return
+
+        with open(self._spill_path, "rb") as spill:
+            spill.seek(self._queued_end)
+            while len(self._pending) < self.max_pending:
+                line = spill.readline()
+                if not line:
+                    break
+                self._queued_end += len(line)
+                self._pending.append((json.loads(line), self._queued_end))
+
+    def _adopt(self, path: str) -> None:
+        """
+        Move the unwritten entries of a stopped process's spill file into
+        this process's queue and spill file, then remove it
+        """
+        with open(path, "rb") as spill:
+            try:
+                fcntl.flock(spill.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # Its process is still running
+
+            spill.seek(self._read_checkpoint(path))
+            adopted = 0
+            for line in spill:
+                # A line without a newline was cut short by a crash mid-write
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.error(f"Skipping unreadable admin log entry in {path}")
+                    continue
+                self._append(entry)
+                adopted += 1
+
+        os.fsync(self._spill.fileno())
+        os.remove(path)
+        if os.path.exists(path + _CHECKPOINT_SUFFIX):
+            os.remove(path + _CHECKPOINT_SUFFIX)
+        if adopted:
+            logger.info(f"Recovered {adopted} unwritten admin log entries from {path}")
+
+    def _sync_spill(self, checkpoint: int) -> None:
+        """
+        Flush the spill file to disk and record the checkpoint
+        """
+        os.fsync(self._spill.fileno())
+        self._write_checkpoint(checkpoint)
+
+    def _write_checkpoint(self, offset: int) -> None:
+        """
+        Atomically record the spill file offset up to which entries are written
+        """
+        path = self._spill_path + _CHECKPOINT_SUFFIX
+        with open(path + ".tmp", "w") as checkpoint:
+            checkpoint.write(str(offset))
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _read_checkpoint(spill_path: str) -> int:
+        """
+        Get the written offset recorded for a spill file, 0 if none
+        """
+        try:
+            with open(spill_path + _CHECKPOINT_SUFFIX) as checkpoint:
+                return int(checkpoint.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def _row(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the admin_logs row of a spilled entry
+        """
+        return {
+            **entry,
+            "created_at": datetime.fromisoformat(entry["created_at"])
+        }
+
+
+# Process-wide writer started and stopped with the admin service
+audit_log_writer = AuditLogWriter(
+    spill_dir=settings.AUDIT_LOG_SPILL_DIR,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.AUDIT_LOG_MAX_PENDING,
+    submit_timeout=settings.AUDIT_LOG_SUBMIT_TIMEOUT_SECONDS
+)
@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, text
 from typing import Optional, List, Dict, Any, Tuple
 
+from common.utils.entity_counts import adjust_count
+from common.utils.shop_documents import refresh_documents_for_catalog_items
+
 # Import catalog model from catalog service
 # In a real implementation, this would be an API call to the catalog service
 # For simplicity, we're simulating direct database access
@@ -108,6 +111,10 @@ class AdminCatalogService:
         # Get updated catalog item
         updated_item = await self.get_catalog_item_by_id(item_id)
         
+        # Rebuild search documents of shops stocking the item
+        if any(key in item_data for key in ("name", "brand", "category_id")):
+            await refresh_documents_for_catalog_items(self.db, [item_id])
+        
         return updated_item
     
     async def delete_catalog_item(self, item_id: int) -> bool:
@@ -120,7 +127,9 @@ class AdminCatalogService:
             raise Exception(f"Catalog item with ID {item_id} not found")
         
         # Execute delete
-        delete_query = f"DELETE FROM catalog_items WHERE id = {item_id}"
-        await self.db.execute(delete_query)
+        delete_query = text("DELETE FROM catalog_items WHERE id = :item_id")
+        result = await self.db.execute(delete_query, {"item_id": item_id})
+        await adjust_count(self.db, "catalog_items", -result.rowcount)
+        await refresh_documents_for_catalog_items(self.db, [item_id])
         
         return True
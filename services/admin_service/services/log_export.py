@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import String, and_, cast, literal, or_
+from sqlalchemy.future import select
+
+from services.admin_service.models.admin_log import AdminLog
+from services.admin_service.schemas.admin_log import AdminLogExportFormat, AdminLogFilter
+from services.admin_service.services.admin_log_service import filter_logs
+from common.config.settings import get_settings
+from common.database.session import async_session_factory
+
+settings = get_settings()
+
+_admin_logs = AdminLog.__table__
+
+EXPORT_COLUMNS = ["id", "admin_id", "action", "entity_type", "entity_id", "details", "created_at"]
+
+MEDIA_TYPES = {
+    AdminLogExportFormat.NDJSON: "application/x-ndjson",
+    AdminLogExportFormat.CSV: "text/csv"
+}
+
+
+async def iter_log_pages(
+    log_filter: AdminLogFilter,
+    batch_size: Optional[int] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Iterate over the logs matching a filter, oldest first, a page at a time
+
+    Pages follow the (created_at, admin_id, id) key of the previous page's
+    last log, the order of the created_at index, so each page is an index
+    range read however deep the export is. Each page is read in its own
+    short session, so no transaction stays open between pages; logs written
+    while an export runs may or may not be included.
+    """
+    batch_size = batch_size or settings.ADMIN_LOG_EXPORT_BATCH_SIZE
+    # created_at is carried over as stored, since SQLite keeps it as text in
+    # more than one format and a reformatted timestamp would not match ties
+    created_at_key = cast(_admin_logs.c.created_at, String)
+    query = (
+        filter_logs(select(_admin_logs, created_at_key.label("created_at_key")), log_filter)
+        .order_by(_admin_logs.c.created_at, _admin_logs.c.admin_id, _admin_logs.c.id)
+        .limit(batch_size)
+    )
+    last = None
+
+    while True:
+        page_query = query
+        if last is not None:
+            last_created_at = literal(last["created_at_key"], String)
+            page_query = query.where(or_(
+                _admin_logs.c.created_at > last_created_at,
+                and_(
+                    _admin_logs.c.created_at == last_created_at,
+                    or_(
+                        _admin_logs.c.admin_id > last["admin_id"],
+                        and_(_admin_logs.c.admin_id == last["admin_id"], _admin_logs.c.id > last["id"])
+                    )
+                )
+            ))
+
+        async with async_session_factory() as session:
+            result = await session.execute(page_query)
+            rows = [dict(row) for row in result.mappings().all()]
+
+        if not rows:
+            return
+        last = rows[-1].copy()
+        for row in rows:
+            del row["created_at_key"]
+        yield rows
+
+        if len(rows) < batch_size:
+            return
+
+
+async def export_logs(
+    log_filter: AdminLogFilter,
+    export_format: AdminLogExportFormat,
+    batch_size: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the logs matching a filter as NDJSON or CSV text, a page per chunk
+    """
+    if export_format == AdminLogExportFormat.CSV:
+        yield _csv_chunk([EXPORT_COLUMNS])
+
+    async for rows in iter_log_pages(log_filter, batch_size):
+        if export_format == AdminLogExportFormat.CSV:
+            yield _csv_chunk([
+                [
+                    row["id"],
+                    row["admin_id"],
+                    row["action"],
+                    row["entity_type"],
+                    row["entity_id"],
+                    json.dumps(row["details"]) if row["details"] is not None else "",
+                    row["created_at"].isoformat()
+                ]
+                for row in rows
+            ])
+        else:
+            yield "".join(
+                json.dumps({column: row[column] for column in EXPORT_COLUMNS}, default=_json_default) + "\n"
+                for row in rows
+            )
+
+
+def _csv_chunk(rows: List[List[Any]]) -> str:
+    """
+    Format rows as CSV text
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Serialize log values json does not handle, i.e. created_at
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,245 @@
+import asyncio
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from services.admin_service.models.admin_log import AdminLog
+from common.config.settings import get_settings
+from common.database.partitions import (
+    MAX_PARTITION,
+    add_months,
+    month_start,
+    monthly_partitions,
+    partition_month
+)
+
+settings = get_settings()
+
+_admin_logs = AdminLog.__table__
+
+_PARTITIONS_QUERY = text("""
+    SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'admin_logs'
+    AND PARTITION_NAME IS NOT NULL
+    ORDER BY PARTITION_ORDINAL_POSITION
+""")
+
+_MYSQL_DELETE_ARCHIVED = text("""
+    DELETE FROM admin_logs
+    WHERE created_at >= :start AND created_at < :end AND id <= :last_id
+    LIMIT :batch_size
+""")
+
+_DELETE_ARCHIVED = text("""
+    DELETE FROM admin_logs WHERE id IN (
+        SELECT id FROM admin_logs
+        WHERE created_at >= :start AND created_at < :end AND id <= :last_id
+        LIMIT :batch_size
+    )
+""")
+
+
+class AdminLogRetention:
+    """
+    Service archiving admin logs older than the retention period
+
+    Logs are kept for at least ADMIN_LOG_RETENTION_DAYS; whole months older
+    than that are written to gzip-compressed JSON Lines files, one file per
+    month and run, and then removed. On MySQL a month is removed by
+    dropping its partition, and partitions for the coming months are added
+    ahead of time. On SQLite, which has no partitions, archived rows are
+    deleted in batches, each its own short transaction.
+
+    A month's file is complete and on disk before any of its rows are
+    removed, so an interrupted run at worst archives some rows twice.
+    Activity rollups are left alone, so activity stats keep covering
+    archived months.
+    """
+    def __init__(
+        self,
+        db: AsyncSession,
+        archive_dir: Optional[str] = None,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.db = db
+        self.archive_dir = archive_dir or settings.ADMIN_LOG_ARCHIVE_DIR
+        self.retention_days = retention_days if retention_days is not None else settings.ADMIN_LOG_RETENTION_DAYS
+        self.batch_size = batch_size or settings.ADMIN_LOG_ARCHIVE_BATCH_SIZE
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Archive and remove every whole month older than the retention period
+
+        Returns the number of rows archived and the archive files written
+        """
+        cutoff = month_start(datetime.utcnow() - timedelta(days=self.retention_days))
+        summary: Dict[str, Any] = {"archived": 0, "files": []}
+
+        if self.db.get_bind().dialect.name == "mysql":
+            # One run at a time across service processes; the lock is held
+            # on its own connection, as the session's is returned on commit
+            async with self.db.bind.connect() as lock_connection:
+                locked = await lock_connection.scalar(text("SELECT GET_LOCK('admin_log_retention', 0)"))
+                if not locked:
+                    return summary
+                try:
+                    partitions = await self._partitions()
+                    if partitions:
+                        await self._archive_partitions(partitions, cutoff, summary)
+                        await self._add_partitions(partitions)
+                    else:
+                        await self._archive_rows(cutoff, summary)
+                finally:
+                    await lock_connection.execute(text("SELECT RELEASE_LOCK('admin_log_retention')"))
+        else:
+            await self._archive_rows(cutoff, summary)
+
+        return summary
+
+    async def _partitions(self) -> List[str]:
+        """
+        Get the names of admin_logs' partitions, oldest first
+        """
+        result = await self.db.execute(_PARTITIONS_QUERY)
+        return list(result.scalars().all())
+
+    async def _archive_partitions(self, partitions: List[str], cutoff: date, summary: Dict[str, Any]) -> None:
+        """
+        Archive and drop the monthly partitions of months before cutoff
+        """
+        for name in partitions:
+            if name == MAX_PARTITION or partition_month(name) >= cutoff:
+                continue
+
+            await self._archive_month(partition_month(name), summary)
+
+            # DDL commits on MySQL, so the export's reads are done by now
+            await self.db.execute(text(f"ALTER TABLE admin_logs DROP PARTITION {name}"))
+
+    async def _add_partitions(self, partitions: List[str]) -> None:
+        """
+        Split monthly partitions off pmax up to ADMIN_LOG_FUTURE_PARTITIONS months ahead
+        """
+        months = [partition_month(name) for name in partitions if name != MAX_PARTITION]
+        last_month = add_months(month_start(datetime.utcnow()), settings.ADMIN_LOG_FUTURE_PARTITIONS)
+        first_month = add_months(max(months), 1) if months else month_start(datetime.utcnow())
+        if first_month > last_month or MAX_PARTITION not in partitions:
+            return
+
+        definitions = monthly_partitions(first_month, last_month)
+        definitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+        await self.db.execute(text(
+            f"ALTER TABLE admin_logs REORGANIZE PARTITION {MAX_PARTITION} INTO ({', '.join(definitions)})"
+        ))
+
+    async def _archive_rows(self, cutoff: date, summary: Dict[str, Any]) -> None:
+        """
+        Archive the rows of each month before cutoff, then delete them in batches
+        """
+        oldest = await self.db.scalar(
+            select(_admin_logs.c.created_at)
+            .where(_admin_logs.c.created_at < datetime.combine(cutoff, datetime.min.time()))
+            .order_by(_admin_logs.c.created_at)
+            .limit(1)
+        )
+        if oldest is None:
+            return
+
+        month = month_start(oldest)
+        while month < cutoff:
+            last_id = await self._archive_month(month, summary)
+            if last_id is not None:
+                await self._delete_month(month, last_id)
+            month = add_months(month, 1)
+
+    async def _archive_month(self, month: date, summary: Dict[str, Any]) -> Optional[int]:
+        """
+        Write a month's logs to a gzip JSONL file, reading them in ID order
+        one batch at a time
+
+        Returns the highest ID archived, or None if the month had no logs
+        """
+        start = datetime.combine(month, datetime.min.time())
+        end = datetime.combine(add_months(month, 1), datetime.min.time())
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(
+            self.archive_dir,
+            f"admin_logs-{month.strftime('%Y-%m')}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.jsonl.gz"
+        )
+
+        archive = await asyncio.to_thread(gzip.open, path + ".tmp", "wb")
+        last_id = None
+        count = 0
+        try:
+            while True:
+                query = (
+                    select(_admin_logs)
+                    .where(
+                        _admin_logs.c.created_at >= start,
+                        _admin_logs.c.created_at < end
+                    )
+                    .order_by(_admin_logs.c.id)
+                    .limit(self.batch_size)
+                )
+                if last_id is not None:
+                    query = query.where(_admin_logs.c.id > last_id)
+
+                rows = (await self.db.execute(query)).mappings().all()
+                if not rows:
+                    break
+
+                lines = "".join(json.dumps(dict(row), default=str) + "\n" for row in rows)
+                await asyncio.to_thread(archive.write, lines.encode("utf-8"))
+                last_id = rows[-1]["id"]
+                count += len(rows)
+
+            await asyncio.to_thread(self._close_archive, archive)
+        except BaseException:
+            await asyncio.to_thread(archive.close)
+            os.remove(path + ".tmp")
+            raise
+
+        if count == 0:
+            os.remove(path + ".tmp")
+            return None
+
+        os.replace(path + ".tmp", path)
+        summary["archived"] += count
+        summary["files"].append(path)
+        return last_id
+
+    async def _delete_month(self, month: date, last_id: int) -> None:
+        """
+        Delete a month's archived logs in batches, committing each batch
+        """
+        params = {
+            "start": datetime.combine(month, datetime.min.time()),
+            "end": datetime.combine(add_months(month, 1), datetime.min.time()),
+            "last_id": last_id,
+            "batch_size": self.batch_size
+        }
+        statement = _DELETE_ARCHIVED
+        if self.db.get_bind().dialect.name == "mysql":
+            statement = _MYSQL_DELETE_ARCHIVED
+
+        while True:
+            result = await self.db.execute(statement, params)
+            await self.db.commit()
+            if result.rowcount < self.batch_size:
+                break
+
+    @staticmethod
+    def _close_archive(archive) -> None:
+        """
+        Finish a gzip archive and flush it to disk
+        """
+        archive.close()
+        with open(archive.name, "rb") as written:
+            os.fsync(written.fileno())
@@ -1,9 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, text
 from typing import Optional, List, Dict, Any, Tuple
 
+from common.utils import geohash
+from common.utils.entity_counts import adjust_count
+from common.utils.geo_cache import bump_cell_versions
+from common.utils.shop_documents import set_shop_text, remove_shop_documents
+
 # Import shop model from seller service
 # In a real implementation, this would be an API call to the seller service
 # For simplicity, we're simulating direct database access
@@ -57,8 +62,8 @@ class AdminShopService:
         """
         Get shop by ID
         """
-        query = f"SELECT * FROM shops WHERE id = {shop_id}"
-        result = await self.db.execute(query)
+        query = text("SELECT * FROM shops WHERE id = :shop_id")
+        result = await self.db.execute(query, {"shop_id": shop_id})
         shop_data = result.mappings().first()
         
         if shop_data:
@@ -81,27 +86,40 @@ class AdminShopService:
         
         # Build update query
         update_parts = []
+        params = {"shop_id": shop_id}
         for key, value in shop_data.items():
             if key in ["name", "description", "whatsapp_number", "address", "latitude", "longitude", "image_url", "banner_url", "is_active"]:
-                if value is None:
-                    update_parts.append(f"{key} = NULL")
-                elif isinstance(value, bool):
-                    update_parts.append(f"{key} = {1 if value else 0}")
-                elif isinstance(value, (int, float)):
-                    update_parts.append(f"{key} = {value}")
-                else:
-                    update_parts.append(f"{key} = '{value}'")
+                update_parts.append(f"{key} = :{key}")
+                params[key] = value
         
         if not update_parts:
             return shop
         
+        # Re-index a moved shop under the cell of its new location
+        if "latitude" in params or "longitude" in params:
+            update_parts.append("geohash = :geohash")
+            params["geohash"] = geohash.encode(
+                params.get("latitude", shop["latitude"]),
+                params.get("longitude", shop["longitude"])
+            )
+        
         # Execute update
-        update_query = f"UPDATE shops SET {', '.join(update_parts)} WHERE id = {shop_id}"
-        await self.db.execute(update_query)
+        update_query = text(f"UPDATE shops SET {', '.join(update_parts)} WHERE id = :shop_id")
+        await self.db.execute(update_query, params)
         
         # Get updated shop
         updated_shop = await self.get_shop_by_id(shop_id)
         
+        # Keep the shop's search document in sync
+        if "name" in shop_data or "description" in shop_data:
+            await set_shop_text(self.db, shop_id, updated_shop["name"], updated_shop["description"])
+        
+        # Refresh cached nearby results around the old and new location
+        await bump_cell_versions(
+            self.db,
+            [(shop["latitude"], shop["longitude"]), (updated_shop["latitude"], updated_shop["longitude"])]
+        )
+        
         return updated_shop
     
     async def delete_shop(self, shop_id: int) -> bool:
@@ -114,7 +132,10 @@ class AdminShopService:
             raise Exception(f"Shop with ID {shop_id} not found")
         
         # Execute delete
-        delete_query = f"DELETE FROM shops WHERE id = {shop_id}"
-        await self.db.execute(delete_query)
+        delete_query = text("DELETE FROM shops WHERE id = :shop_id")
+        result = await self.db.execute(delete_query, {"shop_id": shop_id})
+        await adjust_count(self.db, "shops", -result.rowcount)
+        await remove_shop_documents(self.db, [shop_id])
+        await bump_cell_versions(self.db, [(shop["latitude"], shop["longitude"])])
         
         return True
@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, text
 from typing import Optional, List, Dict, Any, Tuple
 
+from common.utils.entity_counts import adjust_count
+
 # Import user model from user service
 # In a real implementation, this would be an API call to the user service
 # For simplicity, we're simulating direct database access
@@ -118,7 +120,8 @@ class AdminUserService:
             raise Exception(f"User with ID {user_id} not found")
         
         # Execute delete
-        delete_query = f"DELETE FROM users WHERE id = {user_id}"
-        await self.db.execute(delete_query)
+        delete_query = text("DELETE FROM users WHERE id = :user_id")
+        result = await self.db.execute(delete_query, {"user_id": user_id})
+        await adjust_count(self.db, "users", -result.rowcount)
         
         return True
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 import uvicorn
+import asyncio
 import sys
 import os
 
@@ -13,9 +14,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.config.settings import get_settings
 from common.exceptions.http_exceptions import AppException, exception_handler
 from common.utils.logging import setup_logger
+from common.auth.jwt import verified_token_cache
+from common.database.session import async_session_factory
 
 # Import routers
 from services.catalog_service.routers import catalog, categories
+from services.catalog_service.services.search_index import catalog_search_index
+from services.catalog_service.services.autocomplete import catalog_autocomplete
 
 # Get settings
 settings = get_settings()
@@ -49,6 +54,38 @@ app.add_exception_handler(AppException, exception_handler)
 app.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
 app.include_router(categories.router, prefix="/categories", tags=["Categories"])
 
+# Build the catalog search and autocomplete indexes at startup and refresh them
+# periodically, so writes made by other processes (other workers, the seed
+# script, shop changes in the seller service) show up
+async def rebuild_search_indexes():
+    async with async_session_factory() as session:
+        await catalog_search_index.rebuild(session)
+        await catalog_autocomplete.rebuild(session)
+    logger.info(f"Catalog search index built: {catalog_search_index.stats()}")
+    logger.info(f"Catalog autocomplete index built: {catalog_autocomplete.stats()}")
+
+async def refresh_search_indexes():
+    while True:
+        await asyncio.sleep(settings.CATALOG_INDEX_REFRESH_SECONDS)
+        try:
+            await rebuild_search_indexes()
+        except Exception as e:
+            logger.error(f"Error refreshing catalog search indexes: {str(e)}")
+
+@app.on_event("startup")
+async def startup():
+    try:
+        await rebuild_search_indexes()
+    except Exception as e:
+        # Search falls back to database queries until the index is built
+        logger.error(f"Error building catalog search indexes: {str(e)}")
+    
+    app.state.search_index_refresher = asyncio.create_task(refresh_search_indexes())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.search_index_refresher.cancel()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -59,6 +96,14 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Token verification cache metrics endpoint
+@app.get("/token-cache-stats")
+async def get_token_cache_stats():
+    """
+    Get hit/miss counters of the verified token caches
+    """
+    return {"jwt": verified_token_cache.stats()}
+
 # Custom OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.database.session import get_db
 from common.auth.jwt import get_current_user
+from common.database.pagination import TotalMode
 from common.exceptions.http_exceptions import ResourceNotFoundException, UnauthorizedException
 
 # Import schemas and services
@@ -17,9 +18,11 @@ from services.catalog_service.schemas.catalog import (
     CatalogItemUpdate, 
     CatalogItemResponse, 
     CatalogItemWithCategoryResponse,
-    CatalogSearchResponse
+    CatalogSearchResponse,
+    AutocompleteResponse
 )
 from services.catalog_service.services.catalog_service import CatalogService
+from services.catalog_service.services.autocomplete import catalog_autocomplete
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -49,6 +52,7 @@ async def get_catalog_items(
     brand: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    total: TotalMode = Query(TotalMode.EXACT, description="How to compute the total: exact, estimated or none"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -60,17 +64,20 @@ async def get_catalog_items(
     offset = (page - 1) * page_size
     
     # Get catalog items
-    items, total = await catalog_service.get_catalog_items(
+    result = await catalog_service.get_catalog_items(
         query=query,
         category_id=category_id,
         brand=brand,
         skip=offset,
-        limit=page_size
+        limit=page_size,
+        total_mode=total
     )
     
     return {
-        "items": items,
-        "total": total,
+        "items": result.items,
+        "total": result.total,
+        "total_exact": result.total_exact,
+        "has_more": result.has_more,
         "page": page,
         "page_size": page_size,
         "query": query
@@ -81,6 +88,7 @@ async def search_catalog(
     query: str = Query(..., min_length=2),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    total: TotalMode = Query(TotalMode.EXACT, description="How to compute the total: exact, estimated or none"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -92,20 +100,43 @@ async def search_catalog(
     offset = (page - 1) * page_size
     
     # Search catalog items
-    items, total = await catalog_service.search_catalog_items(
+    result = await catalog_service.search_catalog_items(
         query=query,
         skip=offset,
-        limit=page_size
+        limit=page_size,
+        total_mode=total
     )
     
     return {
-        "items": items,
-        "total": total,
+        "items": result.items,
+        "total": result.total,
+        "total_exact": result.total_exact,
+        "has_more": result.has_more,
         "page": page,
         "page_size": page_size,
         "query": query
     }
 
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete(
+    query: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Suggest catalog item names, brands, categories and shop names starting with query
+    
+    Served from an in-memory prefix index; the database is only read if the
+    index has not been built yet.
+    """
+    if not catalog_autocomplete.ready:
+        await catalog_autocomplete.rebuild(db)
+    
+    return {
+        "query": query,
+        "suggestions": catalog_autocomplete.suggest(query, limit)
+    }
+
 @router.get("/{item_id}", response_model=CatalogItemWithCategoryResponse)
 async def get_catalog_item(
     item_id: int = Path(..., gt=0),
@@ -68,12 +68,31 @@ class CatalogSearchResponse(BaseModel):
     Schema for catalog search response
     """
     items: List[CatalogItemWithCategoryResponse]
-    total: int
+    total: Optional[int] = None  # Not computed when total=none was requested
+    total_exact: bool = True  # False if total is estimated from statistics or a cached count
+    has_more: bool = False
     page: int
     page_size: int
     query: Optional[str] = None
 
 
+class AutocompleteSuggestion(BaseModel):
+    """
+    Schema for a single autocomplete suggestion
+    """
+    text: str
+    type: str  # item, brand, category or shop
+    count: int  # Number of items, categories or shops sharing this text
+
+
+class AutocompleteResponse(BaseModel):
+    """
+    Schema for autocomplete response
+    """
+    query: str
+    suggestions: List[AutocompleteSuggestion]
+
+
 # Import CategoryResponse to avoid circular import issues
 from .category import CategoryResponse
 CatalogItemWithCategoryResponse.update_forward_refs()
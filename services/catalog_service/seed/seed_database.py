@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.category import Category
 from models.catalog import CatalogItem
 from common.database.session import async_session_factory
+from common.utils.entity_counts import adjust_count
 from seed.seed_data import generate_seed_data
 
 async def seed_database():
@@ -52,6 +53,7 @@ async def seed_database():
         
         # Seed catalog items
         print(f"Seeding {len(catalog_items)} catalog items...")
+        created_items = 0
         
         for item_data in catalog_items:
             # Check if item already exists
@@ -75,8 +77,12 @@ async def seed_database():
                 session.add(item)
                 await session.flush()
                 await session.refresh(item)
+                created_items += 1
                 print(f"Created catalog item: {item.name}")
         
+        # Count the new items with them, as CatalogService does
+        await adjust_count(session, "catalog_items", created_items)
+        
         # Commit catalog items
         await session.commit()
     
@@ -0,0 +1,292 @@
+import bisect
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from services.catalog_service.models.catalog import CatalogItem
+from services.catalog_service.models.category import Category
+from services.catalog_service.services.search_index import tokenize
+from common.config.settings import get_settings
+from common.utils.cache import TTLCache
+
+settings = get_settings()
+
+# Suggestion types
+ITEM = "item"
+BRAND = "brand"
+CATEGORY = "category"
+SHOP = "shop"
+
+# Ranges of matching keys up to this size are ranked by a full sort
+_FULL_SORT_SIZE = 256
+
+# Field limits of packed key scores
+_MAX_COUNT = (1 << 24) - 1
+_MAX_LENGTH = (1 << 16) - 1
+
+
+def normalize(phrase: Optional[str]) -> str:
+    """
+    Normalize a phrase or prefix to lowercase words separated by single spaces
+    """
+    return " ".join(tokenize(phrase))
+
+
+class CatalogAutocomplete:
+    """
+    Prefix index of catalog item names, brands, category names and shop names
+
+    Every suggestion phrase is stored under one sorted key per word it has,
+    the phrase from that word on, so "gal" finds "Samsung Galaxy S21" as well
+    as "Galaxy Buds". The keys starting with a prefix are one contiguous range
+    found by bisection. Phrases shared by several sources (a brand used by
+    many items) are counted, and a NumPy array parallel to the keys holds each
+    key's packed rank, so the best keys of even a large range are picked with
+    one argpartition instead of a Python loop. Results are cached per prefix
+    until the index next changes.
+    """
+    def __init__(self, cache_entries: int, cache_ttl_seconds: float):
+        self._keys: List[Tuple[str, str, str]] = []  # (key, type, phrase)
+        self._scores = np.empty(0, dtype=np.int64)  # Rank of each key, lower is better
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._display: Dict[Tuple[str, str], str] = {}
+        self._sources: Dict[Hashable, List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._cache = TTLCache(max_entries=cache_entries, ttl_seconds=cache_ttl_seconds)
+        self.ready = False
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild the index from catalog items, categories and shops
+        """
+        sources: Dict[Hashable, List[Tuple[str, Optional[str]]]] = {}
+
+        items = await db.execute(select(CatalogItem.id, CatalogItem.name, CatalogItem.brand))
+        for item_id, name, brand in items.all():
+            sources[(ITEM, item_id)] = [(ITEM, name), (BRAND, brand)]
+
+        categories = await db.execute(select(Category.id, Category.name))
+        for category_id, name in categories.all():
+            sources[(CATEGORY, category_id)] = [(CATEGORY, name)]
+
+        # Shops live in the seller service's table of the same database
+        shops = await db.execute(text("SELECT id, name FROM shops"))
+        for shop_id, name in shops.all():
+            sources[(SHOP, shop_id)] = [(SHOP, name)]
+
+        fresh = CatalogAutocomplete(0, 0)
+        for source, phrases in sources.items():
+            fresh._add_source(source, phrases, sort_keys=False)
+        fresh._keys.sort()
+        scores = np.fromiter(
+            (fresh._score(key) for key in fresh._keys),
+            dtype=np.int64,
+            count=len(fresh._keys)
+        )
+
+        # Swap in the new index at once so lookups never see a partial build
+        with self._lock:
+            self._keys = fresh._keys
+            self._scores = scores
+            self._counts = fresh._counts
+            self._display = fresh._display
+            self._sources = fresh._sources
+            self.ready = True
+        self._cache.clear()
+
+    def set_item(self, item: Any) -> None:
+        """
+        Index a catalog item's name and brand, replacing any previous entry for it
+        """
+        self._set_source((ITEM, item.id), [(ITEM, item.name), (BRAND, item.brand)])
+
+    def remove_item(self, item_id: int) -> None:
+        """
+        Remove a catalog item's name and brand
+        """
+        self._set_source((ITEM, item_id), [])
+
+    def set_category(self, category: Any) -> None:
+        """
+        Index a category name, replacing any previous entry for it
+        """
+        self._set_source((CATEGORY, category.id), [(CATEGORY, category.name)])
+
+    def remove_category(self, category_id: int) -> None:
+        """
+        Remove a category name
+        """
+        self._set_source((CATEGORY, category_id), [])
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get up to limit suggestions starting with prefix, best first
+
+        Phrases that start with the prefix rank above phrases where only a
+        later word does; then more common phrases rank first, then shorter.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        cache_key = (prefix, limit)
+        suggestions = self._cache.get(cache_key)
+        if suggestions is not None:
+            return suggestions
+
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (prefix,))
+            end = bisect.bisect_left(self._keys, (prefix + "\uffff",))
+            suggestions = []
+            seen = set()
+            for position in self._best_positions(start, end, limit):
+                _, kind, phrase = self._keys[position]
+                phrase_key = (kind, phrase)
+                if phrase_key in seen:
+                    continue
+
+                seen.add(phrase_key)
+                suggestions.append({
+                    "text": self._display[phrase_key],
+                    "type": kind,
+                    "count": self._counts[phrase_key]
+                })
+                if len(suggestions) == limit:
+                    break
+
+        self._cache.set(cache_key, suggestions)
+        return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index size and cache counters
+        """
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "phrases": len(self._counts),
+                "keys": len(self._keys),
+                "cache": self._cache.stats()
+            }
+
+    def _best_positions(self, start: int, end: int, limit: int) -> List[int]:
+        """
+        Get positions in [start, end) of the best-ranked keys, best first
+
+        Returns enough positions for limit distinct phrases (a phrase can have
+        several keys in the range), or all of them if the range is small.
+        """
+        size = end - start
+        if size <= _FULL_SORT_SIZE:
+            positions = range(start, end)
+        else:
+            # A phrase has at most one key per word, so limit phrases need at
+            # most limit * words keys; take a generous slice and fall back to
+            # the whole range if it still holds too few distinct phrases
+            wanted = min(size, limit * 8)
+            candidates = np.argpartition(self._scores[start:end], wanted - 1)[:wanted] + start
+            positions = candidates.tolist()
+            if len({self._keys[position][1:] for position in positions}) < limit:
+                positions = range(start, end)
+
+        return sorted(positions, key=lambda position: (self._scores[position], self._keys[position][2]))
+
+    def _score(self, key: Tuple[str, str, str]) -> int:
+        """
+        Pack the rank of a key into an integer: not-at-start, -count, length
+        """
+        text, kind, phrase = key
+        count = min(self._counts[(kind, phrase)], _MAX_COUNT)
+        return (
+            (0 if text == phrase else 1) << 40
+            | (_MAX_COUNT - count) << 16
+            | min(len(phrase), _MAX_LENGTH)
+        )
+
+    def _set_source(self, source: Hashable, phrases: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Replace the phrases contributed by a source and drop cached suggestions
+        """
+        with self._lock:
+            self._add_source(source, phrases)
+        self._cache.clear()
+
+    def _add_source(
+        self,
+        source: Hashable,
+        phrases: List[Tuple[str, Optional[str]]],
+        sort_keys: bool = True
+    ) -> None:
+        """
+        Replace the phrases contributed by a source; the caller holds the lock
+
+        With sort_keys false, new keys are appended and the caller sorts them
+        and computes their scores.
+        """
+        for phrase_key in self._sources.pop(source, []):
+            self._counts[phrase_key] -= 1
+            if self._counts[phrase_key] == 0:
+                del self._counts[phrase_key]
+                del self._display[phrase_key]
+                for key in self._keys_for(phrase_key):
+                    position = bisect.bisect_left(self._keys, key)
+                    if position < len(self._keys) and self._keys[position] == key:
+                        del self._keys[position]
+                        self._scores = np.delete(self._scores, position)
+            elif sort_keys:
+                self._rescore(phrase_key)
+
+        phrase_keys = []
+        for kind, display in phrases:
+            phrase = normalize(display)
+            if not phrase:
+                continue
+
+            phrase_key = (kind, phrase)
+            phrase_keys.append(phrase_key)
+            if phrase_key in self._counts:
+                self._counts[phrase_key] += 1
+                if sort_keys:
+                    self._rescore(phrase_key)
+                continue
+
+            self._counts[phrase_key] = 1
+            self._display[phrase_key] = display.strip()
+            for key in self._keys_for(phrase_key):
+                if sort_keys:
+                    position = bisect.bisect_left(self._keys, key)
+                    self._keys.insert(position, key)
+                    self._scores = np.insert(self._scores, position, self._score(key))
+                else:
+                    self._keys.append(key)
+
+        if phrase_keys:
+            self._sources[source] = phrase_keys
+
+    def _rescore(self, phrase_key: Tuple[str, str]) -> None:
+        """
+        Update the scores of a phrase's keys after its count changed
+        """
+        for key in self._keys_for(phrase_key):
+            position = bisect.bisect_left(self._keys, key)
+            self._scores[position] = self._score(key)
+
+    @staticmethod
+    def _keys_for(phrase_key: Tuple[str, str]) -> List[Tuple[str, str, str]]:
+        """
+        Get the sorted-array keys of a phrase: the phrase from each word on
+        """
+        kind, phrase = phrase_key
+        words = phrase.split(" ")
+        return [(" ".join(words[index:]), kind, phrase) for index in range(len(words))]
+
+
+# Shared catalog autocomplete index
+catalog_autocomplete = CatalogAutocomplete(
+    cache_entries=settings.AUTOCOMPLETE_CACHE_MAX_ENTRIES,
+    cache_ttl_seconds=settings.AUTOCOMPLETE_CACHE_TTL_SECONDS
+)
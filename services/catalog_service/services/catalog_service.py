@@ -1,11 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_, func
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
 from typing import Optional, List, Dict, Any, Tuple
 
 from services.catalog_service.models.catalog import CatalogItem
 from services.catalog_service.models.category import Category
+from services.catalog_service.services.search_index import catalog_search_index
+from services.catalog_service.services.autocomplete import catalog_autocomplete
+from common.database.pagination import Page, TotalMode, paginate
+from common.utils.after_commit import run_after_commit
+from common.utils.catalog_loader import catalog_item_loader
+from common.utils.entity_counts import adjust_count
+from common.utils.shop_documents import refresh_documents_for_catalog_items
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
@@ -32,6 +40,9 @@ class CatalogService:
     ) -> CatalogItem:
         """
         Create a new catalog item
+        
+        The item is added to the search and autocomplete indexes once the
+        transaction commits, as are the changes of updates and deletes.
         """
         # Check if category exists
         category_query = select(Category).where(Category.id == category_id)
@@ -56,6 +67,8 @@ class CatalogService:
             self.db.add(catalog_item)
             await self.db.flush()
             await self.db.refresh(catalog_item)
+            await adjust_count(self.db, "catalog_items", 1)
+            run_after_commit(self.db, lambda: self._index_item(catalog_item))
             return catalog_item
         except IntegrityError as e:
             await self.db.rollback()
@@ -77,15 +90,16 @@ class CatalogService:
         category_id: Optional[int] = None,
         brand: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[CatalogItem], int]:
+        limit: int = 20,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page:
         """
         Get catalog items with optional filtering
         
-        Returns a tuple of (items, total_count)
+        Returns a Page of items; see paginate for how the total is computed
         """
         # Build query
-        stmt = select(CatalogItem)
+        stmt = select(CatalogItem).options(selectinload(CatalogItem.category))
         
         # Apply filters
         if query:
@@ -102,33 +116,73 @@ class CatalogService:
         if brand:
             stmt = stmt.where(CatalogItem.brand.ilike(f"%{brand}%"))
         
-        # Get total count
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar()
+        # Get the page, counting only if the total mode needs it
+        return await paginate(
+            self.db,
+            stmt.order_by(CatalogItem.id),
+            skip=skip,
+            limit=limit,
+            total_mode=total_mode,
+            table_name=CatalogItem.__tablename__
+        )
+    
+    async def search_catalog_items(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page:
+        """
+        Search catalog items by name, description, brand, or model
+        
+        Every word of the query must match the start of a word in one of those
+        fields. Matches and their count come from the in-memory search index,
+        so the total is always exact; only the requested page is loaded from
+        the database.
+        
+        Returns a Page of items
+        """
+        if not catalog_search_index.ready:
+            return await self._search_catalog_items_in_db(query, skip, limit, total_mode)
         
-        # Apply pagination
-        stmt = stmt.offset(skip).limit(limit)
+        item_ids = catalog_search_index.search(query)
+        page_ids = item_ids[skip:skip+limit]
+        items = await self.get_catalog_items_by_ids(page_ids)
+        
+        return Page(items, skip + limit < len(item_ids), len(item_ids), True)
+    
+    async def get_catalog_items_by_ids(self, item_ids: List[int]) -> List[CatalogItem]:
+        """
+        Get catalog items with their categories, in the order of item_ids
+        """
+        if not item_ids:
+            return []
         
-        # Execute query
+        stmt = (
+            select(CatalogItem)
+            .options(selectinload(CatalogItem.category))
+            .where(CatalogItem.id.in_(item_ids))
+        )
         result = await self.db.execute(stmt)
-        items = result.scalars().all()
+        items_by_id = {item.id: item for item in result.scalars().all()}
         
-        return list(items), total
+        return [items_by_id[item_id] for item_id in item_ids if item_id in items_by_id]
     
-    async def search_catalog_items(
+    async def _search_catalog_items_in_db(
         self,
         query: str,
         skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[CatalogItem], int]:
+        limit: int = 20,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page:
         """
-        Search catalog items by name, description, brand, or model
+        Search catalog items with substring matches in the database
         
-        Returns a tuple of (items, total_count)
+        Used until the search index has been built.
         """
         # Build query
-        stmt = select(CatalogItem).where(
+        stmt = select(CatalogItem).options(selectinload(CatalogItem.category)).where(
             or_(
                 CatalogItem.name.ilike(f"%{query}%"),
                 CatalogItem.description.ilike(f"%{query}%"),
@@ -137,19 +191,15 @@ class CatalogService:
             )
         )
         
-        # Get total count
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar()
-        
-        # Apply pagination
-        stmt = stmt.offset(skip).limit(limit)
-        
-        # Execute query
-        result = await self.db.execute(stmt)
-        items = result.scalars().all()
-        
-        return list(items), total
+        # Get the page, counting only if the total mode needs it
+        return await paginate(
+            self.db,
+            stmt.order_by(CatalogItem.id),
+            skip=skip,
+            limit=limit,
+            total_mode=total_mode,
+            table_name=CatalogItem.__tablename__
+        )
     
     async def update_catalog_item(
         self,
@@ -180,6 +230,9 @@ class CatalogService:
         try:
             await self.db.flush()
             await self.db.refresh(item)
+            run_after_commit(self.db, lambda: self._index_item(item))
+            if any(item_data.get(key) is not None for key in ("name", "brand", "category_id")):
+                await refresh_documents_for_catalog_items(self.db, [item_id])
             return item
         except IntegrityError as e:
             await self.db.rollback()
@@ -196,7 +249,28 @@ class CatalogService:
         try:
             await self.db.delete(item)
             await self.db.flush()
+            await adjust_count(self.db, "catalog_items", -1)
+            run_after_commit(self.db, lambda: self._unindex_item(item_id))
+            await refresh_documents_for_catalog_items(self.db, [item_id])
             return True
         except Exception as e:
             await self.db.rollback()
             raise DatabaseException(f"Error deleting catalog item: {str(e)}")
+    
+    @staticmethod
+    def _index_item(item: CatalogItem) -> None:
+        """
+        Put a committed item into the search and autocomplete indexes
+        """
+        catalog_search_index.add(item)
+        catalog_autocomplete.set_item(item)
+        catalog_item_loader.invalidate(item.id)
+    
+    @staticmethod
+    def _unindex_item(item_id: int) -> None:
+        """
+        Take a deleted item out of the search and autocomplete indexes
+        """
+        catalog_search_index.remove(item_id)
+        catalog_autocomplete.remove_item(item_id)
+        catalog_item_loader.invalidate(item_id)
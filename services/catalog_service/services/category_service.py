@@ -4,6 +4,9 @@ from sqlalchemy.exc import IntegrityError
 from typing import Optional, List, Dict, Any, Tuple
 
 from services.catalog_service.models.category import Category
+from services.catalog_service.services.autocomplete import catalog_autocomplete
+from common.utils.after_commit import run_after_commit
+from common.utils.shop_documents import refresh_documents_for_category
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
@@ -41,6 +44,7 @@ class CategoryService:
             self.db.add(category)
             await self.db.flush()
             await self.db.refresh(category)
+            run_after_commit(self.db, lambda: catalog_autocomplete.set_category(category))
             return category
         except IntegrityError as e:
             await self.db.rollback()
@@ -92,6 +96,9 @@ class CategoryService:
         try:
             await self.db.flush()
             await self.db.refresh(category)
+            run_after_commit(self.db, lambda: catalog_autocomplete.set_category(category))
+            if category_data.get("name") is not None:
+                await refresh_documents_for_category(self.db, category_id)
             return category
         except IntegrityError as e:
             await self.db.rollback()
@@ -108,6 +115,7 @@ class CategoryService:
         try:
             await self.db.delete(category)
             await self.db.flush()
+            run_after_commit(self.db, lambda: catalog_autocomplete.remove_category(category_id))
             return True
         except Exception as e:
             await self.db.rollback()
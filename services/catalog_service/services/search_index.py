@@ -0,0 +1,162 @@
+import bisect
+import re
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from services.catalog_service.models.catalog import CatalogItem
+
+# Catalog item fields covered by search
+INDEXED_FIELDS = ("name", "description", "brand", "model")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase word tokens
+    """
+    if not text:
+        return []
+
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class CatalogSearchIndex:
+    """
+    In-memory inverted index over catalog item text fields
+
+    Maps every token of an item's name, description, brand and model to the
+    IDs of the items containing it. Terms are also kept in a sorted list, so
+    the items for a token prefix are found by bisecting to the first matching
+    term and walking forward while terms still share the prefix.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._item_tokens: Dict[int, Set[str]] = {}
+        self._terms: List[str] = []
+        self._lock = threading.Lock()
+        self.ready = False
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild the index from the catalog_items table
+        """
+        columns = [getattr(CatalogItem, field) for field in INDEXED_FIELDS]
+        result = await db.execute(select(CatalogItem.id, *columns))
+
+        item_tokens = {
+            row[0]: self._tokens_for(dict(zip(INDEXED_FIELDS, row[1:])))
+            for row in result.all()
+        }
+        postings: Dict[str, Set[int]] = {}
+        for item_id, tokens in item_tokens.items():
+            for token in tokens:
+                postings.setdefault(token, set()).add(item_id)
+
+        # Swap in the new index at once so searches never see a partial build
+        with self._lock:
+            self._postings = postings
+            self._item_tokens = item_tokens
+            self._terms = sorted(postings)
+            self.ready = True
+
+    def add(self, item: Any) -> None:
+        """
+        Index a catalog item, replacing any previous entry for it
+        """
+        tokens = self._tokens_for({field: getattr(item, field) for field in INDEXED_FIELDS})
+
+        with self._lock:
+            self._remove(item.id)
+            self._item_tokens[item.id] = tokens
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    bisect.insort(self._terms, token)
+                postings.add(item.id)
+
+    def remove(self, item_id: int) -> None:
+        """
+        Remove a catalog item from the index
+        """
+        with self._lock:
+            self._remove(item_id)
+
+    def search(self, query: str) -> List[int]:
+        """
+        Get IDs of items matching every word of a query, in ascending order
+
+        Each query word matches any indexed token it is a prefix of.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        with self._lock:
+            # Intersect the rarest word's matches first to keep sets small
+            matches = sorted((self._prefix_matches(word) for word in set(words)), key=len)
+            result = set(matches[0])
+            for ids in matches[1:]:
+                if not result:
+                    break
+                result &= ids
+
+        return sorted(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index size counters
+        """
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "items": len(self._item_tokens),
+                "terms": len(self._terms)
+            }
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """
+        Get IDs of items with a token starting with prefix
+        """
+        ids: Set[int] = set()
+        position = bisect.bisect_left(self._terms, prefix)
+        while position < len(self._terms) and self._terms[position].startswith(prefix):
+            ids |= self._postings[self._terms[position]]
+            position += 1
+
+        return ids
+
+    def _remove(self, item_id: int) -> None:
+        """
+        Remove a catalog item from the index; the caller holds the lock
+        """
+        for token in self._item_tokens.pop(item_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[token]
+                position = bisect.bisect_left(self._terms, token)
+                if position < len(self._terms) and self._terms[position] == token:
+                    del self._terms[position]
+
+    @staticmethod
+    def _tokens_for(fields: Dict[str, Optional[str]]) -> Set[str]:
+        """
+        Get the set of tokens of an item's indexed fields
+        """
+        tokens: Set[str] = set()
+        for field in INDEXED_FIELDS:
+            tokens.update(tokenize(fields.get(field)))
+
+        return tokens
+
+
+# Shared catalog search index
+catalog_search_index = CatalogSearchIndex()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # Import common modules
 import sys
@@ -9,8 +9,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.database.session import get_db
 from common.auth.jwt import get_current_user
-from common.exceptions.http_exceptions import ResourceNotFoundException
+from common.exceptions.http_exceptions import ResourceNotFoundException, ValidationException
 from common.utils.geo import GeoService
+from common.utils.cursor import encode_cursor, decode_cursor
+from common.utils.geo_cache import shop_cell_cache
 
 # Import schemas and services
 from services.customer_service.schemas.shop import ShopSearchResponse, ShopDetailResponse, ShopWithProductsResponse
@@ -26,13 +28,58 @@ async def get_nearby_shops(
     location: LocationQuery,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    k: Optional[int] = Query(None, ge=1, le=100, description="Return only the k closest shops"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get shops near the specified location
+    
+    With k set, returns the k closest shops within the radius instead of a
+    page of all shops in the radius. With cursor set, returns the page
+    following the cursor and ignores page.
     """
     discovery_service = DiscoveryService(db)
+    location_dict = {
+        "latitude": location.latitude,
+        "longitude": location.longitude
+    }
+    
+    if k:
+        shops = await discovery_service.get_nearest_shops(
+            latitude=location.latitude,
+            longitude=location.longitude,
+            k=k,
+            max_radius_km=location.radius
+        )
+        
+        return {
+            "shops": shops,
+            "total": len(shops),
+            "page": 1,
+            "page_size": k,
+            "location": location_dict
+        }
+    
+    if cursor:
+        # Fetch only the shops following the cursor
+        shops, next_key = await discovery_service.get_shops_near_location_after(
+            latitude=location.latitude,
+            longitude=location.longitude,
+            radius_km=location.radius,
+            after=_decode_distance_cursor(cursor),
+            limit=page_size
+        )
+        
+        return {
+            "shops": shops,
+            "total": None,
+            "page": page,
+            "page_size": page_size,
+            "location": location_dict,
+            "next_cursor": _encode_distance_cursor(next_key)
+        }
     
     # Calculate offset for pagination
     offset = (page - 1) * page_size
@@ -46,68 +93,169 @@ async def get_nearby_shops(
         limit=page_size
     )
     
+    next_key = None
+    if shops and offset + len(shops) < total:
+        next_key = discovery_service.distance_key(location.latitude, location.longitude, shops[-1])
+    
     return {
         "shops": shops,
         "total": total,
         "page": page,
         "page_size": page_size,
-        "location": {
-            "latitude": location.latitude,
-            "longitude": location.longitude
-        }
+        "location": location_dict,
+        "next_cursor": _encode_distance_cursor(next_key)
     }
 
+@router.get("/nearby/cache-stats", response_model=Dict[str, Any])
+async def get_nearby_cache_stats():
+    """
+    Get hit/miss counters of the nearby-shop geocell cache
+    """
+    return shop_cell_cache.stats()
+
 @router.get("/search", response_model=ShopSearchResponse)
 async def search_shops(
     query: str = Query(..., min_length=2),
     location: Optional[LocationQuery] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Search shops by name or products
+    
+    With a location, shops are ranked by a blend of text relevance and
+    distance, and total may be omitted when the search did not need to read
+    the whole radius. With cursor set, returns the page following the cursor
+    and ignores page.
     """
     discovery_service = DiscoveryService(db)
     
     # Calculate offset for pagination
     offset = (page - 1) * page_size
+    total = None
     
     # Search shops
     if location:
-        # Search with location filtering
-        shops, total = await discovery_service.search_shops_with_location(
-            query=query,
-            latitude=location.latitude,
-            longitude=location.longitude,
-            radius_km=location.radius,
-            skip=offset,
-            limit=page_size
-        )
-        
         location_dict = {
             "latitude": location.latitude,
             "longitude": location.longitude
         }
-    else:
-        # Search without location filtering
-        shops, total = await discovery_service.search_shops(
-            query=query,
-            skip=offset,
-            limit=page_size
-        )
         
+        if cursor:
+            # Fetch only the shops following the cursor
+            shops, next_key = await discovery_service.search_shops_with_location_after(
+                query=query,
+                latitude=location.latitude,
+                longitude=location.longitude,
+                radius_km=location.radius,
+                after=_decode_score_cursor(cursor),
+                limit=page_size
+            )
+        else:
+            # Search with location filtering, ranked by relevance and distance
+            shops, total, next_key = await discovery_service.search_shops_with_location(
+                query=query,
+                latitude=location.latitude,
+                longitude=location.longitude,
+                radius_km=location.radius,
+                skip=offset,
+                limit=page_size
+            )
+        
+        next_cursor = _encode_score_cursor(next_key)
+    else:
         location_dict = None
+        
+        if cursor:
+            # Fetch only the shops following the cursor
+            shops, next_key = await discovery_service.search_shops_after(
+                query=query,
+                after=_decode_relevance_cursor(cursor),
+                limit=page_size
+            )
+        else:
+            # Search without location filtering
+            shops, total = await discovery_service.search_shops(
+                query=query,
+                skip=offset,
+                limit=page_size
+            )
+            
+            next_key = None
+            if shops and offset + len(shops) < total:
+                next_key = (shops[-1]["relevance"], shops[-1]["id"])
+        
+        next_cursor = _encode_relevance_cursor(next_key)
     
     return {
         "shops": shops,
         "total": total,
         "page": page,
         "page_size": page_size,
-        "location": location_dict
+        "location": location_dict,
+        "next_cursor": next_cursor
     }
 
+def _encode_distance_cursor(key: Optional[Tuple[float, int]]) -> Optional[str]:
+    """
+    Encode a (distance, shop_id) keyset key as a cursor
+    """
+    if key is None:
+        return None
+    
+    return encode_cursor({"d": key[0], "id": key[1]})
+
+def _decode_distance_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by _encode_distance_cursor
+    """
+    values = decode_cursor(cursor)
+    try:
+        return float(values["d"]), int(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValidationException("Invalid pagination cursor")
+
+def _encode_relevance_cursor(key: Optional[Tuple[float, int]]) -> Optional[str]:
+    """
+    Encode a (relevance, shop_id) keyset key as a cursor
+    """
+    if key is None:
+        return None
+    
+    return encode_cursor({"r": key[0], "id": key[1]})
+
+def _decode_relevance_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by _encode_relevance_cursor
+    """
+    values = decode_cursor(cursor)
+    try:
+        return float(values["r"]), int(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValidationException("Invalid pagination cursor")
+
+def _encode_score_cursor(key: Optional[Tuple[float, int]]) -> Optional[str]:
+    """
+    Encode a (score, shop_id) keyset key as a cursor
+    """
+    if key is None:
+        return None
+    
+    return encode_cursor({"s": key[0], "id": key[1]})
+
+def _decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by _encode_score_cursor
+    """
+    values = decode_cursor(cursor)
+    try:
+        return float(values["s"]), int(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValidationException("Invalid pagination cursor")
+
 @router.get("/{shop_id}", response_model=ShopDetailResponse)
 async def get_shop_details(
     shop_id: int = Path(..., gt=0),
@@ -27,7 +27,9 @@ class ShopDistance(ShopBase):
     """
     Schema for shop with distance information
     """
-    distance: float  # Distance in kilometers
+    distance: Optional[float] = None  # Distance in kilometers, if a location was given
+    relevance: Optional[float] = None  # Text relevance, for searches
+    score: Optional[float] = None  # Blended relevance and closeness, for searches near a location
     
     class Config:
         from_attributes = True
@@ -38,10 +40,11 @@ class ShopSearchResponse(BaseModel):
     Schema for shop search response
     """
     shops: List[ShopDistance]
-    total: int
+    total: Optional[int] = None  # Not computed when paginating by cursor
     page: int
     page_size: int
-    location: Dict[str, float]  # Contains latitude and longitude
+    location: Optional[Dict[str, float]] = None  # Contains latitude and longitude
+    next_cursor: Optional[str] = None  # Pass as cursor to fetch the following page
 
 
 class ShopDetailResponse(ShopBase):
@@ -1,13 +1,62 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import text
 from typing import Optional, List, Dict, Any, Tuple
+import heapq
+import re
 import sys
 import os
 
 # Import common modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.utils.geo import GeoService
+from common.utils import geohash
+from common.utils.geo_cache import shop_cell_cache, read_cell_versions
+from common.utils.catalog_loader import catalog_item_loader
+from common.utils.cache import TTLCache
+from common.config.settings import get_settings
+from services.customer_service.services.geo_text_ranking import (
+    TEXT_FIRST,
+    choose_plan,
+    text_relevance,
+    blended_score,
+    score_bound
+)
+
+settings = get_settings()
+
+# Shop columns returned by discovery queries
+SHOP_COLUMNS = """id, user_id, name, description, whatsapp_number, 
+            address, latitude, longitude, image_url, banner_url,
+            created_at, updated_at"""
+
+# The same columns qualified with the shops table, for queries joining other tables
+_QUALIFIED_SHOP_COLUMNS = ", ".join(f"shops.{column.strip()}" for column in SHOP_COLUMNS.split(","))
+
+# Distances closer than this are treated as equal when comparing cursor keys
+_DISTANCE_EPSILON_KM = 1e-9
+
+# Relevance scores closer than this are treated as equal when comparing cursor keys
+_RELEVANCE_EPSILON = 1e-9
+
+# Blended scores closer than this are treated as equal when comparing cursor keys
+_SCORE_EPSILON = 1e-9
+
+# Words of a search query passed to the full-text index
+_SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+# InnoDB's default full-text stopwords, which its index leaves out
+_MYSQL_FT_STOPWORDS = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en",
+    "for", "from", "how", "i", "in", "is", "it", "la", "of", "on", "or",
+    "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www"
+))
+
+# Recent capped counts of full-text matches, keyed by query words; they do
+# not depend on the location, so searches anywhere share them
+_text_match_counts = TTLCache(max_entries=4096, ttl_seconds=settings.SEARCH_PLANNER_CACHE_TTL_SECONDS)
 
 
 class DiscoveryService:
@@ -31,48 +80,388 @@ class DiscoveryService:
         
         Returns a tuple of (shops, total_count)
         """
-        # In a real implementation, this would use a spatial database query
-        # For now, we'll simulate by fetching all shops and filtering in memory
+        # Candidates come from the geocell cache or from SQL, pushing down the
+        # geohash cells and bounding box; only they are ranked by exact distance
+        candidates = await self._get_cached_candidate_shops(latitude, longitude, radius_km)
+        ranked = self._rank_by_distance(latitude, longitude, candidates, radius_km)
+        
+        # Apply pagination
+        return self._with_distance(ranked[skip:skip+limit]), len(ranked)
+    
+    async def get_shops_near_location_after(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float = 5.0,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Get the page of shops near a location following a (distance, shop_id) key
         
-        # This is a simplified implementation that would call the seller service
-        # to get shop data. In a real microservices architecture, this would be
-        # an API call to the seller service.
+        Returns a tuple of (shops, next_key); next_key is None on the last page
+        """
+        ranked = await self._get_nearest(latitude, longitude, limit + 1, radius_km, after=after)
+        return self._keyset_page(ranked, limit)
+    
+    async def _get_cached_candidate_shops(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Get candidate shops for a nearby query through the geocell cache
         
-        # Simulate fetching shops from seller service
-        query = """
+        On a miss, loads every shop that could be near any point of the query's
+        geohash cell, so neighbouring customers share the cached entry. The
+        area's cell versions are read first, so a shop write committing while
+        the shops load leaves the entry stale rather than wrongly current.
+        """
+        slot = shop_cell_cache.cell_for(latitude, longitude, radius_km)
+        if slot is None:
+            return await self._get_candidate_shops(latitude, longitude, radius_km)
+        
+        versions = await read_cell_versions(self.db, slot.version_cells)
+        shops = shop_cell_cache.get(slot, versions)
+        if shops is None:
+            shops = await self._get_candidate_shops(slot.center_lat, slot.center_lon, slot.coverage_km)
+            shop_cell_cache.set(slot, versions, shops)
+        
+        # Copy so per-request distances are not written into cached shops
+        return [dict(shop) for shop in shops]
+    
+    async def _get_candidate_shops(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        exclude_boxes: Optional[List[Tuple[float, float, float, float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get shops inside the bounding box of the search circle
+        
+        The geohash cells let the database narrow the scan through the
+        geohash index; the latitude/longitude box trims the cells' corners.
+        Shops inside exclude_boxes are skipped, so callers can read only the
+        ring between two radii.
+        """
+        params: Dict[str, Any] = {}
+        query = text(f"""
         SELECT 
-            id, user_id, name, description, whatsapp_number, 
-            address, latitude, longitude, image_url, banner_url,
-            created_at, updated_at
+            {SHOP_COLUMNS}
         FROM shops
+        WHERE {self._area_conditions(latitude, longitude, radius_km, params, exclude_boxes)}
+        """)
+        result = await self.db.execute(query, params)
+        return [dict(shop) for shop in result.mappings().all()]
+    
+    def _area_conditions(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        params: Dict[str, Any],
+        exclude_boxes: Optional[List[Tuple[float, float, float, float]]] = None
+    ) -> str:
+        """
+        Build a SQL predicate matching shops inside the bounding box of a search circle
+        """
+        boxes = GeoService.bounding_boxes(latitude, longitude, radius_km)
+        conditions = [
+            f"({self._geohash_conditions(boxes, params)})",
+            f"({self._bounding_box_conditions(boxes, params)})"
+        ]
+        if exclude_boxes:
+            conditions.append(
+                f"NOT ({self._bounding_box_conditions(exclude_boxes, params, prefix='inner_')})"
+            )
+        
+        return " AND ".join(conditions)
+    
+    @staticmethod
+    def _geohash_conditions(
+        boxes: List[Tuple[float, float, float, float]],
+        params: Dict[str, Any]
+    ) -> str:
+        """
+        Build a SQL predicate matching shops in the geohash cells covering the boxes
+        """
+        conditions = []
+        for index, cell in enumerate(geohash.cover(boxes)):
+            lower, upper = geohash.prefix_range(cell)
+            params[f"cell_lo_{index}"] = lower
+            if upper is None:
+                conditions.append(f"geohash >= :cell_lo_{index}")
+            else:
+                params[f"cell_hi_{index}"] = upper
+                conditions.append(f"(geohash >= :cell_lo_{index} AND geohash < :cell_hi_{index})")
+        
+        return " OR ".join(conditions)
+    
+    @staticmethod
+    def _bounding_box_conditions(
+        boxes: List[Tuple[float, float, float, float]],
+        params: Dict[str, Any],
+        prefix: str = ""
+    ) -> str:
+        """
+        Build a SQL predicate matching shops inside the latitude/longitude boxes
+        """
+        conditions = []
+        for index, (min_lat, max_lat, min_lon, max_lon) in enumerate(boxes):
+            name = f"{prefix}{index}"
+            params.update({
+                f"min_lat_{name}": min_lat,
+                f"max_lat_{name}": max_lat,
+                f"min_lon_{name}": min_lon,
+                f"max_lon_{name}": max_lon
+            })
+            conditions.append(
+                f"(latitude BETWEEN :min_lat_{name} AND :max_lat_{name}"
+                f" AND longitude BETWEEN :min_lon_{name} AND :max_lon_{name})"
+            )
+        
+        return " OR ".join(conditions)
+    
+    def _text_matches(self, query: str, params: Dict[str, Any]) -> str:
+        """
+        Build a SQL query of (shop_id, relevance) for shops matching a search query
+        
+        Matches against shop search documents (see common.utils.shop_documents),
+        which hold the shop's name and description and the names, brands and
+        categories of the products it stocks, through their full-text index: a
+        FULLTEXT index on MySQL, the shop_search_fts FTS5 table on SQLite.
+        Every word of the query must match as a word or word prefix. Higher
+        relevance is better; on SQLite, shop text weighs twice product text.
+        
+        MySQL does not index words shorter than innodb_ft_min_token_size or
+        stopwords, and a required word it does not index matches nothing, so
+        such words are matched with LIKE instead, and a query of only such
+        words uses the LIKE fallback.
+        """
+        tokens = _SEARCH_TOKEN_PATTERN.findall(query.lower())
+        dialect = self.db.get_bind().dialect.name
+        
+        indexed = [
+            token for token in tokens
+            if len(token) >= settings.MYSQL_FT_MIN_TOKEN_SIZE and token not in _MYSQL_FT_STOPWORDS
+        ]
+        if indexed and dialect == "mysql":
+            params["fts_query"] = " ".join(f"+{token}*" for token in indexed)
+            conditions = "MATCH(shop_text, product_text) AGAINST (:fts_query IN BOOLEAN MODE)"
+            unindexed = [token for token in tokens if token not in indexed]
+            if unindexed:
+                conditions += f" AND {self._word_conditions(unindexed, params)}"
+            return f"""
+            SELECT shop_id,
+                   MATCH(shop_text, product_text) AGAINST (:fts_query IN BOOLEAN MODE) AS relevance
+            FROM shop_search_documents
+            WHERE {conditions}
+            """
+        
+        if tokens and dialect == "sqlite":
+            params["fts_query"] = " ".join(f'"{token}"*' for token in tokens)
+            return """
+            SELECT rowid AS shop_id, -bm25(shop_search_fts, 2.0, 1.0) AS relevance
+            FROM shop_search_fts
+            WHERE shop_search_fts MATCH :fts_query
+            """
+        
+        # No full-text index to use, or no word MySQL indexes: every word must
+        # start a word of the documents' space-separated lowercase words
+        if tokens:
+            return f"""
+            SELECT shop_id, 0.0 AS relevance
+            FROM shop_search_documents
+            WHERE {self._word_conditions(tokens, params)}
+            """
+        
+        # No words in the query: substring match
+        params["pattern"] = f"%{query.lower()}%"
+        return """
+            SELECT shop_id, 0.0 AS relevance
+            FROM shop_search_documents
+            WHERE shop_text LIKE :pattern OR product_text LIKE :pattern
+            """
+    
+    def _word_conditions(self, tokens: List[str], params: Dict[str, Any]) -> str:
+        """
+        Build SQL conditions, ANDed, that each word matches a search document
+        word or word prefix, as text_relevance requires
+        """
+        if self.db.get_bind().dialect.name == "mysql":
+            shop_text, product_text = "CONCAT(' ', shop_text)", "CONCAT(' ', product_text)"
+        else:
+            shop_text, product_text = "(' ' || shop_text)", "(' ' || product_text)"
+        
+        conditions = []
+        for index, token in enumerate(tokens):
+            # \w words hold no % but may hold _, which LIKE treats as a wildcard
+            params[f"word_{index}"] = "% " + token.replace("_", "!_") + "%"
+            conditions.append(
+                f"({shop_text} LIKE :word_{index} ESCAPE '!'"
+                f" OR {product_text} LIKE :word_{index} ESCAPE '!')"
+            )
+        
+        return " AND ".join(conditions)
+    
+    @staticmethod
+    def _is_after(distance: float, shop_id: int, after: Optional[Tuple[float, int]]) -> bool:
+        """
+        Check whether a (distance, shop_id) key sorts after a cursor key
+        
+        Distances within _DISTANCE_EPSILON_KM compare as equal, so a shop whose
+        distance is recomputed with a last-digit difference is not repeated.
+        """
+        if after is None:
+            return True
+        
+        after_distance, after_id = after
+        if abs(distance - after_distance) <= _DISTANCE_EPSILON_KM:
+            return shop_id > after_id
+        
+        return distance > after_distance
+    
+    def _rank_by_distance(
+        self,
+        latitude: float,
+        longitude: float,
+        shops: List[Dict[str, Any]],
+        radius_km: float,
+        after: Optional[Tuple[float, int]] = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Get (distance, shop) pairs within the radius, ordered by distance and shop ID
+        """
+        if not shops:
+            return []
+        
+        distances = GeoService.batch_distances(
+            latitude,
+            longitude,
+            [shop['latitude'] for shop in shops],
+            [shop['longitude'] for shop in shops]
+        ).tolist()
+        
+        ranked = [
+            (distance, shop)
+            for distance, shop in zip(distances, shops)
+            if distance <= radius_km and self._is_after(distance, shop['id'], after)
+        ]
+        ranked.sort(key=lambda pair: (pair[0], pair[1]['id']))
+        
+        return ranked
+    
+    @staticmethod
+    def _with_distance(ranked: List[Tuple[float, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Get shops from (distance, shop) pairs with a rounded 'distance' key added
+        """
+        shops = []
+        for distance, shop in ranked:
+            shop['distance'] = round(distance, 2)
+            shops.append(shop)
+        
+        return shops
+    
+    def _keyset_page(
+        self,
+        ranked: List[Tuple[float, Dict[str, Any]]],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Split limit + 1 ranked shops into a page and the key of its last shop
+        """
+        page = ranked[:limit]
+        next_key = None
+        if len(ranked) > limit:
+            last_distance, last_shop = page[-1]
+            next_key = (last_distance, last_shop['id'])
+        
+        return self._with_distance(page), next_key
+    
+    @staticmethod
+    def distance_key(latitude: float, longitude: float, shop: Dict[str, Any]) -> Tuple[float, int]:
+        """
+        Get the exact (distance, shop_id) keyset key of a shop
+        """
+        distance = GeoService.batch_distances(
+            latitude,
+            longitude,
+            [shop['latitude']],
+            [shop['longitude']]
+        )[0]
+        return float(distance), shop['id']
+    
+    async def get_nearest_shops(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        max_radius_km: float = 5.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the k shops closest to a location, within max_radius_km
+        """
+        ranked = await self._get_nearest(latitude, longitude, k, max_radius_km)
+        return self._with_distance(ranked)
+    
+    async def _get_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        max_radius_km: float,
+        after: Optional[Tuple[float, int]] = None,
+        initial_radius_km: float = 0.5
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Get up to k (distance, shop) pairs closest to a location, ordered by distance
+        
+        Searches rings of doubling radius outwards and keeps the k closest
+        shops seen so far in a bounded heap. Every shop within the current
+        radius has been seen once a ring is read, so the search stops as soon
+        as the k-th closest shop is no farther than that radius.
+        
+        With an after key, only shops sorting after it are considered, and the
+        area known to be nearer than the key's distance is not read at all.
         """
-        result = await self.db.execute(query)
-        shops_data = result.mappings().all()
+        # Max-heap of the k closest shops as (-distance, -id, shop)
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        exclude_boxes = None
+        radius = min(initial_radius_km, max_radius_km)
         
-        # Convert to list of dicts
-        shops = [dict(shop) for shop in shops_data]
+        if after is not None:
+            inner_box = GeoService.inscribed_box(latitude, longitude, after[0])
+            exclude_boxes = [inner_box] if inner_box else None
+            radius = min(after[0] + initial_radius_km, max_radius_km)
         
-        # Filter and sort by distance
-        if shops:
-            # Calculate distance for each shop
-            shops_with_distance = await self.geo_service.sort_by_distance(
-                reference_lat=latitude,
-                reference_lon=longitude,
-                locations=shops
+        while True:
+            ring = await self._get_candidate_shops(
+                latitude,
+                longitude,
+                radius,
+                exclude_boxes=exclude_boxes
             )
             
-            # Filter by radius
-            filtered_shops = [
-                shop for shop in shops_with_distance
-                if shop['distance'] <= radius_km
-            ]
+            for distance, shop in self._rank_by_distance(latitude, longitude, ring, max_radius_km, after):
+                entry = (-distance, -shop['id'], shop)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
             
-            # Apply pagination
-            paginated_shops = filtered_shops[skip:skip+limit]
+            if len(heap) == k and -heap[0][0] <= radius:
+                break
             
-            return paginated_shops, len(filtered_shops)
+            if radius >= max_radius_km:
+                break
+            
+            exclude_boxes = GeoService.bounding_boxes(latitude, longitude, radius)
+            radius = min(radius * 2, max_radius_km)
         
-        return [], 0
+        return [(-negative_distance, shop) for negative_distance, _, shop in sorted(heap, reverse=True)]
     
     async def search_shops(
         self,
@@ -83,32 +472,73 @@ class DiscoveryService:
         """
         Search shops by name or products
         
+        Shops are ordered by relevance, best first, and carry a 'relevance' key.
         Returns a tuple of (shops, total_count)
         """
-        # In a real implementation, this would use a full-text search
-        # For now, we'll simulate with a simple LIKE query
+        params: Dict[str, Any] = {"skip": skip, "limit": limit}
+        matches = self._text_matches(query, params)
+        
+        # Get total count
+        count_query = text(f"SELECT COUNT(*) FROM ({matches}) AS text_matches")
+        count_result = await self.db.execute(count_query, params)
+        total = count_result.scalar()
         
-        # Simulate fetching shops from seller service
-        sql_query = f"""
+        # Get only the requested page
+        sql_query = text(f"""
         SELECT 
-            id, user_id, name, description, whatsapp_number, 
-            address, latitude, longitude, image_url, banner_url,
-            created_at, updated_at
-        FROM shops
-        WHERE 
-            LOWER(name) LIKE LOWER('%{query}%') OR
-            LOWER(description) LIKE LOWER('%{query}%')
+            {SHOP_COLUMNS},
+            text_matches.relevance
+        FROM ({matches}) AS text_matches
+        JOIN shops ON shops.id = text_matches.shop_id
+        ORDER BY text_matches.relevance DESC, id
+        LIMIT :limit OFFSET :skip
+        """)
+        result = await self.db.execute(sql_query, params)
+        shops = [dict(shop) for shop in result.mappings().all()]
+        
+        return shops, total
+    
+    async def search_shops_after(
+        self,
+        query: str,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
         """
-        result = await self.db.execute(sql_query)
-        shops_data = result.mappings().all()
+        Get the page of shops matching a search query following a (relevance, shop_id) key
         
-        # Convert to list of dicts
-        shops = [dict(shop) for shop in shops_data]
+        Returns a tuple of (shops, next_key); next_key is None on the last page
+        """
+        params: Dict[str, Any] = {"limit": limit + 1}
+        after_condition = "1 = 1"
+        if after is not None:
+            # Relevance within _RELEVANCE_EPSILON counts as a tie, broken by ID
+            params.update({
+                "after_relevance_lo": after[0] - _RELEVANCE_EPSILON,
+                "after_relevance_hi": after[0] + _RELEVANCE_EPSILON,
+                "after_id": after[1]
+            })
+            after_condition = """(text_matches.relevance < :after_relevance_lo
+               OR (text_matches.relevance <= :after_relevance_hi AND id > :after_id))"""
         
-        # Apply pagination
-        paginated_shops = shops[skip:skip+limit]
+        sql_query = text(f"""
+        SELECT 
+            {SHOP_COLUMNS},
+            text_matches.relevance
+        FROM ({self._text_matches(query, params)}) AS text_matches
+        JOIN shops ON shops.id = text_matches.shop_id
+        WHERE {after_condition}
+        ORDER BY text_matches.relevance DESC, id
+        LIMIT :limit
+        """)
+        result = await self.db.execute(sql_query, params)
+        shops = [dict(shop) for shop in result.mappings().all()]
+        
+        next_key = None
+        if len(shops) > limit:
+            next_key = (shops[limit - 1]['relevance'], shops[limit - 1]['id'])
         
-        return paginated_shops, len(shops)
+        return shops[:limit], next_key
     
     async def search_shops_with_location(
         self,
@@ -118,51 +548,276 @@ class DiscoveryService:
         radius_km: float = 5.0,
         skip: int = 0,
         limit: int = 10
-    ) -> Tuple[List[Dict[str, Any]], int]:
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[Tuple[float, int]]]:
         """
-        Search shops by name or products with location filtering
+        Search shops by name or products near a location, best match first
         
-        Returns a tuple of (shops, total_count)
+        Shops are ranked by a blend of text relevance and closeness (see
+        geo_text_ranking) and carry 'distance', 'relevance' and 'score' keys.
+        Returns a tuple of (shops, total_count, next_key); total_count is None
+        when the search stopped before reading the whole radius, and next_key
+        is the (score, shop_id) key of the last shop, or None on the last page
         """
-        # Get search results
-        shops, _ = await self.search_shops(query=query)
+        ranked, total, has_more = await self._search_near(
+            query, latitude, longitude, radius_km, skip + limit
+        )
+        page = ranked[skip:skip+limit]
+        next_key = (page[-1][0], page[-1][1]['id']) if page and has_more else None
         
-        # Filter and sort by distance
-        if shops:
-            # Calculate distance for each shop
-            shops_with_distance = await self.geo_service.sort_by_distance(
-                reference_lat=latitude,
-                reference_lon=longitude,
-                locations=shops
-            )
-            
-            # Filter by radius
-            filtered_shops = [
-                shop for shop in shops_with_distance
-                if shop['distance'] <= radius_km
-            ]
-            
-            # Apply pagination
-            paginated_shops = filtered_shops[skip:skip+limit]
-            
-            return paginated_shops, len(filtered_shops)
+        return self._with_score(page), total, next_key
+    
+    async def search_shops_with_location_after(
+        self,
+        query: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float = 5.0,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Get the page of matching shops near a location following a (score, shop_id) key
+        
+        Returns a tuple of (shops, next_key); next_key is None on the last page
+        """
+        ranked, _, has_more = await self._search_near(
+            query, latitude, longitude, radius_km, limit, after=after
+        )
+        next_key = (ranked[-1][0], ranked[-1][1]['id']) if ranked and has_more else None
         
-        return [], 0
+        return self._with_score(ranked), next_key
+    
+    async def _search_near(
+        self,
+        query: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        count: int,
+        after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Tuple[float, Dict[str, Any]]], Optional[int], bool]:
+        """
+        Get the count best (score, shop) pairs of a search near a location
+        
+        The plan follows capped counts of the shops matching the text and of
+        the shops in the area. A query matching fewer shops than the area
+        holds is driven from the full-text index and filtered by distance.
+        Otherwise shops are read from the geohash index in rings outwards
+        from the location and filtered by text, stopping once no farther
+        shop can outscore the count best found. Both plans score shops the
+        same way. Shops not sorting after an after key are skipped.
+        
+        Returns (pairs, total_count, has_more); total_count is None if the
+        search stopped before reading the whole radius.
+        """
+        tokens = _SEARCH_TOKEN_PATTERN.findall(query.lower())
+        if not tokens:
+            return [], 0, False
+        
+        sample_size = settings.SEARCH_PLANNER_SAMPLE_SIZE
+        text_matches = await self._count_text_matches(query, tokens, sample_size)
+        area_shops = sample_size
+        if text_matches < sample_size:
+            area_shops = await self._count_area_shops(latitude, longitude, radius_km, sample_size)
+        
+        if choose_plan(text_matches, area_shops, sample_size) == TEXT_FIRST:
+            documents = await self._get_text_matches_in_area(query, latitude, longitude, radius_km)
+            scored = self._score_documents(tokens, latitude, longitude, radius_km, documents)
+            total = len(scored)
+            scored = [pair for pair in scored if self._is_after_score(pair[0], pair[1]['id'], after)]
+            scored.sort(key=lambda pair: (-pair[0], pair[1]['id']))
+            return scored[:count], total, len(scored) > count
+        
+        # Min-heap of the count + 1 best shops as (score, -id, shop)
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        seen = 0
+        exclude_boxes = None
+        # A dense area is read in rings, a sparse one in a single pass
+        radius = min(0.5, radius_km) if area_shops >= sample_size else radius_km
+        
+        while True:
+            documents = await self._get_documents_in_area(latitude, longitude, radius, exclude_boxes)
+            for score, shop in self._score_documents(tokens, latitude, longitude, radius_km, documents):
+                seen += 1
+                if not self._is_after_score(score, shop['id'], after):
+                    continue
+        
+                entry = (score, -shop['id'], shop)
+                if len(heap) <= count:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+        
+            if radius >= radius_km:
+                break
+        
+            # Every shop not read yet is farther than radius
+            if len(heap) > count and heap[0][0] > score_bound(radius, radius_km, settings.SEARCH_TEXT_WEIGHT):
+                return self._best_first(heap, count), None, True
+        
+            exclude_boxes = GeoService.bounding_boxes(latitude, longitude, radius)
+            radius = min(radius * 2, radius_km)
+        
+        return self._best_first(heap, count), seen, len(heap) > count
+    
+    @staticmethod
+    def _best_first(
+        heap: List[Tuple[float, int, Dict[str, Any]]],
+        count: int
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Get up to count (score, shop) pairs of a heap, best first
+        """
+        return [(score, shop) for score, _, shop in sorted(heap, reverse=True)[:count]]
+    
+    @staticmethod
+    def _is_after_score(score: float, shop_id: int, after: Optional[Tuple[float, int]]) -> bool:
+        """
+        Check whether a (score, shop_id) key sorts after a cursor key, best first
+        
+        Scores within _SCORE_EPSILON compare as equal, as in _is_after.
+        """
+        if after is None:
+            return True
+        
+        after_score, after_id = after
+        if abs(score - after_score) <= _SCORE_EPSILON:
+            return shop_id > after_id
+        
+        return score < after_score
+    
+    def _score_documents(
+        self,
+        tokens: List[str],
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        documents: List[Dict[str, Any]]
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Get (score, shop) pairs of the shops within the radius whose search
+        documents match every query word, with 'distance' and 'relevance' set
+        """
+        scored = []
+        for distance, shop in self._rank_by_distance(latitude, longitude, documents, radius_km):
+            relevance = text_relevance(tokens, shop.pop('shop_text'), shop.pop('product_text'))
+            if relevance is None:
+                continue
+        
+            shop['distance'] = distance
+            shop['relevance'] = relevance
+            scored.append((blended_score(relevance, distance, radius_km, settings.SEARCH_TEXT_WEIGHT), shop))
+        
+        return scored
+    
+    @staticmethod
+    def _with_score(ranked: List[Tuple[float, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Get shops from (score, shop) pairs with 'score', 'relevance' and 'distance' rounded
+        """
+        shops = []
+        for score, shop in ranked:
+            shop['score'] = round(score, 4)
+            shop['relevance'] = round(shop['relevance'], 4)
+            shop['distance'] = round(shop['distance'], 2)
+            shops.append(shop)
+        
+        return shops
+    
+    async def _count_text_matches(self, query: str, tokens: List[str], cap: int) -> int:
+        """
+        Count shops matching a search query, up to cap, reusing recent counts
+        """
+        key = (" ".join(tokens), cap)
+        total = _text_match_counts.get(key)
+        if total is None:
+            params: Dict[str, Any] = {"cap": cap}
+            count_query = text(f"""
+            SELECT COUNT(*) FROM (
+                SELECT shop_id FROM ({self._text_matches(query, params)}) AS text_matches
+                LIMIT :cap
+            ) AS sample
+            """)
+            result = await self.db.execute(count_query, params)
+            total = result.scalar()
+            _text_match_counts.set(key, total)
+        
+        return total
+    
+    async def _count_area_shops(self, latitude: float, longitude: float, radius_km: float, cap: int) -> int:
+        """
+        Count shops in the bounding box of a search circle, up to cap
+        """
+        params: Dict[str, Any] = {"cap": cap}
+        count_query = text(f"""
+        SELECT COUNT(*) FROM (
+            SELECT id FROM shops
+            WHERE {self._area_conditions(latitude, longitude, radius_km, params)}
+            LIMIT :cap
+        ) AS sample
+        """)
+        result = await self.db.execute(count_query, params)
+        return result.scalar()
+    
+    async def _get_text_matches_in_area(
+        self,
+        query: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Get shops matching a search query in a search circle's bounding box,
+        with their search documents, reading from the full-text index
+        """
+        params: Dict[str, Any] = {}
+        boxes = GeoService.bounding_boxes(latitude, longitude, radius_km)
+        sql_query = text(f"""
+        SELECT
+            {_QUALIFIED_SHOP_COLUMNS},
+            documents.shop_text, documents.product_text
+        FROM ({self._text_matches(query, params)}) AS text_matches
+        JOIN shops ON shops.id = text_matches.shop_id
+        JOIN shop_search_documents AS documents ON documents.shop_id = shops.id
+        WHERE {self._bounding_box_conditions(boxes, params)}
+        """)
+        result = await self.db.execute(sql_query, params)
+        return [dict(shop) for shop in result.mappings().all()]
+    
+    async def _get_documents_in_area(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        exclude_boxes: Optional[List[Tuple[float, float, float, float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get shops in a search circle's bounding box with their search
+        documents, reading from the geohash index
+        """
+        params: Dict[str, Any] = {}
+        sql_query = text(f"""
+        SELECT
+            {_QUALIFIED_SHOP_COLUMNS},
+            documents.shop_text, documents.product_text
+        FROM shops
+        JOIN shop_search_documents AS documents ON documents.shop_id = shops.id
+        WHERE {self._area_conditions(latitude, longitude, radius_km, params, exclude_boxes)}
+        """)
+        result = await self.db.execute(sql_query, params)
+        return [dict(shop) for shop in result.mappings().all()]
     
     async def get_shop_by_id(self, shop_id: int) -> Optional[Dict[str, Any]]:
         """
         Get shop by ID
         """
-        # Simulate fetching shop from seller service
-        query = f"""
+        query = text(f"""
         SELECT 
-            id, user_id, name, description, whatsapp_number, 
-            address, latitude, longitude, image_url, banner_url,
-            created_at, updated_at
+            {SHOP_COLUMNS}
         FROM shops
-        WHERE id = {shop_id}
-        """
-        result = await self.db.execute(query)
+        WHERE id = :shop_id
+        """)
+        result = await self.db.execute(query, {"shop_id": shop_id})
         shop_data = result.mappings().first()
         
         if shop_data:
@@ -185,24 +840,39 @@ class DiscoveryService:
         if not shop:
             return None
         
-        # Simulate fetching products from inventory and catalog services
-        query = f"""
+        # Get the page of inventory rows
+        query = text("""
         SELECT 
-            si.id, si.shop_id, si.catalog_item_id, si.price, si.stock,
-            'Product Name' as name,
-            'Product Description' as description,
-            'Category' as category,
-            'Brand' as brand,
-            'https://example.com/image.jpg' as image_url
+            si.id, si.shop_id, si.catalog_item_id, si.price, si.stock
         FROM shop_inventory si
-        WHERE si.shop_id = {shop_id}
-        LIMIT {limit} OFFSET {skip}
-        """
-        result = await self.db.execute(query)
-        products_data = result.mappings().all()
+        WHERE si.shop_id = :shop_id
+        ORDER BY si.id
+        LIMIT :limit OFFSET :skip
+        """)
+        result = await self.db.execute(query, {"shop_id": shop_id, "limit": limit, "skip": skip})
+        inventory = [dict(product) for product in result.mappings().all()]
+        
+        # Resolve the catalog items of the whole page in one batched lookup
+        catalog_items = await catalog_item_loader.load_many(
+            self.db,
+            [product['catalog_item_id'] for product in inventory]
+        )
         
-        # Convert to list of dicts
-        products = [dict(product) for product in products_data]
+        # Skip inventory rows whose catalog item no longer exists
+        products = []
+        for product in inventory:
+            catalog_item = catalog_items.get(product['catalog_item_id'])
+            if catalog_item is None:
+                continue
+            
+            product.update({
+                "name": catalog_item['name'],
+                "description": catalog_item['description'],
+                "category": catalog_item['category'],
+                "brand": catalog_item['brand'],
+                "image_url": catalog_item['image_url']
+            })
+            products.append(product)
         
         # Add products to shop
         shop['products'] = products
@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+# Query plans of a location-filtered text search
+TEXT_FIRST = "text"  # Read the text index's matches, filter them by distance
+GEO_FIRST = "geo"    # Read shops outwards from the location, filter them by text
+
+# Weights of a query word matching shop text or product text, and the factor
+# applied when it only matches as a word prefix
+SHOP_TEXT_WEIGHT = 1.0
+PRODUCT_TEXT_WEIGHT = 0.5
+PREFIX_FACTOR = 0.8
+
+
+def choose_plan(text_matches: int, geo_matches: int, sample_size: int) -> str:
+    """
+    Pick the index that yields fewer rows to drive a location-filtered text search
+
+    text_matches and geo_matches are counts capped at sample_size. When the
+    text matches reach the cap the query is common, and reading outwards
+    from the location, which can stop early, is used.
+    """
+    if text_matches < sample_size and text_matches <= geo_matches:
+        return TEXT_FIRST
+
+    return GEO_FIRST
+
+
+def text_relevance(
+    tokens: List[str],
+    shop_text: Optional[str],
+    product_text: Optional[str]
+) -> Optional[float]:
+    """
+    Score a shop search document against query words, from 0 to 1
+
+    Every word must match a document word or word prefix, as in the full-text
+    index, or None is returned. Each word scores by its best match: shop
+    name and description above products, whole words above prefixes; the
+    score is the mean over the words.
+    """
+    fields = (
+        (f" {shop_text or ''} ", SHOP_TEXT_WEIGHT),
+        (f" {product_text or ''} ", PRODUCT_TEXT_WEIGHT)
+    )
+    total = 0.0
+
+    for token in tokens:
+        best = 0.0
+        for padded, weight in fields:
+            if f" {token} " in padded:
+                best = max(best, weight)
+            elif f" {token}" in padded:
+                best = max(best, weight * PREFIX_FACTOR)
+
+        if best == 0.0:
+            return None
+        total += best
+
+    return total / len(tokens)
+
+
+def blended_score(
+    relevance: float,
+    distance_km: float,
+    radius_km: float,
+    text_weight: float
+) -> float:
+    """
+    Blend text relevance and closeness within the search radius into one score
+
+    Both parts range from 0 to 1, so the score does too; higher is better.
+    """
+    closeness = 1.0 - min(distance_km / radius_km, 1.0) if radius_km > 0 else 1.0
+    return text_weight * relevance + (1.0 - text_weight) * closeness
+
+
+def score_bound(distance_km: float, radius_km: float, text_weight: float) -> float:
+    """
+    Get the highest score a shop farther than distance_km can reach
+    """
+    return blended_score(1.0, distance_km, radius_km, text_weight)
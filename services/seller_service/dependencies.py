@@ -0,0 +1,37 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any
+
+# Import common modules
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.database.session import get_db
+from common.auth.jwt import get_current_user
+from common.exceptions.http_exceptions import ResourceNotFoundException
+
+from services.seller_service.services.shop_service import ShopService
+
+
+async def get_current_shop_id(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    """
+    Get the ID of the current seller's shop
+    
+    The shop ID claim of seller tokens is not trusted on its own: the shop
+    may have been deleted, or deleted and recreated under a new ID, since
+    the token was issued. The current shop is looked up instead, served
+    from the process-wide shop ID cache when possible. This process drops
+    cached entries on its own shop writes, and admin deletes show up within
+    SHOP_LOOKUP_CACHE_TTL_SECONDS. FastAPI resolves a dependency once per
+    request.
+    """
+    shop_service = ShopService(db)
+    shop_id = await shop_service.get_shop_id_by_user_id(current_user["user_id"])
+    
+    if shop_id is None:
+        raise ResourceNotFoundException("Shop not found for current user")
+    
+    return shop_id
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 import uvicorn
+import asyncio
 import sys
 import os
 
@@ -13,9 +14,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.config.settings import get_settings
 from common.exceptions.http_exceptions import AppException, exception_handler
 from common.utils.logging import setup_logger
+from common.auth.jwt import verified_token_cache
+from common.database.session import async_session_factory
 
 # Import routers
-from services.seller_service.routers import shops, inventory
+from services.seller_service.routers import shops, inventory, reservations
+from services.seller_service.services.reservation_service import ReservationService
 
 # Get settings
 settings = get_settings()
@@ -48,6 +52,34 @@ app.add_exception_handler(AppException, exception_handler)
 # Include routers
 app.include_router(shops.router, prefix="/shops", tags=["Shops"])
 app.include_router(inventory.router, prefix="/shops/me/products", tags=["Inventory"])
+app.include_router(reservations.router, prefix="/reservations", tags=["Reservations"])
+
+# Periodically release expired stock reservations in batches, returning their
+# stock; a full batch is followed by the next one right away
+async def sweep_expired_reservations():
+    while True:
+        await asyncio.sleep(settings.RESERVATION_SWEEP_INTERVAL_SECONDS)
+        try:
+            released = 0
+            async with async_session_factory() as session:
+                reservation_service = ReservationService(session)
+                while True:
+                    count = await reservation_service.release_expired(settings.RESERVATION_SWEEP_BATCH_SIZE)
+                    released += count
+                    if count < settings.RESERVATION_SWEEP_BATCH_SIZE:
+                        break
+            if released:
+                logger.info(f"Released {released} expired stock reservations")
+        except Exception as e:
+            logger.error(f"Error releasing expired stock reservations: {str(e)}")
+
+@app.on_event("startup")
+async def startup():
+    app.state.reservation_sweeper = asyncio.create_task(sweep_expired_reservations())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.reservation_sweeper.cancel()
 
 # Root endpoint
 @app.get("/")
@@ -59,6 +91,14 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Token verification cache metrics endpoint
+@app.get("/token-cache-stats")
+async def get_token_cache_stats():
+    """
+    Get hit/miss counters of the verified token caches
+    """
+    return {"jwt": verified_token_cache.stats()}
+
 # Custom OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
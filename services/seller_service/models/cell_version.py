@@ -0,0 +1,25 @@
+from sqlalchemy import Column, BigInteger, String
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import Base
+
+
+class ShopCellVersion(Base):
+    """
+    Change counter of the shops in a geohash cell, maintained by common.utils.geo_cache
+    
+    Shop writes bump the version of the cells they touch in the same
+    transaction, and the customer service's nearby-shop cache compares the
+    versions of a cached area on every read, so writes made by any process
+    reach the cache as soon as they commit.
+    """
+    __tablename__ = "shop_cell_versions"
+    
+    cell = Column(String(12), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ShopCellVersion {self.cell}: {self.version}>"
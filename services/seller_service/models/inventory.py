@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 import sys
 import os
@@ -13,6 +13,9 @@ class ShopInventory(Base):
     Shop inventory model for products in a shop
     """
     __tablename__ = "shop_inventory"
+    __table_args__ = (
+        Index("uq_shop_inventory_shop_catalog_item", "shop_id", "catalog_item_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import Base
+
+
+class StockReservation(Base):
+    """
+    Stock reservation model for inventory held for a pending checkout
+    
+    Reserving decrements ShopInventory.stock right away. A reservation is
+    then either committed (the sale went through) or released, by the
+    customer or by the sweeper once it expires, which returns the stock.
+    """
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        # Serves the sweeper's scan for expired active reservations
+        Index("ix_stock_reservations_status_expires_at", "status", "expires_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    inventory_item_id = Column(Integer, ForeignKey("shop_inventory.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="active")  # active, committed, released
+    reference = Column(String(64), nullable=True)  # Caller's order or cart reference
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<StockReservation {self.id}: inventory_item_id={self.inventory_item_id}, quantity={self.quantity}, status={self.status}>"
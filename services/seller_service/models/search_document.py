@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, func
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import Base
+
+
+class ShopSearchDocument(Base):
+    """
+    Search document of a shop, maintained by common.utils.shop_documents
+    
+    Holds the distinct words of the shop's name and description, and of the
+    names, brands and categories of the catalog items it stocks, so customer
+    search finds shops by product with one full-text index lookup.
+    """
+    __tablename__ = "shop_search_documents"
+    
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), primary_key=True)
+    shop_text = Column(Text, nullable=False, default="")
+    product_text = Column(Text().with_variant(MEDIUMTEXT(), "mysql"), nullable=False, default="")
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ShopSearchDocument {self.shop_id}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 import sys
 import os
@@ -13,6 +13,9 @@ class Shop(Base):
     Shop model for seller's shop information
     """
     __tablename__ = "shops"
+    __table_args__ = (
+        Index("ix_shops_latitude_longitude", "latitude", "longitude"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
@@ -22,6 +25,7 @@ class Shop(Base):
     address = Column(String(255), nullable=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    geohash = Column(String(12), nullable=True, index=True)  # Spatial index key, see common.utils.geohash
     image_url = Column(String(255), nullable=True)
     banner_url = Column(String(255), nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
@@ -8,37 +8,33 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.database.session import get_db
-from common.auth.jwt import get_current_user
-from common.exceptions.http_exceptions import ResourceNotFoundException, UnauthorizedException
+from common.config.settings import get_settings
+from common.exceptions.http_exceptions import ResourceNotFoundException, ValidationException
 
 # Import schemas and services
 from services.seller_service.schemas.inventory import InventoryItemCreate, InventoryItemUpdate, InventoryItemResponse, InventoryItemWithCatalogResponse
-from services.seller_service.services.inventory_service import InventoryService
-from services.seller_service.services.shop_service import ShopService
+from services.seller_service.schemas.inventory import InventoryBulkUpsert, InventoryBulkUpsertResponse, InventoryImportResponse
+from services.seller_service.services.inventory_service import InventoryService, CREATED, UPDATED, SKIPPED, FAILED
+from services.seller_service.dependencies import get_current_shop_id
+from services.seller_service.services.inventory_import import InventoryImportService, detect_format
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+settings = get_settings()
 
 @router.post("", response_model=InventoryItemResponse, status_code=status.HTTP_201_CREATED)
 async def add_product_to_inventory(
     product_data: InventoryItemCreate,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    shop_id: int = Depends(get_current_shop_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Add a product to the seller's inventory
     """
-    # Get seller's shop
-    shop_service = ShopService(db)
-    shop = await shop_service.get_shop_by_user_id(current_user["user_id"])
-    
-    if not shop:
-        raise ResourceNotFoundException("Shop not found for current user")
-    
     # Add product to inventory
     inventory_service = InventoryService(db)
     inventory_item = await inventory_service.add_inventory_item(
-        shop_id=shop.id,
+        shop_id=shop_id,
         catalog_item_id=product_data.catalog_item_id,
         price=product_data.price,
         stock=product_data.stock
@@ -46,101 +42,118 @@ async def add_product_to_inventory(
     
     return inventory_item
 
+@router.post("/bulk", response_model=InventoryBulkUpsertResponse)
+async def bulk_upsert_inventory(
+    bulk_data: InventoryBulkUpsert,
+    shop_id: int = Depends(get_current_shop_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Add or update many products in the seller's inventory
+    
+    Returns a result per row; rows that fail do not stop the others.
+    """
+    if len(bulk_data.items) > settings.INVENTORY_BULK_MAX_ROWS:
+        raise ValidationException(
+            f"At most {settings.INVENTORY_BULK_MAX_ROWS} items can be sent in one request"
+        )
+    
+    # Upsert inventory items
+    inventory_service = InventoryService(db)
+    results = await inventory_service.bulk_upsert(
+        shop_id=shop_id,
+        items=[item.dict() for item in bulk_data.items]
+    )
+    
+    return {
+        "created": sum(1 for result in results if result["status"] == CREATED),
+        "updated": sum(1 for result in results if result["status"] == UPDATED),
+        "skipped": sum(1 for result in results if result["status"] == SKIPPED),
+        "failed": sum(1 for result in results if result["status"] == FAILED),
+        "results": results
+    }
+
+@router.post("/import", response_model=InventoryImportResponse)
+async def import_inventory(
+    file: UploadFile = File(..., description="CSV with a catalog_item_id,price,stock header, or JSON Lines"),
+    shop_id: int = Depends(get_current_shop_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import products into the seller's inventory from a CSV or JSONL file
+    
+    Rows are upserted and committed in chunks as the file is read, so rows
+    before a failure stay imported. Returns row counts, row errors and
+    throughput.
+    """
+    file_format = detect_format(file.filename, file.content_type)
+    
+    # Import inventory items
+    import_service = InventoryImportService(db)
+    return await import_service.import_file(
+        shop_id=shop_id,
+        file=file.file,
+        file_format=file_format
+    )
+
 @router.get("", response_model=List[InventoryItemWithCatalogResponse])
 async def get_inventory_items(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    shop_id: int = Depends(get_current_shop_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all products in the seller's inventory
     """
-    # Get seller's shop
-    shop_service = ShopService(db)
-    shop = await shop_service.get_shop_by_user_id(current_user["user_id"])
-    
-    if not shop:
-        raise ResourceNotFoundException("Shop not found for current user")
-    
     # Get inventory items
     inventory_service = InventoryService(db)
     inventory_items = await inventory_service.get_inventory_items_by_shop_id(
-        shop_id=shop.id,
+        shop_id=shop_id,
         skip=skip,
         limit=limit
     )
     
-    # Fetch catalog item details for each inventory item
-    # In a real implementation, this would call the catalog service API
-    # For now, we'll return the inventory items without catalog details
-    
-    return inventory_items
+    # Fetch catalog item details for the whole page at once
+    return await inventory_service.with_catalog_items(inventory_items)
 
 @router.get("/{item_id}", response_model=InventoryItemWithCatalogResponse)
 async def get_inventory_item(
     item_id: int = Path(..., gt=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    shop_id: int = Depends(get_current_shop_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific product from the seller's inventory
     """
-    # Get seller's shop
-    shop_service = ShopService(db)
-    shop = await shop_service.get_shop_by_user_id(current_user["user_id"])
-    
-    if not shop:
-        raise ResourceNotFoundException("Shop not found for current user")
-    
-    # Get inventory item
+    # Get inventory item if it belongs to seller's shop
     inventory_service = InventoryService(db)
-    inventory_item = await inventory_service.get_inventory_item_by_id(item_id)
+    inventory_item = await inventory_service.get_shop_inventory_item(shop_id, item_id)
     
     if not inventory_item:
         raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
     
-    # Check if inventory item belongs to seller's shop
-    if inventory_item.shop_id != shop.id:
-        raise UnauthorizedException("Not authorized to access this inventory item")
-    
     # Fetch catalog item details
-    # In a real implementation, this would call the catalog service API
+    items = await inventory_service.with_catalog_items([inventory_item])
     
-    return inventory_item
+    return items[0]
 
 @router.put("/{item_id}", response_model=InventoryItemResponse)
 async def update_inventory_item(
     item_data: InventoryItemUpdate,
     item_id: int = Path(..., gt=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    shop_id: int = Depends(get_current_shop_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update a product in the seller's inventory
     """
-    # Get seller's shop
-    shop_service = ShopService(db)
-    shop = await shop_service.get_shop_by_user_id(current_user["user_id"])
-    
-    if not shop:
-        raise ResourceNotFoundException("Shop not found for current user")
-    
-    # Get inventory item
+    # Update inventory item if it belongs to seller's shop
     inventory_service = InventoryService(db)
-    inventory_item = await inventory_service.get_inventory_item_by_id(item_id)
-    
-    if not inventory_item:
-        raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
-    
-    # Check if inventory item belongs to seller's shop
-    if inventory_item.shop_id != shop.id:
-        raise UnauthorizedException("Not authorized to update this inventory item")
-    
-    # Update inventory item
     updated_item = await inventory_service.update_inventory_item(
         item_id=item_id,
-        item_data=item_data.dict(exclude_unset=True)
+        item_data=item_data.dict(exclude_unset=True),
+        shop_id=shop_id
     )
     
     return updated_item
@@ -148,31 +161,14 @@ async def update_inventory_item(
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_inventory_item(
     item_id: int = Path(..., gt=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    shop_id: int = Depends(get_current_shop_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Remove a product from the seller's inventory
     """
-    # Get seller's shop
-    shop_service = ShopService(db)
-    shop = await shop_service.get_shop_by_user_id(current_user["user_id"])
-    
-    if not shop:
-        raise ResourceNotFoundException("Shop not found for current user")
-    
-    # Get inventory item
+    # Delete inventory item if it belongs to seller's shop
     inventory_service = InventoryService(db)
-    inventory_item = await inventory_service.get_inventory_item_by_id(item_id)
-    
-    if not inventory_item:
-        raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
-    
-    # Check if inventory item belongs to seller's shop
-    if inventory_item.shop_id != shop.id:
-        raise UnauthorizedException("Not authorized to delete this inventory item")
-    
-    # Delete inventory item
-    await inventory_service.delete_inventory_item(item_id)
+    await inventory_service.delete_inventory_item(item_id, shop_id=shop_id)
     
     return None
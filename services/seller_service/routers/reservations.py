@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any
+
+# Import common modules
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.database.session import get_db
+from common.auth.jwt import get_current_user
+from common.config.settings import get_settings
+from common.exceptions.http_exceptions import ValidationException
+
+# Import schemas and services
+from services.seller_service.schemas.reservation import ReservationCreate, ReservationIds, ReservationResponse, ReservationUpdateResponse
+from services.seller_service.services.reservation_service import ReservationService
+
+router = APIRouter()
+settings = get_settings()
+
+@router.post("", response_model=List[ReservationResponse], status_code=status.HTTP_201_CREATED)
+async def reserve_stock(
+    reservation_data: ReservationCreate,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Reserve stock of one or more inventory items for checkout
+    
+    Either every item is reserved or none is; the request fails with 409 if
+    any item has too little stock. Reservations expire after ttl_seconds
+    (RESERVATION_TTL_SECONDS by default) unless committed, and their stock
+    is then returned.
+    """
+    if len(reservation_data.items) > settings.RESERVATION_MAX_ITEMS:
+        raise ValidationException(
+            f"At most {settings.RESERVATION_MAX_ITEMS} items can be reserved in one request"
+        )
+    
+    # Reserve stock
+    reservation_service = ReservationService(db)
+    reservations = await reservation_service.reserve(
+        user_id=current_user["user_id"],
+        items=[(item.inventory_item_id, item.quantity) for item in reservation_data.items],
+        ttl_seconds=reservation_data.ttl_seconds,
+        reference=reservation_data.reference
+    )
+    
+    return reservations
+
+@router.post("/commit", response_model=ReservationUpdateResponse)
+async def commit_reservations(
+    reservation_data: ReservationIds,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Commit reservations once the order is placed
+    
+    Fails with 409, committing none, if any reservation has expired or was
+    already committed or released.
+    """
+    reservation_service = ReservationService(db)
+    updated = await reservation_service.commit(
+        user_id=current_user["user_id"],
+        reservation_ids=reservation_data.reservation_ids
+    )
+    
+    return {"updated": updated}
+
+@router.post("/release", response_model=ReservationUpdateResponse)
+async def release_reservations(
+    reservation_data: ReservationIds,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Release reservations and return their stock, e.g. when a cart is abandoned
+    
+    Reservations that are no longer active are ignored.
+    """
+    reservation_service = ReservationService(db)
+    updated = await reservation_service.release(
+        user_id=current_user["user_id"],
+        reservation_ids=reservation_data.reservation_ids
+    )
+    
+    return {"updated": updated}
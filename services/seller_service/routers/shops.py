@@ -10,13 +10,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from common.database.session import get_db
 from common.auth.jwt import get_current_user
-from common.exceptions.http_exceptions import ResourceNotFoundException, UnauthorizedException
+from common.config.settings import get_settings
+from common.exceptions.http_exceptions import (
+    ResourceNotFoundException,
+    UnauthorizedException,
+    ForbiddenException,
+    ValidationException
+)
 from common.utils.s3 import S3Service
 
 # Import schemas and services
-from services.seller_service.schemas.shop import ShopCreate, ShopUpdate, ShopResponse, ImageUploadResponse
+from services.seller_service.schemas.shop import (
+    ShopCreate,
+    ShopUpdate,
+    ShopResponse,
+    ImageUploadResponse,
+    MultipartUploadRequest,
+    MultipartUploadResponse,
+    MultipartUploadComplete,
+    MultipartUploadAbort
+)
 from services.seller_service.services.shop_service import ShopService
+from services.seller_service.dependencies import get_current_shop_id
 
+settings = get_settings()
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -128,6 +145,78 @@ async def upload_shop_image(
         "field_name": field_name
     }
 
+@router.post("/me/banner/multipart", response_model=MultipartUploadResponse, status_code=status.HTTP_201_CREATED)
+async def start_banner_upload(
+    upload: MultipartUploadRequest,
+    shop_id: int = Depends(get_current_shop_id)
+):
+    """
+    Start a multipart upload of a large shop banner
+    
+    Returns a presigned URL per part. Upload each part with a PUT to its URL,
+    then send the ETag header of every part to /me/banner/multipart/complete.
+    """
+    if upload.size > settings.S3_MULTIPART_MAX_SIZE:
+        raise ValidationException(
+            f"Banner files can be at most {settings.S3_MULTIPART_MAX_SIZE} bytes"
+        )
+    
+    s3_service = S3Service()
+    object_name = f"shops/{shop_id}/banner_url/{uuid.uuid4()}"
+    multipart_upload = await s3_service.create_multipart_upload(
+        object_name,
+        size=upload.size,
+        content_type=upload.content_type
+    )
+    
+    return {
+        **multipart_upload,
+        "image_url": await s3_service.get_object_url(object_name)
+    }
+
+@router.post("/me/banner/multipart/complete", response_model=ShopResponse)
+async def complete_banner_upload(
+    upload: MultipartUploadComplete,
+    shop_id: int = Depends(get_current_shop_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Complete a multipart banner upload and set it as the shop banner
+    """
+    _check_banner_object(upload.object_name, shop_id)
+    
+    s3_service = S3Service()
+    await s3_service.complete_multipart_upload(
+        upload.object_name,
+        upload.upload_id,
+        [part.dict() for part in upload.parts]
+    )
+    
+    # Update shop with new banner URL
+    shop_service = ShopService(db)
+    banner_url = await s3_service.get_object_url(upload.object_name)
+    return await shop_service.update_shop(shop_id, {"banner_url": banner_url})
+
+@router.post("/me/banner/multipart/abort", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_banner_upload(
+    upload: MultipartUploadAbort,
+    shop_id: int = Depends(get_current_shop_id)
+):
+    """
+    Abort a multipart banner upload and discard its uploaded parts
+    """
+    _check_banner_object(upload.object_name, shop_id)
+    
+    s3_service = S3Service()
+    await s3_service.abort_multipart_upload(upload.object_name, upload.upload_id)
+
+def _check_banner_object(object_name: str, shop_id: int) -> None:
+    """
+    Check that an upload's object is a banner of the shop
+    """
+    if not object_name.startswith(f"shops/{shop_id}/banner_url/"):
+        raise ForbiddenException("Upload does not belong to your shop")
+
 @router.get("/{shop_id}", response_model=ShopResponse)
 async def get_shop_by_id(
     shop_id: int = Path(..., gt=0),
@@ -24,6 +24,59 @@ class InventoryItemCreate(InventoryItemBase):
     pass
 
 
+class InventoryBulkUpsert(BaseModel):
+    """
+    Schema for adding or updating many inventory items at once
+    """
+    items: List[InventoryItemCreate] = Field(..., min_length=1)
+
+
+class InventoryBulkRowResult(BaseModel):
+    """
+    Schema for the result of one row of a bulk upsert
+    """
+    index: int  # Position of the row in the request
+    catalog_item_id: int
+    status: str  # created, updated, skipped or error
+    error: Optional[str] = None
+
+
+class InventoryBulkUpsertResponse(BaseModel):
+    """
+    Schema for bulk upsert response
+    """
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    results: List[InventoryBulkRowResult]
+
+
+class InventoryImportError(BaseModel):
+    """
+    Schema for an error in one row of an inventory import
+    """
+    line: int  # Line number in the uploaded file
+    catalog_item_id: Optional[int] = None
+    error: str
+
+
+class InventoryImportResponse(BaseModel):
+    """
+    Schema for inventory import summary
+    """
+    rows: int  # Data rows read from the file
+    chunks: int  # Chunks upserted and committed
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    errors: List[InventoryImportError]
+    errors_truncated: bool  # True if more rows failed than errors lists
+    elapsed_seconds: float
+    rows_per_second: Optional[float] = None
+
+
 class InventoryItemUpdate(BaseModel):
     """
     Schema for inventory item update
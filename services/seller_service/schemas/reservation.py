@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field
+import sys
+import os
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class ReservationItem(BaseModel):
+    """
+    Schema for one inventory item to reserve
+    """
+    inventory_item_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class ReservationCreate(BaseModel):
+    """
+    Schema for reserving stock of one or more inventory items
+    """
+    items: List[ReservationItem] = Field(..., min_length=1)
+    ttl_seconds: Optional[int] = Field(None, gt=0, le=86400)
+    reference: Optional[str] = Field(None, max_length=64)  # Order or cart reference
+
+
+class ReservationIds(BaseModel):
+    """
+    Schema for committing or releasing reservations
+    """
+    reservation_ids: List[int] = Field(..., min_length=1)
+
+
+class ReservationResponse(BaseModel):
+    """
+    Schema for reservation response
+    """
+    id: int
+    inventory_item_id: int
+    user_id: int
+    quantity: int
+    status: str  # active, committed or released
+    reference: Optional[str] = None
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationUpdateResponse(BaseModel):
+    """
+    Schema for the result of committing or releasing reservations
+    """
+    updated: int
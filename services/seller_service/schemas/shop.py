@@ -73,3 +73,55 @@ class ImageUploadResponse(BaseModel):
     presigned_url: str
     image_url: str
     field_name: str
+
+
+class MultipartUploadRequest(BaseModel):
+    """
+    Schema for starting a multipart upload
+    """
+    size: int = Field(..., gt=0, description="File size in bytes")
+    content_type: str = Field("application/octet-stream", max_length=100)
+
+
+class UploadPartURL(BaseModel):
+    """
+    Schema for the presigned upload URL of one multipart upload part
+    """
+    part_number: int
+    url: str
+
+
+class MultipartUploadResponse(BaseModel):
+    """
+    Schema for a started multipart upload
+    """
+    upload_id: str
+    object_name: str
+    part_size: int
+    parts: List[UploadPartURL]
+    image_url: str
+
+
+class UploadedPart(BaseModel):
+    """
+    Schema for an uploaded part and the ETag S3 returned for it
+    """
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+
+class MultipartUploadComplete(BaseModel):
+    """
+    Schema for completing a multipart upload
+    """
+    upload_id: str
+    object_name: str
+    parts: List[UploadedPart] = Field(..., min_length=1)
+
+
+class MultipartUploadAbort(BaseModel):
+    """
+    Schema for aborting a multipart upload
+    """
+    upload_id: str
+    object_name: str
@@ -0,0 +1,216 @@
+import codecs
+import csv
+import json
+import time
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.seller_service.schemas.inventory import InventoryItemCreate
+from services.seller_service.services.inventory_service import (
+    InventoryService,
+    CREATED,
+    UPDATED,
+    SKIPPED,
+    FAILED
+)
+from common.config.settings import get_settings
+from common.exceptions.http_exceptions import ValidationException
+
+settings = get_settings()
+
+# Supported import file formats
+CSV = "csv"
+JSONL = "jsonl"
+
+# Key under which csv.DictReader puts the fields of a row past the header
+_EXTRA_FIELDS = "__extra_fields__"
+
+# A parsed record: (line number, fields) or (line number, error message)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Get the import format of an uploaded file from its name or content type
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return CSV
+    if name.endswith((".jsonl", ".ndjson")) or content_type in ("application/jsonl", "application/x-ndjson"):
+        return JSONL
+
+    raise ValidationException("Unsupported file type; upload a .csv or .jsonl file")
+
+
+def read_lines(file: BinaryIO) -> Iterator[str]:
+    """
+    Decode an uploaded file into text lines one at a time
+
+    Undecodable bytes are replaced, so they fail validation of their row
+    instead of aborting the import.
+    """
+    return codecs.iterdecode(file, "utf-8-sig", errors="replace")
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Record]:
+    """
+    Parse CSV lines with a header row into records
+    """
+    reader = csv.DictReader(lines, restkey=_EXTRA_FIELDS)
+    try:
+        for row in reader:
+            if _EXTRA_FIELDS in row:
+                yield reader.line_num, None, f"Row has {len(row[_EXTRA_FIELDS])} more fields than the header"
+                continue
+            yield reader.line_num, row, None
+    except csv.Error as e:
+        yield reader.line_num, None, f"Invalid CSV: {str(e)}"
+
+
+def parse_jsonl(lines: Iterable[str]) -> Iterator[Record]:
+    """
+    Parse JSON Lines into records, skipping blank lines
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+
+        yield line_number, record, None
+
+
+def validate(records: Iterable[Record]) -> Iterator[Record]:
+    """
+    Validate parsed records against InventoryItemCreate
+    """
+    for line_number, record, error in records:
+        if error is not None:
+            yield line_number, None, error
+            continue
+
+        try:
+            item = InventoryItemCreate(**record)
+        except PydanticValidationError as e:
+            yield line_number, None, "; ".join(
+                f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+                for detail in e.errors()
+            )
+            continue
+
+        yield line_number, item.dict(), None
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """
+    Group records into lists of at most size
+    """
+    batch: List[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class InventoryImportService:
+    """
+    Service for importing inventory files
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.inventory_service = InventoryService(db)
+
+    async def import_file(
+        self,
+        shop_id: int,
+        file: BinaryIO,
+        file_format: str
+    ) -> Dict[str, Any]:
+        """
+        Import a CSV or JSONL inventory file into a shop
+
+        The file is read, parsed, validated and upserted chunk by chunk, and
+        each chunk is committed before the next is read. Memory use is
+        bounded by the chunk size and the number of reported errors, not
+        by the file size.
+
+        Returns a summary with row counts, up to INVENTORY_IMPORT_MAX_ERRORS
+        row errors, and throughput numbers
+        """
+        parse = parse_csv if file_format == CSV else parse_jsonl
+        records = validate(parse(read_lines(file)))
+
+        summary: Dict[str, Any] = {
+            "rows": 0,
+            "chunks": 0,
+            CREATED: 0,
+            UPDATED: 0,
+            SKIPPED: 0,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False
+        }
+        started = time.monotonic()
+
+        for batch in batched(records, settings.INVENTORY_BULK_CHUNK_SIZE):
+            valid = [(line_number, item) for line_number, item, _ in batch if item is not None]
+            errors = [(line_number, None, error) for line_number, _, error in batch if error is not None]
+
+            results = await self.inventory_service.bulk_upsert(
+                shop_id=shop_id,
+                items=[item for _, item in valid]
+            )
+            for (line_number, _), result in zip(valid, results):
+                if result["status"] == FAILED:
+                    errors.append((line_number, result["catalog_item_id"], result["error"]))
+                else:
+                    summary[result["status"]] += 1
+
+            for line_number, catalog_item_id, error in sorted(errors, key=lambda error: error[0]):
+                self._add_error(summary, line_number, catalog_item_id, error)
+
+            # Keep each transaction, and what a failure loses, to one chunk
+            await self.db.commit()
+
+            summary["rows"] += len(batch)
+            summary["chunks"] += 1
+
+        elapsed = time.monotonic() - started
+        summary["elapsed_seconds"] = round(elapsed, 3)
+        summary["rows_per_second"] = round(summary["rows"] / elapsed, 1) if elapsed > 0 else None
+
+        return summary
+
+    @staticmethod
+    def _add_error(
+        summary: Dict[str, Any],
+        line_number: int,
+        catalog_item_id: Optional[int],
+        error: str
+    ) -> None:
+        """
+        Count a failed row and keep its error if the error limit is not reached
+        """
+        summary["failed"] += 1
+        if len(summary["errors"]) < settings.INVENTORY_IMPORT_MAX_ERRORS:
+            summary["errors"].append({
+                "line": line_number,
+                "catalog_item_id": catalog_item_id,
+                "error": error
+            })
+        else:
+            summary["errors_truncated"] = True
@@ -1,15 +1,33 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import bindparam, delete, func, text, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import Optional, List, Dict, Any
 
 from services.seller_service.models.inventory import ShopInventory
+from common.config.settings import get_settings
+from common.utils.catalog_loader import catalog_item_loader
+from common.utils.shop_documents import add_shop_products, refresh_shop_documents
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
     ValidationException
 )
 
+settings = get_settings()
+
+# Bulk upsert row statuses
+CREATED = "created"
+UPDATED = "updated"
+SKIPPED = "skipped"
+FAILED = "error"
+
+_EXISTING_CATALOG_ITEMS_QUERY = text(
+    "SELECT id FROM catalog_items WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
 
 class InventoryService:
     """
@@ -26,43 +44,158 @@ class InventoryService:
         stock: int
     ) -> ShopInventory:
         """
-        Add a product to inventory
+        Add a product to inventory, or update its price and stock if already there
+        
+        Writes with a single-row upsert against the unique (shop_id,
+        catalog_item_id) index, then reads the row back.
         """
-        # Check if product already exists in inventory
-        existing_item = await self.get_inventory_item_by_shop_and_catalog(
+        row = {
+            "shop_id": shop_id,
+            "catalog_item_id": catalog_item_id,
+            "price": price,
+            "stock": stock
+        }
+        
+        try:
+            await self.db.execute(self._upsert_statement([row]))
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Error adding inventory item: {str(e)}")
+        
+        await add_shop_products(self.db, shop_id, [catalog_item_id])
+        
+        inventory_item = await self.get_inventory_item_by_shop_and_catalog(
             shop_id=shop_id,
             catalog_item_id=catalog_item_id
         )
         
-        if existing_item:
-            # Update existing item
-            existing_item.price = price
-            existing_item.stock = stock
-            
-            try:
-                await self.db.flush()
-                await self.db.refresh(existing_item)
-                return existing_item
-            except IntegrityError as e:
-                await self.db.rollback()
-                raise DatabaseException(f"Error updating inventory item: {str(e)}")
+        return inventory_item
+    
+    async def bulk_upsert(
+        self,
+        shop_id: int,
+        items: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Add or update many products in a shop's inventory
         
-        # Create new inventory item
-        inventory_item = ShopInventory(
-            shop_id=shop_id,
-            catalog_item_id=catalog_item_id,
-            price=price,
-            stock=stock
+        Rows are written in chunks of chunk_size, each with one multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE (INSERT ... ON CONFLICT DO UPDATE
+        on SQLite) against the unique (shop_id, catalog_item_id) index. A
+        chunk that fails is rolled back to its savepoint and its rows are
+        reported as errors; other chunks are still written. When a catalog
+        item appears more than once, the last row wins and earlier ones are
+        skipped.
+        
+        Each item needs catalog_item_id, price and stock. Returns one result
+        per item, in input order, with its index, catalog_item_id, status
+        (created, updated, skipped or error) and error message.
+        """
+        chunk_size = chunk_size or settings.INVENTORY_BULK_CHUNK_SIZE
+        results = [
+            {"index": index, "catalog_item_id": item["catalog_item_id"], "status": None, "error": None}
+            for index, item in enumerate(items)
+        ]
+        
+        # Only the last row of each catalog item is written
+        last_index = {item["catalog_item_id"]: index for index, item in enumerate(items)}
+        pending = []
+        for index, item in enumerate(items):
+            if last_index[item["catalog_item_id"]] == index:
+                pending.append(index)
+            else:
+                results[index]["status"] = SKIPPED
+                results[index]["error"] = "Superseded by a later row for the same catalog item"
+        
+        for start in range(0, len(pending), chunk_size):
+            await self._upsert_chunk(shop_id, items, pending[start:start + chunk_size], results)
+        
+        # Only new rows can add words to the shop's search document
+        await add_shop_products(
+            self.db,
+            shop_id,
+            [result["catalog_item_id"] for result in results if result["status"] == CREATED]
+        )
+        
+        return results
+    
+    async def _upsert_chunk(
+        self,
+        shop_id: int,
+        items: List[Dict[str, Any]],
+        indexes: List[int],
+        results: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Upsert the items at indexes with one statement, recording each row's result
+        """
+        catalog_item_ids = [items[index]["catalog_item_id"] for index in indexes]
+        
+        # Rows referencing unknown catalog items would fail the whole statement
+        known_result = await self.db.execute(_EXISTING_CATALOG_ITEMS_QUERY, {"ids": catalog_item_ids})
+        known = set(known_result.scalars().all())
+        
+        existing_query = select(ShopInventory.catalog_item_id).where(
+            ShopInventory.shop_id == shop_id,
+            ShopInventory.catalog_item_id.in_(catalog_item_ids)
         )
+        existing_result = await self.db.execute(existing_query)
+        existing = set(existing_result.scalars().all())
+        
+        rows = []
+        written = []
+        for index in indexes:
+            item = items[index]
+            if item["catalog_item_id"] not in known:
+                results[index]["status"] = FAILED
+                results[index]["error"] = f"Catalog item with ID {item['catalog_item_id']} not found"
+                continue
+            
+            rows.append({
+                "shop_id": shop_id,
+                "catalog_item_id": item["catalog_item_id"],
+                "price": item["price"],
+                "stock": item["stock"]
+            })
+            written.append(index)
+        
+        if not rows:
+            return
         
         try:
-            self.db.add(inventory_item)
-            await self.db.flush()
-            await self.db.refresh(inventory_item)
-            return inventory_item
-        except IntegrityError as e:
-            await self.db.rollback()
-            raise DatabaseException(f"Error adding inventory item: {str(e)}")
+            async with self.db.begin_nested():
+                await self.db.execute(self._upsert_statement(rows))
+        except SQLAlchemyError as e:
+            for index in written:
+                results[index]["status"] = FAILED
+                results[index]["error"] = f"Error writing inventory item: {str(e)}"
+            return
+        
+        for index in written:
+            results[index]["status"] = UPDATED if items[index]["catalog_item_id"] in existing else CREATED
+    
+    def _upsert_statement(self, rows: List[Dict[str, Any]]):
+        """
+        Build a multi-row insert that updates price and stock of existing rows
+        """
+        if self.db.get_bind().dialect.name == "mysql":
+            stmt = mysql_insert(ShopInventory).values(rows)
+            return stmt.on_duplicate_key_update(
+                price=stmt.inserted.price,
+                stock=stmt.inserted.stock,
+                updated_at=func.now()
+            )
+        
+        stmt = sqlite_insert(ShopInventory).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=["shop_id", "catalog_item_id"],
+            set_={
+                "price": stmt.excluded.price,
+                "stock": stmt.excluded.stock,
+                "updated_at": func.now()
+            }
+        )
     
     async def get_inventory_item_by_id(self, item_id: int) -> Optional[ShopInventory]:
         """
@@ -74,6 +207,19 @@ class InventoryService:
         
         return item
     
+    async def get_shop_inventory_item(self, shop_id: int, item_id: int) -> Optional[ShopInventory]:
+        """
+        Get inventory item by ID if it belongs to the shop
+        """
+        query = select(ShopInventory).where(
+            ShopInventory.id == item_id,
+            ShopInventory.shop_id == shop_id
+        )
+        result = await self.db.execute(query)
+        item = result.scalars().first()
+        
+        return item
+    
     async def get_inventory_item_by_shop_and_catalog(
         self,
         shop_id: int,
@@ -109,43 +255,130 @@ class InventoryService:
         
         return list(items)
     
+    async def with_catalog_items(self, items: List[ShopInventory]) -> List[Dict[str, Any]]:
+        """
+        Get inventory items as dicts with their catalog item details attached
+        
+        All catalog items of the list are resolved in one batched, cached lookup.
+        """
+        catalog_items = await catalog_item_loader.load_many(
+            self.db,
+            [item.catalog_item_id for item in items]
+        )
+        
+        return [
+            {
+                "id": item.id,
+                "shop_id": item.shop_id,
+                "catalog_item_id": item.catalog_item_id,
+                "price": item.price,
+                "stock": item.stock,
+                "created_at": item.created_at,
+                "updated_at": item.updated_at,
+                "catalog_item": catalog_items.get(item.catalog_item_id)
+            }
+            for item in items
+        ]
+    
     async def update_inventory_item(
         self,
         item_id: int,
-        item_data: Dict[str, Any]
+        item_data: Dict[str, Any],
+        shop_id: Optional[int] = None
     ) -> ShopInventory:
         """
         Update inventory item
+        
+        With shop_id, only an item of that shop is updated, so ownership is
+        checked by the UPDATE itself instead of a separate lookup. Where the
+        database supports UPDATE ... RETURNING, the row comes back from the
+        same statement.
         """
-        item = await self.get_inventory_item_by_id(item_id)
-        if not item:
-            raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+        conditions = [ShopInventory.id == item_id]
+        if shop_id is not None:
+            conditions.append(ShopInventory.shop_id == shop_id)
         
-        # Update item attributes
-        for key, value in item_data.items():
-            if hasattr(item, key) and value is not None:
-                setattr(item, key, value)
+        values = {
+            key: value
+            for key, value in item_data.items()
+            if hasattr(ShopInventory, key) and value is not None
+        }
         
-        try:
-            await self.db.flush()
-            await self.db.refresh(item)
+        if values and self.db.get_bind().dialect.update_returning:
+            # One statement updates the row and returns it, new updated_at included
+            statement = (
+                update(ShopInventory)
+                .where(*conditions)
+                .values(**values)
+                .returning(ShopInventory)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            try:
+                result = await self.db.execute(statement)
+            except IntegrityError as e:
+                await self.db.rollback()
+                raise DatabaseException(f"Error updating inventory item: {str(e)}")
+            
+            item = result.scalars().first()
+            if not item:
+                raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+            
             return item
-        except IntegrityError as e:
-            await self.db.rollback()
-            raise DatabaseException(f"Error updating inventory item: {str(e)}")
+        
+        # MySQL and MariaDB have no UPDATE ... RETURNING, so the row is read back
+        if values:
+            try:
+                result = await self.db.execute(
+                    update(ShopInventory)
+                    .where(*conditions)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            except IntegrityError as e:
+                await self.db.rollback()
+                raise DatabaseException(f"Error updating inventory item: {str(e)}")
+            
+            if result.rowcount == 0:
+                raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+        
+        # Read back the row, including its new updated_at
+        query = select(ShopInventory).where(*conditions).execution_options(populate_existing=True)
+        result = await self.db.execute(query)
+        item = result.scalars().first()
+        
+        if not item:
+            raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+        
+        return item
     
-    async def delete_inventory_item(self, item_id: int) -> bool:
+    async def delete_inventory_item(self, item_id: int, shop_id: Optional[int] = None) -> bool:
         """
         Delete inventory item
+        
+        With shop_id, only an item of that shop is deleted, in one statement.
         """
-        item = await self.get_inventory_item_by_id(item_id)
-        if not item:
-            raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+        if shop_id is None:
+            item = await self.get_inventory_item_by_id(item_id)
+            if not item:
+                raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+            shop_id = item.shop_id
+        
+        conditions = [ShopInventory.id == item_id, ShopInventory.shop_id == shop_id]
         
         try:
-            await self.db.delete(item)
-            await self.db.flush()
-            return True
+            result = await self.db.execute(
+                delete(ShopInventory)
+                .where(*conditions)
+                .execution_options(synchronize_session=False)
+            )
         except Exception as e:
             await self.db.rollback()
             raise DatabaseException(f"Error deleting inventory item: {str(e)}")
+        
+        if result.rowcount == 0:
+            raise ResourceNotFoundException(f"Inventory item with ID {item_id} not found")
+        
+        # Other products may share the removed item's words, so rebuild
+        await refresh_shop_documents(self.db, [shop_id])
+        
+        return True
@@ -0,0 +1,226 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from services.seller_service.models.inventory import ShopInventory
+from services.seller_service.models.reservation import StockReservation
+from common.config.settings import get_settings
+from common.exceptions.http_exceptions import (
+    ConflictException,
+    DatabaseException,
+    ValidationException
+)
+
+settings = get_settings()
+
+# Reservation statuses
+ACTIVE = "active"
+COMMITTED = "committed"
+RELEASED = "released"
+
+_inventory = ShopInventory.__table__
+
+# Add stock back to one inventory row; executed with one parameter set per row
+_RESTOCK = (
+    update(_inventory)
+    .where(_inventory.c.id == bindparam("item_id"))
+    .values(stock=_inventory.c.stock + bindparam("quantity"))
+)
+
+
+class ReservationService:
+    """
+    Service for stock reservations
+
+    Stock is taken with one conditional UPDATE per inventory row, which both
+    checks and decrements it, so no SELECT ... FOR UPDATE round-trip holds
+    the row while the application decides. Rows are always updated in ID
+    order, so checkouts sharing items queue instead of deadlocking, and each
+    operation commits right away so the row locks are held only for the
+    statements themselves.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def reserve(
+        self,
+        user_id: int,
+        items: Iterable[Tuple[int, int]],
+        ttl_seconds: Optional[int] = None,
+        reference: Optional[str] = None
+    ) -> List[StockReservation]:
+        """
+        Reserve stock of several inventory items, all or nothing
+
+        Takes (inventory_item_id, quantity) pairs; quantities of repeated
+        items are added up. Raises ConflictException, leaving all stock
+        untouched, if any item is missing or has too little stock; a missing
+        item is found by its conditional UPDATE matching no row, before any
+        reservation is inserted, so it never reaches the foreign key.
+        """
+        quantities: Dict[int, int] = defaultdict(int)
+        for inventory_item_id, quantity in items:
+            if quantity <= 0:
+                raise ValidationException("Reserved quantities must be positive")
+            quantities[inventory_item_id] += quantity
+
+        if not quantities:
+            raise ValidationException("At least one item must be reserved")
+
+        expires_at = datetime.utcnow() + timedelta(
+            seconds=ttl_seconds or settings.RESERVATION_TTL_SECONDS
+        )
+        reservations = [
+            StockReservation(
+                inventory_item_id=inventory_item_id,
+                user_id=user_id,
+                quantity=quantity,
+                status=ACTIVE,
+                reference=reference,
+                expires_at=expires_at
+            )
+            for inventory_item_id, quantity in sorted(quantities.items())
+        ]
+
+        try:
+            # Take the stock first, exclusively locking the inventory rows in
+            # ID order. Inserting the reservations first would take shared
+            # locks on them through the foreign key, and two checkouts of one
+            # item would deadlock upgrading those to exclusive locks.
+            for reservation in reservations:
+                result = await self.db.execute(
+                    update(_inventory)
+                    .where(
+                        _inventory.c.id == reservation.inventory_item_id,
+                        _inventory.c.stock >= reservation.quantity
+                    )
+                    .values(stock=_inventory.c.stock - reservation.quantity)
+                )
+                if result.rowcount != 1:
+                    await self.db.rollback()
+                    raise ConflictException(
+                        f"Insufficient stock for inventory item {reservation.inventory_item_id}"
+                    )
+
+            self.db.add_all(reservations)
+            await self.db.flush()
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Error reserving stock: {str(e)}")
+
+        return reservations
+
+    async def commit(self, user_id: int, reservation_ids: List[int]) -> int:
+        """
+        Mark a user's active, unexpired reservations as committed, all or nothing
+
+        The stock was already taken when reserving, so only the status
+        changes. Raises ConflictException if any reservation is not the
+        user's, not active or expired.
+        """
+        reservation_ids = sorted(set(reservation_ids))
+
+        try:
+            result = await self.db.execute(
+                update(StockReservation)
+                .where(
+                    StockReservation.id.in_(reservation_ids),
+                    StockReservation.user_id == user_id,
+                    StockReservation.status == ACTIVE,
+                    StockReservation.expires_at > datetime.utcnow()
+                )
+                .values(status=COMMITTED)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(reservation_ids):
+                await self.db.rollback()
+                raise ConflictException("Some reservations are expired or no longer active")
+
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Error committing reservations: {str(e)}")
+
+        return len(reservation_ids)
+
+    async def release(self, user_id: int, reservation_ids: List[int]) -> int:
+        """
+        Release a user's active reservations and return their stock
+
+        Reservations that are not the user's or no longer active are
+        ignored. Returns the number released.
+        """
+        return await self._release(
+            select(StockReservation.id, StockReservation.inventory_item_id, StockReservation.quantity)
+            .where(
+                StockReservation.id.in_(sorted(set(reservation_ids))),
+                StockReservation.user_id == user_id,
+                StockReservation.status == ACTIVE
+            )
+            .order_by(StockReservation.id)
+            .with_for_update()
+        )
+
+    async def release_expired(self, batch_size: Optional[int] = None) -> int:
+        """
+        Release up to batch_size expired active reservations and return their stock
+
+        Rows another sweeper has locked are skipped, so several service
+        processes can sweep at once without waiting on each other. Returns
+        the number released; a full batch means more may be waiting.
+        """
+        return await self._release(
+            select(StockReservation.id, StockReservation.inventory_item_id, StockReservation.quantity)
+            .where(
+                StockReservation.status == ACTIVE,
+                StockReservation.expires_at <= datetime.utcnow()
+            )
+            .order_by(StockReservation.expires_at)
+            .limit(batch_size or settings.RESERVATION_SWEEP_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def _release(self, locking_query) -> int:
+        """
+        Release the reservations selected and locked by a query
+
+        Marks them released with one UPDATE, then adds their quantities back
+        with one executemany over the affected inventory rows in ID order.
+        """
+        try:
+            result = await self.db.execute(locking_query)
+            rows = result.all()
+            if not rows:
+                await self.db.rollback()
+                return 0
+
+            await self.db.execute(
+                update(StockReservation)
+                .where(StockReservation.id.in_([row.id for row in rows]))
+                .values(status=RELEASED)
+                .execution_options(synchronize_session=False)
+            )
+
+            quantities: Dict[int, int] = defaultdict(int)
+            for row in rows:
+                quantities[row.inventory_item_id] += row.quantity
+            await self.db.execute(
+                _RESTOCK,
+                [
+                    {"item_id": inventory_item_id, "quantity": quantity}
+                    for inventory_item_id, quantity in sorted(quantities.items())
+                ]
+            )
+
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Error releasing reservations: {str(e)}")
+
+        return len(rows)
@@ -1,15 +1,32 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import and_, or_
 from typing import Optional, List, Dict, Any
 
 from services.seller_service.models.shop import Shop
+from common.utils import geohash
+from common.utils.geo import GeoService
+from common.utils.geo_cache import bump_cell_versions
+from common.utils.cache import TTLCache
+from common.utils.entity_counts import adjust_count
+from common.utils.shop_documents import refresh_shop_documents, set_shop_text, remove_shop_documents
+from common.config.settings import get_settings
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
     ValidationException
 )
 
+settings = get_settings()
+
+# Shop IDs of seller user IDs. Entries are dropped when this process changes
+# or deletes the shop; the TTL bounds staleness after changes made elsewhere.
+shop_id_cache = TTLCache(
+    max_entries=settings.SHOP_LOOKUP_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SHOP_LOOKUP_CACHE_TTL_SECONDS
+)
+
 
 class ShopService:
     """
@@ -32,6 +49,11 @@ class ShopService:
     ) -> Shop:
         """
         Create a new shop
+        
+        The shop, its search document, its count and its cell version are
+        written in the caller's transaction, so they are committed together;
+        if any write fails the transaction is rolled back, leaving no
+        document behind.
         """
         # Check if user already has a shop
         existing_shop = await self.get_shop_by_user_id(user_id)
@@ -47,6 +69,7 @@ class ShopService:
             address=address,
             latitude=latitude,
             longitude=longitude,
+            geohash=geohash.encode(latitude, longitude),
             image_url=image_url,
             banner_url=banner_url
         )
@@ -55,10 +78,15 @@ class ShopService:
             self.db.add(shop)
             await self.db.flush()
             await self.db.refresh(shop)
-            return shop
-        except IntegrityError as e:
+            await refresh_shop_documents(self.db, [shop.id])
+            await adjust_count(self.db, "shops", 1)
+            await bump_cell_versions(self.db, [(latitude, longitude)])
+        except SQLAlchemyError as e:
             await self.db.rollback()
             raise DatabaseException(f"Error creating shop: {str(e)}")
+        
+        shop_id_cache.delete(user_id)
+        return shop
     
     async def get_shop_by_id(self, shop_id: int) -> Optional[Shop]:
         """
@@ -80,6 +108,25 @@ class ShopService:
         
         return shop
     
+    async def get_shop_id_by_user_id(self, user_id: int) -> Optional[int]:
+        """
+        Get the ID of a user's shop, served from the shop ID cache when possible
+        """
+        # Token subjects are strings; key the cache like Shop.user_id
+        user_id = int(user_id)
+        shop_id = shop_id_cache.get(user_id)
+        if shop_id is not None:
+            return shop_id
+        
+        query = select(Shop.id).where(Shop.user_id == user_id)
+        result = await self.db.execute(query)
+        shop_id = result.scalars().first()
+        
+        if shop_id is not None:
+            shop_id_cache.set(user_id, shop_id)
+        
+        return shop_id
+    
     async def update_shop(self, shop_id: int, shop_data: Dict[str, Any]) -> Shop:
         """
         Update shop data
@@ -88,14 +135,29 @@ class ShopService:
         if not shop:
             raise ResourceNotFoundException(f"Shop with ID {shop_id} not found")
         
+        previous_location = (shop.latitude, shop.longitude)
+        previous_user_id = shop.user_id
+        
         # Update shop attributes
         for key, value in shop_data.items():
             if hasattr(shop, key) and value is not None:
                 setattr(shop, key, value)
         
+        # Keep the spatial index key in sync with the location
+        if shop_data.get("latitude") is not None or shop_data.get("longitude") is not None:
+            shop.geohash = geohash.encode(shop.latitude, shop.longitude)
+        
         try:
             await self.db.flush()
             await self.db.refresh(shop)
+            shop_id_cache.delete(previous_user_id)
+            shop_id_cache.delete(shop.user_id)
+            if shop_data.get("name") is not None or shop_data.get("description") is not None:
+                await set_shop_text(self.db, shop.id, shop.name, shop.description)
+            
+            # Refresh cached nearby results around the old and new location
+            await bump_cell_versions(self.db, [previous_location, (shop.latitude, shop.longitude)])
+            
             return shop
         except IntegrityError as e:
             await self.db.rollback()
@@ -112,6 +174,10 @@ class ShopService:
         try:
             await self.db.delete(shop)
             await self.db.flush()
+            shop_id_cache.delete(shop.user_id)
+            await remove_shop_documents(self.db, [shop_id])
+            await bump_cell_versions(self.db, [(shop.latitude, shop.longitude)])
+            await adjust_count(self.db, "shops", -1)
             return True
         except Exception as e:
             await self.db.rollback()
@@ -136,14 +202,41 @@ class ShopService:
         limit: int = 100
     ) -> List[Shop]:
         """
-        Get shops near a location
+        Get shops near a location, sorted by distance
         
-        Note: This is a simplified implementation. In a real-world scenario,
-        you would use a spatial database like PostGIS for efficient geo queries.
+        The bounding box of the search circle is pushed into SQL so that only
+        candidate rows are loaded; exact distances are computed on those only.
         """
-        # Get all shops
-        shops = await self.get_all_shops(skip=skip, limit=limit)
+        boxes = GeoService.bounding_boxes(latitude, longitude, radius_km)
+        query = select(Shop).where(
+            or_(*[
+                and_(
+                    Shop.latitude.between(min_lat, max_lat),
+                    Shop.longitude.between(min_lon, max_lon)
+                )
+                for min_lat, max_lat, min_lon, max_lon in boxes
+            ])
+        )
+        result = await self.db.execute(query)
+        candidates = list(result.scalars().all())
+        
+        if not candidates:
+            return []
+        
+        # Refine candidates by exact distance
+        distances = GeoService.batch_distances(
+            latitude,
+            longitude,
+            [shop.latitude for shop in candidates],
+            [shop.longitude for shop in candidates]
+        ).tolist()
+        nearby = sorted(
+            (
+                (distance, shop)
+                for distance, shop in zip(distances, candidates)
+                if distance <= radius_km
+            ),
+            key=lambda pair: pair[0]
+        )
         
-        # Filter shops by distance (this would be done at the database level in a real implementation)
-        # For now, we'll return all shops and let the geo service handle filtering
-        return shops
+        return [shop for _, shop in nearby[skip:skip+limit]]
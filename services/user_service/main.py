@@ -13,6 +13,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.config.settings import get_settings
 from common.exceptions.http_exceptions import AppException, exception_handler
 from common.utils.logging import setup_logger
+from common.auth.jwt import verified_token_cache
+from common.auth.firebase import verified_token_cache as verified_firebase_token_cache
 
 # Import routers
 from services.user_service.routers import auth
@@ -58,6 +60,17 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Token verification cache metrics endpoint
+@app.get("/token-cache-stats")
+async def get_token_cache_stats():
+    """
+    Get hit/miss counters of the verified token caches
+    """
+    return {
+        "jwt": verified_token_cache.stats(),
+        "firebase": verified_firebase_token_cache.stats()
+    }
+
 # Custom OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
@@ -15,6 +15,7 @@ from common.exceptions.http_exceptions import UnauthorizedException
 # Import schemas and services
 from services.user_service.schemas.user import UserCreate, UserResponse, TokenResponse, FirebaseAuthRequest
 from services.user_service.services.user_service import UserService
+from services.user_service.models.user import UserRole
 
 router = APIRouter()
 
@@ -65,9 +66,16 @@ async def login(
         if not user:
             raise UnauthorizedException("User not found")
         
+        # Sellers carry their shop ID in the token
+        shop_id = None
+        if user.role == UserRole.SELLER:
+            shop_id = await user_service.get_shop_id(user.id)
+        
         # Create access token
         access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role}
+            data={"sub": str(user.id)},
+            role=user.role,
+            shop_id=shop_id
         )
         
         return {
@@ -100,9 +108,16 @@ async def refresh_token(
         if not user:
             raise UnauthorizedException("User not found")
         
+        # Sellers carry their shop ID in the token
+        shop_id = None
+        if user.role == UserRole.SELLER:
+            shop_id = await user_service.get_shop_id(user.id)
+        
         # Create new access token
         access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role}
+            data={"sub": str(user.id)},
+            role=user.role,
+            shop_id=shop_id
         )
         
         return {
@@ -1,9 +1,11 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, List, Dict, Any
 
 from services.user_service.models.user import User, UserRole
+from common.utils.entity_counts import adjust_count
 from common.exceptions.http_exceptions import (
     ResourceNotFoundException,
     DatabaseException,
@@ -47,6 +49,7 @@ class UserService:
             self.db.add(user)
             await self.db.flush()
             await self.db.refresh(user)
+            await adjust_count(self.db, "users", 1)
             return user
         except IntegrityError as e:
             await self.db.rollback()
@@ -77,6 +80,17 @@ class UserService:
         
         return user
     
+    async def get_shop_id(self, user_id: int) -> Optional[int]:
+        """
+        Get the ID of a seller's shop, signed into access tokens as a claim
+        """
+        result = await self.db.execute(
+            text("SELECT id FROM shops WHERE user_id = :user_id"),
+            {"user_id": user_id}
+        )
+        
+        return result.scalar()
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email
@@ -134,6 +148,7 @@ class UserService:
         try:
             await self.db.delete(user)
             await self.db.flush()
+            await adjust_count(self.db, "users", -1)
             return True
         except Exception as e:
             await self.db.rollback()
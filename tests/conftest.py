@@ -0,0 +1,49 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Settings are read at import time, so point them at a scratch SQLite
+# database before importing anything that uses them
+_TMP_DIR = tempfile.mkdtemp(prefix="hyperlocal-tests-")
+os.environ["DB_TYPE"] = "sqlite"
+os.environ["DB_PATH"] = os.path.join(_TMP_DIR, "test.db")
+os.environ["DEBUG"] = "false"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+from common.database.session import async_session_factory, engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def migrated_template():
+    """
+    Path of a database migrated to head once per test run
+    """
+    path = os.path.join(_TMP_DIR, "template.db")
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "migrations", "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+
+    yield path
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+async def db(migrated_template):
+    """
+    Session on a fresh copy of the migrated database
+    """
+    shutil.copyfile(migrated_template, os.environ["DB_PATH"])
+    async with async_session_factory() as session:
+        yield session
+
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
@@ -0,0 +1,90 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from services.admin_service.models.admin_log import AdminLog
+from services.admin_service.services.activity_rollups import add_to_rollups, get_activity_counts
+
+START = datetime(2026, 3, 1)
+
+# Logs on bucket edges, plus random ones over three days
+_EDGE_TIMES = [
+    START,
+    START + timedelta(hours=1),
+    START + timedelta(hours=1, microseconds=-1),
+    START + timedelta(days=1),
+    START + timedelta(days=1, microseconds=-1),
+    START + timedelta(days=1, hours=13, minutes=30),
+    START + timedelta(days=2),
+    START + timedelta(days=2, hours=23, minutes=59, seconds=59)
+]
+
+
+@pytest.fixture
+async def logs(db):
+    rng = random.Random(5)
+    times = _EDGE_TIMES + [START + timedelta(seconds=rng.uniform(0, 3 * 86400)) for _ in range(300)]
+    rows = [
+        {
+            "admin_id": rng.choice([1, 2]),
+            "action": rng.choice(["create", "update", "delete"]),
+            "entity_type": rng.choice(["shop", "user"]),
+            "entity_id": None,
+            "details": None,
+            "created_at": created_at
+        }
+        for created_at in times
+    ]
+    await db.execute(insert(AdminLog.__table__), rows)
+    await add_to_rollups(
+        db, [(row["created_at"], row["action"], row["entity_type"], row["admin_id"]) for row in rows]
+    )
+    await db.commit()
+    return rows
+
+
+def _expected(logs, start_date, end_date):
+    return Counter(
+        (row["action"], row["entity_type"], row["admin_id"])
+        for row in logs
+        if start_date <= row["created_at"] <= end_date
+    )
+
+
+@pytest.mark.parametrize("start_date,end_date", [
+    # Inside one hour, and a single instant
+    (START + timedelta(minutes=10), START + timedelta(minutes=50)),
+    (START, START),
+    # Exactly one hour, closed at both ends
+    (START, START + timedelta(hours=1)),
+    # Whole hours inside one day, with partial hours at both edges
+    (START + timedelta(minutes=30), START + timedelta(hours=5, minutes=15)),
+    # Exactly one day, and a day minus its last microsecond
+    (START, START + timedelta(days=1)),
+    (START, START + timedelta(days=1, microseconds=-1)),
+    # Whole days with partial hours and days around them
+    (START + timedelta(hours=3, seconds=1), START + timedelta(days=2, hours=22, minutes=1)),
+    (START - timedelta(days=5), START + timedelta(days=10)),
+    # Ending at midnight, where a log falls in the next day's bucket
+    (START + timedelta(hours=12), START + timedelta(days=2))
+])
+async def test_activity_counts_match_the_logs(db, logs, start_date, end_date):
+    counts = await get_activity_counts(db, start_date, end_date)
+
+    assert Counter({(action, entity_type, admin_id): count for action, entity_type, admin_id, count in counts}) \
+        == _expected(logs, start_date, end_date)
+    assert all(count > 0 for *_, count in counts)
+
+
+async def test_activity_counts_of_random_ranges(db, logs):
+    rng = random.Random(9)
+    for _ in range(40):
+        start_date = START + timedelta(seconds=rng.uniform(-3600, 3 * 86400))
+        end_date = start_date + timedelta(seconds=rng.uniform(0, 2 * 86400))
+        counts = await get_activity_counts(db, start_date, end_date)
+
+        assert Counter({(action, entity_type, admin_id): count for action, entity_type, admin_id, count in counts}) \
+            == _expected(logs, start_date, end_date)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+
+from common.database.session import async_session_factory
+from services.admin_service.services import audit_log_writer as writer_module
+from services.admin_service.services.audit_log_writer import AuditLogWriter
+
+
+def _database_down():
+    raise OSError("database unavailable")
+
+
+async def _wait_until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def _logged_actions(db):
+    result = await db.execute(text("SELECT action FROM admin_logs ORDER BY id"))
+    return result.scalars().all()
+
+
+async def _crash(writer):
+    """
+    Stop a writer the way a killed process would: no final flush, spill
+    file left behind with a half-written line
+    """
+    writer._closing = True
+    writer._wakeup.set()
+    await writer._task
+    writer._spill.write(b'{"admin_id": 1, "act')
+    writer._spill.close()
+
+
+@pytest.fixture
+def spill_dir(tmp_path):
+    return str(tmp_path / "spill")
+
+
+async def test_entries_are_written_with_rollups(db, spill_dir):
+    writer = AuditLogWriter(spill_dir, batch_size=10, flush_interval=0.05)
+    await writer.start()
+    for index in range(25):
+        await writer.submit(1, f"action-{index}", "shop", index, {"index": index})
+    await _wait_until(lambda: writer.stats()["pending"] == 0)
+    await writer.close()
+
+    assert await _logged_actions(db) == [f"action-{index}" for index in range(25)]
+    result = await db.execute(text("SELECT SUM(count) FROM admin_activity_rollups WHERE granularity = 'day'"))
+    assert result.scalar() == 25
+    assert os.listdir(spill_dir) == []
+
+
+async def test_unwritten_entries_are_replayed_once_after_a_crash(db, spill_dir, monkeypatch):
+    writer = AuditLogWriter(spill_dir, batch_size=10, flush_interval=0.05)
+    await writer.start()
+    for index in range(10):
+        await writer.submit(1, f"written-{index}", "shop")
+    await _wait_until(lambda: writer.written == 10)
+
+    monkeypatch.setattr(writer_module, "async_session_factory", _database_down)
+    for index in range(15):
+        await writer.submit(1, f"replayed-{index}", "shop")
+    await _wait_until(lambda: writer.failures > 0)
+    await _crash(writer)
+    monkeypatch.setattr(writer_module, "async_session_factory", async_session_factory)
+
+    recovered = AuditLogWriter(spill_dir, batch_size=10, flush_interval=0.05)
+    await recovered.start()
+    assert recovered.stats()["pending"] == 15
+    await recovered.close()
+
+    assert await _logged_actions(db) == (
+        [f"written-{index}" for index in range(10)] + [f"replayed-{index}" for index in range(15)]
+    )
+    assert os.listdir(spill_dir) == []
+
+
+async def test_rejected_entries_are_dead_lettered(db, spill_dir):
+    writer = AuditLogWriter(spill_dir, batch_size=10, flush_interval=0.05)
+    await writer.start()
+    await writer.submit(1, "before", "shop")
+    await writer.submit(1, None, "shop")  # action is NOT NULL
+    writer._append({
+        "admin_id": 1,
+        "action": "bad-timestamp",
+        "entity_type": "shop",
+        "entity_id": None,
+        "details": None,
+        "created_at": "yesterday"
+    })
+    await writer.submit(1, "after", "shop")
+    await writer.close()
+
+    assert await _logged_actions(db) == ["before", "after"]
+    assert writer.dead_lettered == 2
+    with open(os.path.join(spill_dir, writer_module._DEAD_LETTER_FILE)) as dead_letter:
+        rejected = [json.loads(line) for line in dead_letter]
+    assert [entry["entry"]["action"] for entry in rejected] == [None, "bad-timestamp"]
+    assert all(entry["error"] for entry in rejected)
+
+
+async def test_submit_does_not_hang_while_the_database_is_down(db, spill_dir, monkeypatch):
+    monkeypatch.setattr(writer_module, "async_session_factory", _database_down)
+    writer = AuditLogWriter(spill_dir, batch_size=5, flush_interval=0.05, max_pending=10, submit_timeout=0.05)
+    await writer.start()
+
+    for index in range(30):
+        await asyncio.wait_for(writer.submit(1, f"action-{index}", "shop"), timeout=1.0)
+    assert writer.stats()["pending"] == 10
+    assert writer.stats()["unqueued_bytes"] > 0
+
+    monkeypatch.setattr(writer_module, "async_session_factory", async_session_factory)
+    await _wait_until(lambda: writer.written == 30)
+    await writer.close()
+
+    assert await _logged_actions(db) == [f"action-{index}" for index in range(30)]
+
+
+async def test_entries_are_submitted_only_when_the_transaction_commits(db, spill_dir):
+    writer = AuditLogWriter(spill_dir, batch_size=10, flush_interval=0.05)
+    await writer.start()
+
+    async with async_session_factory() as session:
+        writer.submit_after_commit(session, admin_id=1, action="rolled-back", entity_type="shop")
+        await session.execute(text("SELECT 1"))
+        await session.rollback()
+        assert writer.stats()["pending"] == 0
+
+        writer.submit_after_commit(session, admin_id=1, action="committed", entity_type="shop")
+        await session.execute(text("SELECT 1"))
+        assert writer.stats()["pending"] == 0
+        await session.commit()
+        assert writer.stats()["pending"] == 1
+
+    await writer.close()
+    assert await _logged_actions(db) == ["committed"]
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from common.utils.geo import GeoService
+from common.utils.geo_cache import shop_cell_cache
+from services.customer_service.routers.shops import (
+    _decode_distance_cursor,
+    _decode_relevance_cursor,
+    _encode_distance_cursor,
+    _encode_relevance_cursor
+)
+from services.customer_service.services.discovery_service import DiscoveryService
+from services.seller_service.services.shop_service import ShopService
+
+CENTER = (12.9716, 77.5946)
+
+_NAMES = ["Fresh Mart", "Phone Hub", "Fresh Bakery", "Corner Pharmacy", "Phone Repair Fresh"]
+
+
+@pytest.fixture
+async def shops(db):
+    shop_cell_cache._cache.clear()
+
+    rng = random.Random(11)
+    created = []
+    for index in range(60):
+        shop = await ShopService(db).create_shop(
+            user_id=index + 1,
+            name=f"{_NAMES[index % len(_NAMES)]} {index}",
+            latitude=CENTER[0] + rng.uniform(-0.07, 0.07),
+            longitude=CENTER[1] + rng.uniform(-0.07, 0.07),
+            description="Open late"
+        )
+        created.append(shop)
+    await db.commit()
+    return created
+
+
+def _by_distance(shops, radius_km):
+    """
+    IDs of the shops within radius_km of CENTER, nearest first
+    """
+    distances = GeoService.batch_distances(
+        *CENTER, [shop.latitude for shop in shops], [shop.longitude for shop in shops]
+    )
+    ranked = sorted(
+        (distance, shop.id) for distance, shop in zip(distances.tolist(), shops) if distance <= radius_km
+    )
+    return [shop_id for _, shop_id in ranked]
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 2.0, 5.0, 12.0])
+async def test_nearby_shops_match_brute_force(db, shops, radius_km):
+    expected = _by_distance(shops, radius_km)
+
+    found, total = await DiscoveryService(db).get_shops_near_location(*CENTER, radius_km, limit=100)
+
+    assert total == len(expected)
+    assert [shop["id"] for shop in found] == expected
+
+
+async def test_nearby_cursor_round_trip(db, shops):
+    service = DiscoveryService(db)
+    seen = []
+    cursor = None
+    while True:
+        after = _decode_distance_cursor(cursor) if cursor else None
+        page, next_key = await service.get_shops_near_location_after(*CENTER, 5.0, after=after, limit=7)
+        seen.extend(shop["id"] for shop in page)
+        cursor = _encode_distance_cursor(next_key)
+        if cursor is None:
+            break
+
+    assert seen == _by_distance(shops, 5.0)
+
+
+@pytest.mark.parametrize("k", [1, 5, 100])
+async def test_nearest_shops_match_brute_force(db, shops, k):
+    found = await DiscoveryService(db).get_nearest_shops(*CENTER, k=k, max_radius_km=5.0)
+
+    assert [shop["id"] for shop in found] == _by_distance(shops, 5.0)[:k]
+
+
+@pytest.mark.parametrize("query", ["fresh", "phone repair", "pharmacy"])
+async def test_search_cursor_round_trip(db, shops, query):
+    service = DiscoveryService(db)
+    expected, total = await service.search_shops(query, limit=100)
+    assert total == len(expected) > 0
+
+    seen = []
+    cursor = None
+    while True:
+        after = _decode_relevance_cursor(cursor) if cursor else None
+        page, next_key = await service.search_shops_after(query, after=after, limit=3)
+        seen.extend(shop["id"] for shop in page)
+        cursor = _encode_relevance_cursor(next_key)
+        if cursor is None:
+            break
+
+    assert seen == [shop["id"] for shop in expected]
+
+
+async def test_cached_nearby_results_follow_a_moved_shop(db, shops):
+    service = DiscoveryService(db)
+    farthest = _by_distance(shops, 12.0)[-1]
+    assert farthest not in _by_distance(shops, 1.0)
+
+    found, _ = await service.get_shops_near_location(*CENTER, 1.0, limit=100)
+    assert farthest not in [shop["id"] for shop in found]
+
+    await ShopService(db).update_shop(farthest, {"latitude": CENTER[0], "longitude": CENTER[1]})
+    await db.commit()
+
+    found, _ = await service.get_shops_near_location(*CENTER, 1.0, limit=100)
+    assert found[0]["id"] == farthest
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+from geopy.distance import geodesic, great_circle
+
+from common.utils import geohash
+from common.utils.geo import DistanceMode, GeoService
+
+# Base32 characters in the order of a case-insensitive collation that sorts
+# punctuation first, like MySQL's utf8mb4_0900_ai_ci
+_COLLATION_ORDER = "~" + "0123456789" + "abcdefghijklmnopqrstuvwxyz"
+
+
+def _collation_key(value: str):
+    return [_COLLATION_ORDER.index(char) for char in value]
+
+
+def _random_points(count, seed=7):
+    rng = random.Random(seed)
+    return [(rng.uniform(-80.0, 80.0), rng.uniform(-179.0, 179.0)) for _ in range(count)]
+
+
+def test_batch_distances_match_geopy():
+    reference = (12.9716, 77.5946)
+    points = _random_points(200)
+    latitudes = [lat for lat, _ in points]
+    longitudes = [lon for _, lon in points]
+
+    geodesic_km = GeoService.batch_distances(*reference, latitudes, longitudes)
+    spherical_km = GeoService.batch_distances(
+        *reference, latitudes, longitudes, mode=DistanceMode.SPHERICAL
+    )
+
+    for index, point in enumerate(points):
+        assert geodesic_km[index] == pytest.approx(geodesic(reference, point).km, abs=1e-6)
+        assert spherical_km[index] == pytest.approx(great_circle(reference, point).km, rel=1e-9)
+
+
+def test_batch_distances_edge_cases():
+    assert GeoService.batch_distances(1.0, 2.0, [], []).size == 0
+    assert GeoService.batch_distances(1.0, 2.0, [1.0], [2.0])[0] == pytest.approx(0.0, abs=1e-9)
+
+    # Across the antimeridian the short way round is taken
+    across = GeoService.batch_distances(0.0, 179.9, [0.0], [-179.9])[0]
+    assert across == pytest.approx(geodesic((0.0, 179.9), (0.0, -179.9)).km, abs=1e-6)
+    assert across < 25.0
+
+
+@pytest.mark.parametrize("cell", ["t", "tsq0", "tsz", "tzz", "0", "b7zz", "zy"])
+def test_prefix_range_holds_exactly_the_prefixed_geohashes(cell):
+    lower, upper = geohash.prefix_range(cell)
+    assert lower == cell
+    assert upper is not None and set(upper) <= set(geohash._BASE32)
+
+    inside = [cell + suffix for suffix in ("", "0", "zzzz", "s8x")]
+    outside = [
+        value for value in (upper, upper + "0", cell[:-1] + "0" if cell[-1] != "0" else None)
+        if value is not None and not value.startswith(cell)
+    ]
+    for key in (None, _collation_key):
+        order = key or (lambda value: value)
+        for value in inside:
+            assert order(lower) <= order(value) < order(upper)
+        for value in outside:
+            assert not order(lower) <= order(value) < order(upper)
+
+
+def test_prefix_range_of_last_cells_is_unbounded():
+    assert geohash.prefix_range("z") == ("z", None)
+    assert geohash.prefix_range("zzz") == ("zzz", None)
+
+
+def test_cells_for_boxes_cover_every_point_of_the_boxes():
+    boxes = GeoService.bounding_boxes(12.9716, 77.5946, 3.0)
+    cells = geohash.cells_for_boxes(boxes, 5, 64)
+    assert cells is not None and cells == sorted(set(cells))
+
+    rng = random.Random(3)
+    for min_lat, max_lat, min_lon, max_lon in boxes:
+        for _ in range(500):
+            point = (rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon))
+            assert geohash.encode(*point, 5) in cells
+
+    # Every cell touches a box
+    for cell in cells:
+        cell_min_lat, cell_max_lat, cell_min_lon, cell_max_lon = geohash.bounds(cell)
+        assert any(
+            cell_min_lat <= max_lat and min_lat <= cell_max_lat
+            and cell_min_lon <= max_lon and min_lon <= cell_max_lon
+            for min_lat, max_lat, min_lon, max_lon in boxes
+        )
+
+
+def test_cells_for_boxes_gives_up_past_max_cells():
+    boxes = GeoService.bounding_boxes(12.9716, 77.5946, 3.0)
+    assert geohash.cells_for_boxes(boxes, 8, 16) is None
+
+
+def test_cells_for_boxes_across_the_antimeridian():
+    boxes = GeoService.bounding_boxes(0.0, 179.99, 5.0)
+    assert len(boxes) == 2
+    cells = geohash.cells_for_boxes(boxes, 4, 64)
+
+    assert geohash.encode(0.0, 179.99, 4) in cells
+    assert geohash.encode(0.0, -179.99, 4) in cells
+
+
+def test_cover_uses_the_finest_precision_within_max_cells():
+    boxes = GeoService.bounding_boxes(28.6139, 77.2090, 2.0)
+    cells = geohash.cover(boxes, max_cells=16)
+
+    assert 0 < len(cells) <= 16
+    finer = geohash.cells_for_boxes(boxes, len(cells[0]) + 1, 16)
+    assert finer is None
+    assert geohash.encode(28.6139, 77.2090)[:len(cells[0])] in cells
@@ -0,0 +1,71 @@
+import io
+
+from services.seller_service.services.inventory_import import parse_csv, parse_jsonl, read_lines, validate
+
+
+def _lines(content: str):
+    return read_lines(io.BytesIO(content.encode("utf-8")))
+
+
+def test_parse_csv_reports_rows_with_extra_fields():
+    records = list(parse_csv(_lines(
+        "catalog_item_id,price,stock\n"
+        "1,10.5,3\n"
+        "2,20,4,surplus,more\n"
+        "3,30,5\n"
+    )))
+
+    assert records == [
+        (2, {"catalog_item_id": "1", "price": "10.5", "stock": "3"}, None),
+        (3, None, "Row has 2 more fields than the header"),
+        (4, {"catalog_item_id": "3", "price": "30", "stock": "5"}, None)
+    ]
+
+
+def test_parse_csv_numbers_rows_by_their_last_line():
+    records = list(parse_csv(_lines(
+        "catalog_item_id,price,stock,note\n"
+        '1,10,3,"two\nlines"\n'
+        "2,20,4,plain\n"
+    )))
+
+    assert [(line_number, error) for line_number, _, error in records] == [(3, None), (4, None)]
+    assert records[0][1]["note"] == "two\nlines"
+
+
+def test_parse_csv_handles_a_byte_order_mark():
+    records = list(parse_csv(read_lines(io.BytesIO(b"\xef\xbb\xbfcatalog_item_id,price,stock\n1,1,1\n"))))
+
+    assert records == [(2, {"catalog_item_id": "1", "price": "1", "stock": "1"}, None)]
+
+
+def test_parse_jsonl_reports_bad_lines_and_skips_blank_ones():
+    records = list(parse_jsonl(_lines(
+        '{"catalog_item_id": 1, "price": 10, "stock": 3}\n'
+        "\n"
+        '{"catalog_item_id": 2, "price": \n'
+        "[1, 2, 3]\n"
+        '{"catalog_item_id": 4, "price": 40, "stock": 6}\n'
+    )))
+
+    assert [(line_number, error is None) for line_number, _, error in records] == [
+        (1, True), (3, False), (4, False), (5, True)
+    ]
+    assert records[1][2].startswith("Invalid JSON")
+    assert records[2][2] == "Each line must be a JSON object"
+
+
+def test_validate_reports_invalid_fields_per_row():
+    records = list(validate(parse_csv(_lines(
+        "catalog_item_id,price,stock\n"
+        "1,10,3\n"
+        "x,0,-1\n"
+        "2,5\n"
+        "3,1,1,extra\n"
+    ))))
+
+    assert records[0] == (2, {"catalog_item_id": 1, "price": 10.0, "stock": 3}, None)
+    assert records[1][1] is None
+    assert "catalog_item_id" in records[1][2] and "price" in records[1][2] and "stock" in records[1][2]
+    assert records[2][1] is None and "stock" in records[2][2]
+    assert records[3] == (5, None, "Row has 1 more fields than the header")
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from common.database import pagination
+from common.database.pagination import TotalMode, paginate
+from common.exceptions.http_exceptions import ValidationException
+from common.utils.cursor import decode_cursor, encode_cursor
+from services.catalog_service.models.catalog import CatalogItem
+
+
+@pytest.fixture
+async def items(db):
+    pagination._count_cache.clear()
+    pagination._estimate_cache.clear()
+
+    await db.execute(text("INSERT INTO categories (name) VALUES ('Phones')"))
+    await db.execute(
+        text("INSERT INTO catalog_items (name, brand, category_id) VALUES (:name, :brand, 1)"),
+        [{"name": f"Item {index:02d}", "brand": "even" if index % 2 == 0 else "odd"} for index in range(25)]
+    )
+    await db.commit()
+    return db
+
+
+async def test_paginate_walks_every_row_once(items):
+    stmt = select(CatalogItem).order_by(CatalogItem.id)
+    seen = []
+    skip = 0
+    while True:
+        page = await paginate(items, stmt, skip=skip, limit=10)
+        seen.extend(item.id for item in page.items)
+        assert page.total == 25 and page.total_exact
+        if not page.has_more:
+            break
+        skip += 10
+
+    assert seen == list(range(1, 26))
+
+
+async def test_paginate_knows_the_total_on_the_last_page_without_counting(items):
+    stmt = select(CatalogItem).order_by(CatalogItem.id)
+
+    page = await paginate(items, stmt, skip=20, limit=10, total_mode=TotalMode.NONE)
+    assert len(page.items) == 5
+    assert (page.has_more, page.total, page.total_exact) == (False, 25, True)
+
+    # Past the end the total is unknown without counting
+    page = await paginate(items, stmt, skip=40, limit=10, total_mode=TotalMode.EXACT)
+    assert (page.items, page.total) == ([], 25)
+
+
+async def test_paginate_total_modes(items):
+    stmt = select(CatalogItem).order_by(CatalogItem.id)
+
+    page = await paginate(items, stmt, limit=10, total_mode=TotalMode.NONE)
+    assert (page.has_more, page.total, page.total_exact) == (True, None, False)
+
+    page = await paginate(items, stmt, limit=10, total_mode=TotalMode.ESTIMATED, table_name="catalog_items")
+    assert page.total >= 25 and not page.total_exact
+
+    filtered = stmt.where(CatalogItem.brand == "even")
+    page = await paginate(items, filtered, limit=5, total_mode=TotalMode.ESTIMATED, table_name="catalog_items")
+    assert (page.total, page.total_exact) == (13, False)
+
+
+def test_cursor_round_trip():
+    values = {"d": 1.2345678901234, "id": 42, "r": -0.5}
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", encode_cursor({"id": 1})[:-2] + "@@", "WzEsMl0"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationException):
+        decode_cursor(cursor)
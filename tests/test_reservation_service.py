@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text, update
+
+from common.exceptions.http_exceptions import ConflictException, ValidationException
+from services.seller_service.models.reservation import StockReservation
+from services.seller_service.services.reservation_service import (
+    ACTIVE,
+    COMMITTED,
+    RELEASED,
+    ReservationService
+)
+
+USER_ID = 7
+OTHER_USER_ID = 8
+
+
+@pytest.fixture
+async def inventory(db):
+    """
+    IDs of three inventory items with 5, 3 and 10 in stock
+    """
+    await db.execute(text("INSERT INTO categories (name) VALUES ('Phones')"))
+    await db.execute(
+        text("INSERT INTO catalog_items (name, category_id) VALUES ('A', 1), ('B', 1), ('C', 1)")
+    )
+    await db.execute(text(
+        "INSERT INTO shops (user_id, name, latitude, longitude, geohash) VALUES (1, 'Shop', 1.0, 1.0, 's00')"
+    ))
+    await db.execute(
+        text("INSERT INTO shop_inventory (shop_id, catalog_item_id, price, stock) VALUES (1, :item, 10, :stock)"),
+        [{"item": 1, "stock": 5}, {"item": 2, "stock": 3}, {"item": 3, "stock": 10}]
+    )
+    await db.commit()
+    return [1, 2, 3]
+
+
+async def _stock(db):
+    result = await db.execute(text("SELECT id, stock FROM shop_inventory ORDER BY id"))
+    return dict(result.all())
+
+
+async def _statuses(db):
+    result = await db.execute(text("SELECT id, status FROM stock_reservations ORDER BY id"))
+    return dict(result.all())
+
+
+async def test_reserve_takes_stock(db, inventory):
+    reservations = await ReservationService(db).reserve(USER_ID, [(2, 1), (1, 2), (2, 1)], reference="order-1")
+
+    assert [(r.inventory_item_id, r.quantity, r.status) for r in reservations] == [(1, 2, ACTIVE), (2, 2, ACTIVE)]
+    assert all(r.reference == "order-1" and r.expires_at > datetime.utcnow() for r in reservations)
+    assert await _stock(db) == {1: 3, 2: 1, 3: 10}
+
+
+@pytest.mark.parametrize("items", [
+    [(1, 2), (2, 4)],   # Too little stock of one item
+    [(1, 2), (99, 1)]   # A missing item
+])
+async def test_reserve_is_all_or_nothing(db, inventory, items):
+    with pytest.raises(ConflictException):
+        await ReservationService(db).reserve(USER_ID, items)
+
+    assert await _stock(db) == {1: 5, 2: 3, 3: 10}
+    assert await _statuses(db) == {}
+
+
+@pytest.mark.parametrize("items", [[], [(1, 0)], [(1, -1)]])
+async def test_reserve_rejects_bad_quantities(db, inventory, items):
+    with pytest.raises(ValidationException):
+        await ReservationService(db).reserve(USER_ID, items)
+
+
+async def test_commit_keeps_the_stock_taken(db, inventory):
+    service = ReservationService(db)
+    ids = [r.id for r in await service.reserve(USER_ID, [(1, 2), (3, 4)])]
+
+    with pytest.raises(ConflictException):
+        await service.commit(OTHER_USER_ID, ids)
+    assert await service.commit(USER_ID, ids) == 2
+
+    assert set((await _statuses(db)).values()) == {COMMITTED}
+    assert await _stock(db) == {1: 3, 2: 3, 3: 6}
+
+    # Committed reservations can be neither committed nor released again
+    with pytest.raises(ConflictException):
+        await service.commit(USER_ID, ids)
+    assert await service.release(USER_ID, ids) == 0
+
+
+async def test_release_returns_the_stock(db, inventory):
+    service = ReservationService(db)
+    mine = [r.id for r in await service.reserve(USER_ID, [(1, 2), (2, 3)])]
+    theirs = [r.id for r in await service.reserve(OTHER_USER_ID, [(1, 1)])]
+
+    assert await service.release(USER_ID, mine + theirs) == 2
+
+    assert await _statuses(db) == {mine[0]: RELEASED, mine[1]: RELEASED, theirs[0]: ACTIVE}
+    assert await _stock(db) == {1: 4, 2: 3, 3: 10}
+    assert await service.release(USER_ID, mine) == 0
+
+
+async def test_expired_reservations_are_swept(db, inventory):
+    service = ReservationService(db)
+    expired_ids = [r.id for r in await service.reserve(USER_ID, [(1, 1), (2, 1)])]
+    current_ids = [r.id for r in await service.reserve(USER_ID, [(3, 2)])]
+    await db.execute(
+        update(StockReservation)
+        .where(StockReservation.id.in_(expired_ids))
+        .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await db.commit()
+
+    with pytest.raises(ConflictException):
+        await service.commit(USER_ID, expired_ids[:1])
+
+    assert await service.release_expired(batch_size=1) == 1
+    assert await service.release_expired(batch_size=10) == 1
+    assert await service.release_expired(batch_size=10) == 0
+
+    statuses = await _statuses(db)
+    assert [statuses[reservation_id] for reservation_id in expired_ids] == [RELEASED, RELEASED]
+    assert statuses[current_ids[0]] == ACTIVE
+    assert await _stock(db) == {1: 5, 2: 3, 3: 8}